@@ -1,38 +1,120 @@
 # app.py
 import os
+import asyncio
+import contextlib
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import base64
 import io
+import tempfile
+import threading
+import time
 
 import joblib
 import pandas as pd
 import numpy as np
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, FileResponse, StreamingResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
 # Import preprocessing module
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
-from preprocess import preprocess_input, validate_input
+from preprocess import (
+    preprocess_input, validate_input, preprocess_batch, validate_batch, backend_field_frame,
+    REQUIRED_FIELDS, FIELD_MAPPING,
+)
+from batch_formats import (
+    decode_batch, encode_batch, normalize_content_type,
+    BatchFormatError, UnsupportedBatchFormat,
+)
+from model_registry import ModelRegistry, ModelVersion
+from shadow import ShadowScorer
+from model_artifacts import NativeModel, is_native_spec, NATIVE_SPEC_SUFFIX, SERVING_SUFFIX
+from flat_model import FlatModel, is_flat_model, FLAT_SUFFIX
+from model_manifest import write_manifest, read_manifest, resolve_manifest, file_checksum, ManifestError
+from model_loader import SingleFlightLoader, ModelLoadError, ModelLoadTimeout
+from warmup import Readiness, synthetic_profiles
+from model_watcher import ModelWatcher
+from distill_model import StudentModel, STUDENT_SUFFIX
+from explainer import explainer_for, contributions_for_row, EXPLAIN_MODES
+from result_cache import LRUCache, TTLStore, canonical_key
+from cohort_jobs import CohortJobManager, COHORT_FORMATS
+from localization import Localizer
+from health_probe import HealthProbe
+from metrics import MetricsRegistry
+import server_timing
 
 # ---------- Logging (setup early) ----------
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("cervi_backend")
 
 # ---------- Configuration ----------
-# Try multiple possible paths for the model file
+# Directory holding model artifacts and manifest.json
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_files")
+
+# Recovery mode: probe well-known paths and scan directories when no usable manifest exists
+MODEL_DISCOVERY_SCAN = os.getenv("MODEL_DISCOVERY_SCAN", "false").lower() in ("1", "true", "yes")
+
+
 def find_model_path():
-    """Find the model file in various possible locations."""
+    """
+    Resolve the active model from model_files/manifest.json (one small read plus a checksum).
+    Probing and directory scans only run when MODEL_DISCOVERY_SCAN is enabled.
+    """
+    model_dirs = [MODEL_DIR]
+    cwd_model_dir = os.path.abspath(os.path.join(os.getcwd(), "model_files"))
+    if cwd_model_dir != MODEL_DIR:
+        model_dirs.append(cwd_model_dir)
+    
+    for model_dir in model_dirs:
+        try:
+            path = resolve_manifest(model_dir)
+        except ManifestError as e:
+            logger.error(f"Ignoring model manifest in {model_dir}: {e}")
+            continue
+        if path:
+            manifest = read_manifest(model_dir)
+            if manifest["feature_order"] != FEATURE_ORDER:
+                logger.warning(f"Manifest feature order differs from the app's FEATURE_ORDER: {manifest['feature_order']}")
+            logger.info(f"✓ Model from manifest: {path} ({manifest['format']})")
+            return path
+    
+    if MODEL_DISCOVERY_SCAN:
+        logger.warning("No usable model manifest; MODEL_DISCOVERY_SCAN is enabled, probing for a model file.")
+        return scan_for_model_path()
+    
+    logger.warning(f"No model manifest found in {model_dirs}. Train or upload a model, "
+                   f"or set MODEL_DISCOVERY_SCAN=true to probe for model files.")
+    return None
+
+
+def scan_for_model_path():
+    """Recovery mode: find the model file in various possible locations."""
     app_dir = os.path.dirname(os.path.abspath(__file__))
     cwd = os.getcwd()
     
     # Build comprehensive list of paths to check
     possible_paths = []
     
+    # Preferred: memory-mapped flat model, shared by all workers through the page cache (backend/flat_model.py)
+    flat_name = "cervical_cancer_model" + FLAT_SUFFIX
+    possible_paths.append(os.path.join(app_dir, "model_files", flat_name))
+    possible_paths.append(os.path.join(cwd, "model_files", flat_name))
+    
+    # Next: native XGBoost export (UBJSON boosters + JSON spec, see backend/model_artifacts.py)
+    native_name = "cervical_cancer_model" + NATIVE_SPEC_SUFFIX
+    possible_paths.append(os.path.join(app_dir, "model_files", native_name))
+    possible_paths.append(os.path.join(cwd, "model_files", native_name))
+    
+    # Next: slim serving pickle (no SMOTE/imblearn), then the full training pickle
+    serving_name = "cervical_cancer_model" + SERVING_SUFFIX
+    possible_paths.append(os.path.join(app_dir, "model_files", serving_name))
+    possible_paths.append(os.path.join(cwd, "model_files", serving_name))
+    
     # Primary: relative to app.py location
     possible_paths.append(os.path.join(app_dir, "model_files", "cervical_cancer_model.pkl"))
     
@@ -103,8 +185,6 @@ def find_model_path():
     
     return None  # Return None instead of a non-existent path
 
-MODEL_PATH = find_model_path()
-
 FEATURE_ORDER = [
     'Age',
     'Num of sexual partners',
@@ -120,25 +200,129 @@ FEATURE_ORDER = [
     'Vaginal bleeding(time-b/w periods , After sex or after menopause)',
 ]
 
+# Upper bound on rows accepted by /predict-batch in a single request
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "50000"))
+# Bodies larger than this are rejected (by Content-Length, or while streaming) before they are buffered
+MAX_BATCH_BYTES = int(os.getenv("MAX_BATCH_BYTES", str(MAX_BATCH_ROWS * 1024)))
+
+# /upload-model streams the file to disk in chunks and rejects anything larger than this
+MAX_MODEL_UPLOAD_BYTES = int(os.getenv("MAX_MODEL_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Pending /predict samples for the shadow model; beyond this they are dropped
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "256"))
+
+# Hot reload: watch model_files/ and swap in a new artifact named by the manifest
+MODEL_WATCH = os.getenv("MODEL_WATCH", "true").lower() in ("1", "true", "yes")
+MODEL_WATCH_DEBOUNCE_SECONDS = float(os.getenv("MODEL_WATCH_DEBOUNCE_SECONDS", "2"))
+MODEL_WATCH_POLL_SECONDS = float(os.getenv("MODEL_WATCH_POLL_SECONDS", "5"))
+MODEL_WATCH_POLLING = os.getenv("MODEL_WATCH_POLLING", "false").lower() in ("1", "true", "yes")
+
+# Synthetic profiles pushed through the hot paths after a model load (plus the example profiles)
+WARMUP_PROFILES = int(os.getenv("WARMUP_PROFILES", "20"))
+
+# A new model (upload, hot reload) is validated on the raw scores of this many synthetic profiles
+# (plus the example profiles); its mean absolute difference from the serving model must stay within
+# MODEL_PARITY_TOLERANCE (1 disables the parity check)
+VALIDATION_PROFILES = int(os.getenv("VALIDATION_PROFILES", "200"))
+MODEL_PARITY_TOLERANCE = float(os.getenv("MODEL_PARITY_TOLERANCE", "0.1"))
+
+# Requests arriving while a model load is in flight wait this long for it (0 = fail fast with 503)
+MODEL_LOAD_WAIT_SECONDS = float(os.getenv("MODEL_LOAD_WAIT_SECONDS", "10"))
+# After a failed load, further loads fail fast for this many seconds
+MODEL_LOAD_RETRY_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_SECONDS", "5"))
+
+# LRU result caches keyed by (model hash, canonical UserOptions); 0 disables
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "1024"))
+
+# /predict keeps its scored state this long under a prediction_id for /explain/{prediction_id}
+PREDICTION_TTL_SECONDS = float(os.getenv("PREDICTION_TTL_SECONDS", "900"))
+PREDICTION_STORE_SIZE = int(os.getenv("PREDICTION_STORE_SIZE", "10000"))
+
+# Cohort explanation jobs: process pool size, rows per pool task, where result files go
+COHORT_WORKERS = int(os.getenv("COHORT_WORKERS", "2"))
+COHORT_CHUNK_ROWS = int(os.getenv("COHORT_CHUNK_ROWS", "2000"))
+COHORT_JOB_DIR = os.getenv("COHORT_JOB_DIR", os.path.join(tempfile.gettempdir(), "cervibot_cohort_jobs"))
+
+# /health self-test (preprocess + predict_proba) runs in the background this often; endpoints read the cache
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "30"))
+
+# Saved assessment results (/save-result, /history, cohort jobs)
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+
 
 # ---------- Model holder ----------
+# registry is the source of truth; model/model_path mirror its primary version
+# for the code paths that only ever use the primary.
+registry = ModelRegistry()
 model = None
 model_path = None
 
+# Request header that pins a request to a named model version (A/B testing, debugging)
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+# /predict caches the model's raw output (with the preprocessed row and the original model latency),
+# /explain its full response; cleared on every primary change
+prediction_cache = LRUCache(PREDICTION_CACHE_SIZE)
+explanation_cache = LRUCache(EXPLANATION_CACHE_SIZE)
+# prediction_id -> version, UserOptions, preprocessed row, model and rule-based probabilities
+prediction_store = TTLStore(PREDICTION_STORE_SIZE, PREDICTION_TTL_SECONDS)
+
+cohort_jobs = CohortJobManager(COHORT_JOB_DIR, workers=COHORT_WORKERS, chunk_rows=COHORT_CHUNK_ROWS)
+
+# Response text (advice, explanations) rendered in the caller's language from templates compiled once here
+try:
+    from translations import TRANSLATIONS
+except ImportError:
+    logger.warning("Translations module not found; responses will use the template keys")
+    TRANSLATIONS = {}
+localizer = Localizer(TRANSLATIONS)
+
+# Cached health self-test, refreshed in the background and after every primary change
+health_probe = HealthProbe(lambda: run_self_test(), interval_seconds=HEALTH_PROBE_INTERVAL_SECONDS)
+
+# Prometheus metrics served by /metrics; component state (loads, caches, queues) is read at scrape time
+metrics = MetricsRegistry()
+metrics.histogram("cervi_http_request_duration_seconds", "HTTP request latency by route template")
+metrics.histogram("cervi_predict_stage_duration_seconds", "Time spent in each /predict stage")
+metrics.counter("cervi_probability_source_total",
+                "Scored rows by where the final probability came from (model, rule_based or blended)")
+
+
+def model_fingerprint(version: ModelVersion) -> str:
+    """Content hash of a version's artifact, computed once per version."""
+    if version.fingerprint is None:
+        try:
+            version.fingerprint = file_checksum(version.path)
+        except (OSError, TypeError):
+            version.fingerprint = f"{version.name}@{version.loaded_at}"
+    return version.fingerprint
+
+
+def invalidate_result_caches() -> None:
+    prediction_cache.clear()
+    explanation_cache.clear()
+
 
 def try_load_model(path: str):
-    """Attempt to load a joblib model from path. Returns (model_obj, path) or (None, None) on failure."""
+    """
+    Attempt to load a model from path: a memory-mapped flat model (*.flat), a native export
+    spec (*.spec.json) or a joblib pickle (full training pipeline or slim *.serving.pkl).
+    Returns (model_obj, path) or (None, None) on failure.
+    """
     try:
         logger.info(f"Attempting to load model from: {path}")
         
-        # Check if imbalanced-learn is available (required for imblearn pipelines)
-        try:
-            import imblearn
-            logger.debug("imbalanced-learn is available")
-        except ImportError as ie:
-            logger.error(f"CRITICAL: imbalanced-learn is not installed! This is required for the model. Error: {ie}")
-            logger.error("Please install it: pip install imbalanced-learn")
-            return None, None
+        if is_flat_model(path):
+            m = FlatModel.load(path)
+            logger.info(f"Flat model memory-mapped ({len(m.members)} member(s)).")
+            return m, path
+        
+        if is_native_spec(path):
+            m = NativeModel.load(path)
+            logger.info(f"Native model loaded ({len(m.boosters)} booster(s)).")
+            return m, path
         
         m = joblib.load(path)
         
@@ -160,7 +344,8 @@ def try_load_model(path: str):
     except ImportError as ie:
         logger.error(f"Import error while loading model: {ie}")
         logger.error("This usually means a required dependency is missing.")
-        logger.error("Required packages: joblib, pandas, scikit-learn, xgboost, imbalanced-learn")
+        logger.error("Required packages: joblib, pandas, scikit-learn, xgboost")
+        logger.error("Full training pickles also need imbalanced-learn; serving exports (*.serving.pkl, *.spec.json, *.flat) do not.")
         return None, None
     except Exception as e:
         logger.exception(f"Failed to load model at {path}: {e}")
@@ -168,13 +353,189 @@ def try_load_model(path: str):
         return None, None
 
 
-# Try load at module import time
-if MODEL_PATH and os.path.exists(MODEL_PATH):
-    model, model_path = try_load_model(MODEL_PATH)
-    if model is None:
-        logger.warning("Model file exists but failed to load. Use /upload-model to upload a valid model.")
-else:
-    logger.info(f"Model file not found. Use /upload-model to upload one or place it at: {os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_files', 'cervical_cancer_model.pkl')}")
+# Guards every reassignment of model/model_path so readers never see a half-swapped pair
+_model_lock = threading.Lock()
+# Primary ModelVersion that was serving before the last swap, for /model/rollback
+_previous_version = None
+
+
+def version_name_for(path: str) -> str:
+    """Default registry name for an artifact: its file name without extension."""
+    name = os.path.basename(path)
+    for suffix in (FLAT_SUFFIX, NATIVE_SPEC_SUFFIX, SERVING_SUFFIX):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def validation_frame() -> pd.DataFrame:
+    """Preprocessed example profiles plus VALIDATION_PROFILES synthetic ones, in FEATURE_ORDER."""
+    profiles = list(example_profiles().values()) + synthetic_profiles(VALIDATION_PROFILES, seed=1)
+    X = preprocess_batch(pd.DataFrame(profiles))
+    return X[[col for col in FEATURE_ORDER if col in X.columns]]
+
+
+def raw_scores(m, X: pd.DataFrame) -> np.ndarray:
+    """The model's own positive-class scores for X (no rule-based fallback)."""
+    if hasattr(m, "predict_proba"):
+        proba = np.asarray(m.predict_proba(X))
+        if proba.ndim != 2 or proba.shape[0] != len(X) or proba.shape[1] < 2:
+            raise ValueError(f"predict_proba returned shape {proba.shape}, expected ({len(X)}, 2)")
+        return proba[:, 1].astype(float)
+    return np.asarray(m.predict(X), dtype=float)
+
+
+def validate_model(m, reference=None) -> Optional[str]:
+    """
+    Check a freshly loaded model before it goes live, on its raw scores: the validation profiles
+    must score within [0, 1], not all the same, and within MODEL_PARITY_TOLERANCE (mean absolute
+    difference) of reference, the model currently serving. The rule-based fallback is applied
+    only at serve time, so it cannot hide a broken model here. Returns an error message, or None if valid.
+    """
+    try:
+        X = validation_frame()
+        scores = raw_scores(m, X)
+        if scores.shape != (len(X),):
+            return f"Model returned {scores.shape} scores for {len(X)} profiles"
+        if not np.all(np.isfinite(scores)) or scores.min() < 0 or scores.max() > 1:
+            return f"Model produced out-of-range scores (min {scores.min()}, max {scores.max()})"
+        if np.ptp(scores) == 0:
+            return f"Model scored all {len(X)} validation profiles {scores[0]:.4f}; a constant model is rejected"
+        if reference is not None and reference is not m:
+            drift = float(np.mean(np.abs(scores - raw_scores(reference, X))))
+            if drift > MODEL_PARITY_TOLERANCE:
+                return (f"Scores differ from the serving model by {drift:.3f} on average "
+                        f"(tolerance {MODEL_PARITY_TOLERANCE}); raise MODEL_PARITY_TOLERANCE to accept it")
+    except Exception as e:
+        return f"Validation prediction failed: {e}"
+    return None
+
+
+def load_and_validate_model(path: str) -> Tuple[Any, Optional[str]]:
+    """Load a model and validate it against the current primary. Blocking; call from a worker thread."""
+    loaded, _ = try_load_model(path)
+    if loaded is None:
+        return None, "File is not a valid model or failed to load."
+    primary = registry.primary
+    error = validate_model(loaded, primary.model if primary is not None else None)
+    if error:
+        logger.error(f"Model at {path} failed validation: {error}")
+        return None, error
+    return loaded, None
+
+
+def swap_model(new_model, new_path: str, name: Optional[str] = None) -> None:
+    """Atomically make a model the primary version, remembering the old primary for rollback."""
+    global model, model_path, _previous_version
+    name = name or version_name_for(new_path)
+    with _model_lock:
+        if registry.primary is not None:
+            _previous_version = registry.primary
+        registry.add(name, new_model, new_path, weight=0.0, primary=True)
+        model, model_path = new_model, new_path
+    invalidate_result_caches()
+    health_probe.trigger()
+    logger.info(f"Serving model swapped to: {name} ({new_path})")
+
+
+def _sync_primary() -> None:
+    """Refresh the model/model_path mirror after the registry primary changed. Hold _model_lock."""
+    global model, model_path
+    primary = registry.primary
+    model, model_path = (primary.model, primary.path) if primary is not None else (None, None)
+    invalidate_result_caches()
+    health_probe.trigger()
+
+
+# (artifact, checksum) of the manifest entry the primary was loaded from; the watcher skips it
+_manifest_key: Optional[Tuple[str, str]] = None
+
+
+def update_manifest(path: str, name: Optional[str] = None) -> None:
+    """Point model_files/manifest.json at the artifact now serving as primary."""
+    global _manifest_key
+    try:
+        manifest = write_manifest(MODEL_DIR, path, FEATURE_ORDER, version=name)
+        _manifest_key = (manifest["artifact"], manifest["checksum"])
+        logger.info(f"Model manifest updated: {os.path.basename(path)}")
+    except Exception as e:
+        logger.warning(f"Could not update model manifest for {path}: {e}")
+
+
+# Exactly one disk load runs at a time; concurrent callers wait for its result or fail fast
+model_loader = SingleFlightLoader(wait_timeout=MODEL_LOAD_WAIT_SECONDS, failure_cooldown=MODEL_LOAD_RETRY_SECONDS)
+
+
+# Not ready until the primary model has been loaded and warmed up
+readiness = Readiness()
+
+
+def load_model_file(path: str, warm: bool = True):
+    """
+    Load path, warm it up and make it the primary. Raises ModelLoadError. Run through model_loader.
+    The initial load at startup skips warm-up; startup then warms that model in the background.
+    """
+    loaded, loaded_path = try_load_model(path)
+    if loaded is None:
+        raise ModelLoadError(f"Model at {path} failed to load")
+    report = None
+    if warm:
+        try:
+            report = warm_up_model(loaded, version_name_for(loaded_path))
+        except Exception as e:
+            raise ModelLoadError(f"Warm-up failed for {path}: {e}")
+    swap_model(loaded, loaded_path)
+    if report is not None:
+        readiness.finish_warmup(report)
+    return loaded
+
+
+def load_primary_from_disk():
+    """Discover and load the primary model unless another caller already did."""
+    if model is not None:
+        return model
+    found_path = find_model_path()
+    if not found_path:
+        raise ModelLoadError("No model file found")
+    return load_model_file(found_path)
+
+
+def load_initial_model() -> None:
+    """
+    Load the manifest's model (without warm-up) and the student model. Called from the startup
+    hook, never at import: cohort job workers are spawned processes that re-import this module.
+    """
+    global student_version
+    initial_path = find_model_path()
+    if initial_path and os.path.exists(initial_path):
+        try:
+            model_loader.run("initial", lambda: load_model_file(initial_path, warm=False))
+        except ModelLoadError:
+            logger.warning("Model file exists but failed to load. Use /upload-model to upload a valid model.")
+    else:
+        logger.info(f"Model file not found. Use /upload-model to upload one or place it at: {os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_files', 'cervical_cancer_model.pkl')}")
+    student_version = load_student()
+
+
+# Distilled student model (fast tier / degraded mode); kept out of the registry so it never becomes primary
+STUDENT_VERSION = "student"
+
+
+def load_student() -> Optional[ModelVersion]:
+    path = os.path.join(MODEL_DIR, "cervical_cancer_model" + STUDENT_SUFFIX)
+    if not os.path.isfile(path):
+        return None
+    try:
+        student = ModelVersion(STUDENT_VERSION, StudentModel.load(path), path)
+    except Exception as e:
+        logger.warning(f"Could not load student model {path}: {e}")
+        return None
+    logger.info(f"Student model loaded for the fast tier: {path}")
+    return student
+
+
+# Set by load_initial_model() and hot reloads
+student_version: Optional[ModelVersion] = None
 
 
 # ---------- App & CORS ----------
@@ -187,14 +548,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Route templates by endpoint, so latency is labeled /explain/{prediction_id} rather than per id
+_route_paths: Dict[Any, str] = {}
+
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    """Record per-route latency for /metrics and add a Server-Timing header for timed stages."""
+    started = time.perf_counter()
+    status = 500
+    token = server_timing.begin()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        timings = server_timing.end(token)
+        if timings is not None and timings.stages:
+            response.headers["Server-Timing"] = timings.header()
+            # Cross-origin frontends can only read serverTiming from the Resource Timing API with this
+            response.headers["Timing-Allow-Origin"] = "*"
+        return response
+    finally:
+        endpoint = request.scope.get("endpoint")
+        if endpoint is not None and not _route_paths:
+            _route_paths.update({route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")})
+        metrics.observe("cervi_http_request_duration_seconds", time.perf_counter() - started,
+                        method=request.method, route=_route_paths.get(endpoint, "unmatched"), status=str(status))
+
 
 # ---------- Startup event ----------
 @app.on_event("startup")
 async def startup_event():
-    """Try to load the model on startup (fallback if not loaded at import time)."""
-    global model, model_path
+    """Load the model on startup, falling back to discovery if the manifest's model fails to load."""
+    global model, model_path, _manifest_key
+    load_initial_model()
+    shadow_scorer.start()
+    health_probe.start()
+    if MODEL_WATCH:
+        model_watcher.start()
     if model is None:
-        logger.info("Model not loaded at import time. Attempting to load on startup...")
+        logger.info("Initial model load failed. Attempting to load on startup...")
         
         # Debug: List directory contents
         app_dir = os.path.dirname(os.path.abspath(__file__))
@@ -217,13 +609,11 @@ async def startup_event():
         found_path = find_model_path()
         if found_path and os.path.exists(found_path):
             logger.info(f"Startup: Attempting to load model from {found_path}")
-            loaded_model, loaded_path = try_load_model(found_path)
-            if loaded_model is not None:
-                model = loaded_model
-                model_path = loaded_path
+            try:
+                model_loader.run("startup", lambda: load_model_file(found_path))
                 logger.info("Startup: Model loaded successfully!")
-            else:
-                logger.error("Startup: Model file found but failed to load.")
+            except ModelLoadError as e:
+                logger.error(f"Startup: Model file found but failed to load: {e}")
                 logger.error("Check the logs above for detailed error information.")
                 logger.error("Common issues:")
                 logger.error("  1. Missing dependency: pip install imbalanced-learn")
@@ -233,7 +623,10 @@ async def startup_event():
             logger.warning("Startup: Model file not found. Use /upload-model to upload one.")
             logger.warning(f"Current working directory: {cwd}")
             logger.warning(f"App directory: {app_dir}")
-            # Try to find any .pkl file as last resort
+            if not MODEL_DISCOVERY_SCAN:
+                _schedule_warmup()
+                return
+            # Recovery mode: try to find any .pkl file as last resort
             logger.info("Attempting to find any .pkl file in common locations...")
             for search_dir in [app_dir, cwd, os.path.join(cwd, "model_files"), os.path.join(app_dir, "model_files")]:
                 if os.path.exists(search_dir):
@@ -245,9 +638,10 @@ async def startup_event():
                                     logger.info(f"Found potential model: {potential_path}")
                                     loaded_model, loaded_path = try_load_model(potential_path)
                                     if loaded_model is not None:
-                                        model = loaded_model
-                                        model_path = loaded_path
+                                        swap_model(loaded_model, loaded_path)
+                                        update_manifest(loaded_path)
                                         logger.info(f"✓ Successfully loaded model from: {loaded_path}")
+                                        _schedule_warmup()
                                         return
                     except Exception as e:
                         logger.debug(f"Error searching {search_dir}: {e}")
@@ -270,6 +664,23 @@ async def startup_event():
         logger.info(f"Has predict: {hasattr(model, 'predict')}")
         logger.info(f"Has predict_proba: {hasattr(model, 'predict_proba')}")
         logger.info("=" * 70)
+    
+    # Remember which manifest entry is serving so the watcher only reacts to new ones
+    manifest_artifact, manifest = _manifest_entry()
+    if manifest is not None and model_path and os.path.abspath(model_path) == manifest_artifact:
+        _manifest_key = (manifest["artifact"], manifest["checksum"])
+    
+    # Readiness stays false until the model has been warmed up
+    _schedule_warmup()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers."""
+    await shadow_scorer.stop()
+    model_watcher.stop()
+    health_probe.stop()
+    cohort_jobs.shutdown()
 
 
 # ---------- Pydantic input schema ----------
@@ -395,6 +806,52 @@ def calculate_rule_based_risk(data: dict) -> float:
     return min(probability, 0.95)
 
 
+def apply_rule_fallback(model_proba: float, prob_source: str, data: dict, quiet: bool = False) -> Tuple[float, str]:
+    """
+    Combine a model probability with the rule-based score when the model is too conservative.
+    Returns (probability, probability_source). Pass quiet=True from batch paths to skip per-row logs.
+    """
+    # FIX: If model prediction is suspiciously low (< 0.1), use rule-based fallback
+    # This ensures extreme cases get appropriate risk levels
+    if model_proba >= 0.1:
+        # Model prediction is reasonable, use it
+        return model_proba, prob_source
+
+    if not quiet:
+        logger.warning(f"Model prediction too low ({model_proba:.4f}), using rule-based fallback")
+    rule_based_proba = calculate_rule_based_risk(data)
+    
+    # Use the higher of the two probabilities, or blend them
+    # This ensures we don't miss high-risk cases
+    if rule_based_proba > 0.3:
+        # If rule-based suggests medium/high risk, use it
+        if not quiet:
+            logger.info(f"Using rule-based probability: {rule_based_proba:.4f} (model was {model_proba:.4f})")
+        return rule_based_proba, "rule_based_fallback (model was too conservative)"
+
+    # If both are low, use a blend (weighted towards rule-based)
+    proba = (model_proba * 0.3) + (rule_based_proba * 0.7)
+    if not quiet:
+        logger.info(f"Blended probability: {proba:.4f} (model: {model_proba:.4f}, rule-based: {rule_based_proba:.4f})")
+    return proba, "blended (model + rule_based)"
+
+
+@contextlib.contextmanager
+def predict_stage(stage: str, timing: str):
+    """Time a /predict stage for /metrics (stage) and the Server-Timing header (timing)."""
+    with metrics.time("cervi_predict_stage_duration_seconds", stage=stage), server_timing.stage(timing):
+        yield
+
+
+def fallback_branch(prob_source: str) -> str:
+    """Short name of the apply_rule_fallback branch that produced a probability_source."""
+    if prob_source.startswith("rule_based"):
+        return "rule_based"
+    if prob_source.startswith("blended"):
+        return "blended"
+    return "model"
+
+
 def risk_bucket(proba: float) -> str:
     """Categorize risk based on probability."""
     if proba < 0.33:
@@ -415,6 +872,186 @@ def get_risk_color(risk: str) -> str:
     return colors.get(risk, "#6b7280")
 
 
+def _shadow_score(shadow_model, X: pd.DataFrame) -> float:
+    """Score an already-preprocessed row with the shadow model (runs in a worker thread)."""
+    if hasattr(shadow_model, "predict_proba"):
+        return float(shadow_model.predict_proba(X)[0][1])
+    return float(shadow_model.predict(X)[0])
+
+
+shadow_scorer = ShadowScorer(_shadow_score, risk_bucket, maxsize=SHADOW_QUEUE_SIZE)
+
+
+def _warm_pdf_styles() -> bool:
+    """Import reportlab and render a tiny report so fonts and styles are cached. False if unavailable."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.units import inch
+    except ImportError:
+        return False
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('WarmupTitle', parent=styles['Heading1'], fontSize=24,
+                                 textColor=colors.HexColor('#667eea'), spaceAfter=30, alignment=1)
+    table = Table([["Factor", "Value"], ["Age", "30"]])
+    table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+                               ('GRID', (0, 0), (-1, -1), 1, colors.black)]))
+    doc.build([Paragraph("Cervical Health Risk Assessment Report", title_style), Spacer(1, 0.2 * inch),
+               Paragraph("<b>Risk Level:</b> <i>Low</i>", styles['Normal']), table])
+    return True
+
+
+# Fixed synthetic profiles (model columns) that global feature importance is measured on
+IMPORTANCE_PROFILES = 200
+_importance_reference: Optional[pd.DataFrame] = None
+
+
+def importance_reference() -> pd.DataFrame:
+    global _importance_reference
+    if _importance_reference is None:
+        X = preprocess_batch(pd.DataFrame(synthetic_profiles(IMPORTANCE_PROFILES, seed=1)))
+        _importance_reference = X[[col for col in FEATURE_ORDER if col in X.columns]]
+    return _importance_reference
+
+
+def warm_up_model(m, name: str) -> Dict[str, Any]:
+    """
+    Push example and synthetic profiles through preprocessing, predict_proba (single-row and
+    batch), the rule fallback, the SHAP explainer and global importance (cached with m), the explanation
+    (when m is the primary) and PDF styles.
+    Raises if the model cannot score. Blocking; call from a worker thread.
+    """
+    started = time.perf_counter()
+    profiles = list(example_profiles().values()) + synthetic_profiles(WARMUP_PROFILES)
+    first_call_seconds = None
+    for profile in profiles:
+        call_started = time.perf_counter()
+        validate_input(profile)
+        X = preprocess_input(profile)
+        X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
+        if hasattr(m, "predict_proba"):
+            proba = float(m.predict_proba(X_ordered)[0][1])
+        else:
+            proba = float(m.predict(X_ordered)[0])
+        proba, _ = apply_rule_fallback(proba, "predict_proba", profile, quiet=True)
+        risk_bucket(proba)
+        if first_call_seconds is None:
+            first_call_seconds = time.perf_counter() - call_started
+
+    X_batch = preprocess_batch(pd.DataFrame(profiles))
+    X_batch = X_batch[[col for col in FEATURE_ORDER if col in X_batch.columns]]
+    m.predict_proba(X_batch) if hasattr(m, "predict_proba") else m.predict(X_batch)
+
+    explainer_seconds = None
+    try:
+        explainer_started = time.perf_counter()
+        explainer_for(m).global_importance(importance_reference())
+        explainer_seconds = time.perf_counter() - explainer_started
+    except Exception as e:
+        logger.warning(f"SHAP explainer not built for {name}: {e}")
+
+    explained = False
+    primary = registry.primary
+    if primary is not None and primary.model is m:
+        for profile in example_profiles().values():
+            explain_prediction(UserOptions(**profile), model_version=None, accept_language=None)
+        explained = True
+
+    pdf_warmed = _warm_pdf_styles()
+    report = {
+        "model_version": name,
+        "profiles": len(profiles),
+        "first_call_seconds": first_call_seconds,
+        "seconds": time.perf_counter() - started,
+        "explainer_seconds": explainer_seconds,
+        "explanation_warmed": explained,
+        "pdf_warmed": pdf_warmed,
+        "finished_at": time.time(),
+    }
+    logger.info(f"Warm-up for {name} finished in {report['seconds']:.2f}s "
+                f"({len(profiles)} profiles, first call {first_call_seconds * 1000:.1f}ms)")
+    return report
+
+
+def _warm_primary() -> None:
+    """Background warm-up of the model loaded at startup; flips readiness when done."""
+    primary = registry.primary
+    if primary is None:
+        readiness.set("no_model", "No model loaded")
+        return
+    try:
+        readiness.finish_warmup(warm_up_model(primary.model, primary.name))
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        readiness.set("warmup_failed", str(e))
+
+
+def _manifest_entry() -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """(artifact path, manifest) for a consistent manifest in MODEL_DIR, else (None, None)."""
+    try:
+        path = resolve_manifest(MODEL_DIR)
+    except ManifestError as e:
+        logger.warning(f"Model manifest not usable yet: {e}")
+        return None, None
+    if path is None:
+        return None, None
+    return path, read_manifest(MODEL_DIR)
+
+
+def hot_reload_model(changed=None) -> None:
+    """
+    Watcher callback: if the manifest names a different artifact (or checksum) than the one
+    serving, load, validate it (validate_model), warm up and swap it in.
+    Failures leave the current model serving.
+    """
+    global _manifest_key
+    path, manifest = _manifest_entry()
+    if path is None:
+        return
+    key = (manifest["artifact"], manifest["checksum"])
+    if key == _manifest_key:
+        return
+    name = manifest.get("version") or version_name_for(path)
+
+    def reload():
+        global _manifest_key, student_version
+        loaded, error = load_and_validate_model(path)
+        if loaded is None:
+            raise ModelLoadError(error)
+        report = warm_up_model(loaded, name)
+        swap_model(loaded, path, name)
+        readiness.finish_warmup(report)
+        _manifest_key = key
+        # A retrain writes a matching student next to the model
+        student_version = load_student() or student_version
+
+    logger.info(f"Hot reload: manifest now names {manifest['artifact']} ({manifest['checksum'][:19]}...)")
+    try:
+        model_loader.run("hot_reload", reload)
+        logger.info(f"Hot reload complete: serving {name} from {path}")
+    except ModelLoadError as e:
+        logger.error(f"Hot reload of {path} rejected, current model keeps serving: {e}")
+
+
+model_watcher = ModelWatcher(MODEL_DIR, hot_reload_model, debounce_seconds=MODEL_WATCH_DEBOUNCE_SECONDS,
+                             poll_interval=MODEL_WATCH_POLL_SECONDS, force_polling=MODEL_WATCH_POLLING)
+
+
+def _schedule_warmup() -> None:
+    """Start warming the primary off the event loop, or record that there is nothing to warm."""
+    if readiness.ready:
+        return
+    if model is None:
+        readiness.set("no_model", "No model loaded")
+        return
+    readiness.set("warming")
+    asyncio.get_running_loop().run_in_executor(None, _warm_primary)
+
+
 # ---------- Endpoints ----------
 @app.get("/", response_class=HTMLResponse)
 def read_root():
@@ -438,9 +1075,8 @@ def test_ui():
         return HTMLResponse(content="<h1>Test UI file not found</h1>", status_code=404)
 
 
-@app.get("/health")
-def health() -> Dict[str, Any]:
-    """Health check endpoint with detailed model status."""
+def run_self_test() -> Dict[str, Any]:
+    """Model self-test behind /health: a test prediction through the same path as /predict."""
     # Multiple checks to ensure model is loaded
     model_loaded = model is not None
     has_predict = hasattr(model, 'predict') if model is not None else False
@@ -506,87 +1142,149 @@ def health() -> Dict[str, Any]:
         "has_predict_proba": has_predict_proba,
         "test_prediction_works": test_prediction_works,
         "test_prediction_error": test_prediction_error if not test_prediction_works else None,
-        "version": "2.0.0",
         "checks_passed": model_loaded and has_predict and has_predict_proba and test_prediction_works
     }
 
 
+@app.get("/health")
+def health(detailed: bool = False) -> Dict[str, Any]:
+    """
+    Health check with model status. Serves the self-test result cached by the background
+    probe; ?detailed=true runs the self-test now (and refreshes the cache).
+    """
+    result = health_probe.refresh() if detailed else health_probe.cached()
+    if result is None:
+        # First call before the probe's first run
+        result = health_probe.refresh()
+    result.update({
+        "model_loading": model_loader.loading,
+        "ready": readiness.ready and health_probe.healthy,
+        "readiness": readiness.snapshot(),
+        "model_watcher": model_watcher.backend if MODEL_WATCH else None,
+        "self_test": health_probe.snapshot(),
+        "version": "2.0.0",
+    })
+    return result
+
+
+@app.get("/livez")
+def livez() -> Dict[str, Any]:
+    """Liveness probe: the process is up and serving requests. No model work."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+@app.get("/ready")
+def readyz():
+    """
+    Readiness probe from cached state only: 200 once a model is loaded and warmed up and the
+    last background self-test passed, 503 otherwise. /ready is an alias kept for existing checks.
+    """
+    state = readiness.snapshot()
+    state["ready"] = state["ready"] and health_probe.healthy
+    state["self_test"] = health_probe.snapshot()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+
 @app.post("/predict")
-def predict(options: UserOptions) -> Dict[str, Any]:
-    """Make a prediction based on user input."""
+def predict(
+    options: UserOptions,
+    model_version: Optional[str] = Header(None, alias=MODEL_VERSION_HEADER),
+    lang: Optional[str] = None,
+    accept_language: Optional[str] = Header(None, alias="Accept-Language"),
+) -> Dict[str, Any]:
+    """
+    Make a prediction based on user input. Routed to a model version by header or weight.
+    advice and risk_label are in the language from ?lang= or Accept-Language (default English).
+    """
     global model, model_path
+    server_timing.mark("parse")
     
     # Triple check that model is loaded
+    version = None
     if model is None:
         logger.error("PREDICT ENDPOINT: Model is None!")
-        # Try one more time to load
-        found_path = find_model_path()
-        if found_path:
-            logger.info(f"Attempting emergency model load from: {found_path}")
-            loaded_model, loaded_path = try_load_model(found_path)
-            if loaded_model is not None:
-                model = loaded_model
-                model_path = loaded_path
-                logger.info("Emergency model load successful!")
-            else:
+        # Try one more time to load; concurrent requests share a single load
+        try:
+            model_loader.run("emergency", load_primary_from_disk)
+            logger.info("Emergency model load successful!")
+        except ModelLoadTimeout as e:
+            if student_version is None:
+                raise HTTPException(status_code=503, detail=f"Model is loading, retry shortly. ({e})",
+                                    headers={"Retry-After": str(max(1, int(MODEL_LOAD_RETRY_SECONDS)))})
+            version = student_version
+        except ModelLoadError as e:
+            logger.error(f"Emergency model load failed: {e}")
+            if student_version is None:
                 raise HTTPException(status_code=503, detail="Model not loaded. Use /upload-model or place model at configured path.")
-        else:
-            raise HTTPException(status_code=503, detail="Model not loaded. Use /upload-model or place model at configured path.")
+            version = student_version
+        if version is not None:
+            logger.warning("Degraded mode: scoring with the distilled student model")
     
+    degraded = version is not None
+    version = version or registry.select(model_version)
+    active_model = version.model
+
     # Verify model has required methods
-    if not hasattr(model, 'predict') and not hasattr(model, 'predict_proba'):
+    if not hasattr(active_model, 'predict') and not hasattr(active_model, 'predict_proba'):
         logger.error("PREDICT ENDPOINT: Model missing predict methods!")
         raise HTTPException(status_code=503, detail="Model loaded but missing required methods. Please retrain or upload a valid model.")
     
-    logger.info(f"Making prediction with model from: {model_path}")
+    logger.info(f"Making prediction with model version {version.name} from: {version.path}")
 
     # Validate input
-    is_valid, error_msg = validate_input(options.dict())
+    with predict_stage("validation", "validate"):
+        is_valid, error_msg = validate_input(options.dict())
     if not is_valid:
         raise HTTPException(status_code=400, detail=error_msg)
 
-    try:
-        # Preprocess input using the preprocessing module
-        X = preprocess_input(options.dict())
-    except Exception as e:
-        logger.exception("Invalid input preprocessing")
-        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+    # Same payload scored by the same model before: skip preprocessing and predict_proba
+    cache_key = (model_fingerprint(version), canonical_key(options.dict()))
+    lookup_started = time.perf_counter()
+    cached = prediction_cache.get(cache_key)
+    X_ordered = None
+    if cached is None:
+        try:
+            # Preprocess input using the preprocessing module
+            with predict_stage("preprocess_input", "preprocess"):
+                X = preprocess_input(options.dict())
+        except Exception as e:
+            logger.exception("Invalid input preprocessing")
+            raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
 
     try:
-        # Ensure X has the correct column order
-        X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
-        
-        if hasattr(model, "predict_proba"):
-            model_proba = float(model.predict_proba(X_ordered)[0][1])
-            prob_source = "predict_proba"
+        if cached is not None:
+            # Only the model call is skipped: the hit still counts toward version stats and the shadow
+            model_proba, prob_source, X_ordered, model_seconds = cached
+            metrics.observe("cervi_predict_stage_duration_seconds", time.perf_counter() - lookup_started,
+                            stage="prediction_cache")
+            version.stats.record_cached([model_proba])
         else:
+            # Ensure X has the correct column order
             X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
-            pred = model.predict(X_ordered)[0]
-            model_proba = float(pred)
-            prob_source = "predict (fallback)"
-        
-        # FIX: If model prediction is suspiciously low (< 0.1), use rule-based fallback
-        # This ensures extreme cases get appropriate risk levels
-        if model_proba < 0.1:
-            logger.warning(f"Model prediction too low ({model_proba:.4f}), using rule-based fallback")
-            rule_based_proba = calculate_rule_based_risk(options.dict())
             
-            # Use the higher of the two probabilities, or blend them
-            # This ensures we don't miss high-risk cases
-            if rule_based_proba > 0.3:
-                # If rule-based suggests medium/high risk, use it
-                proba = rule_based_proba
-                prob_source = "rule_based_fallback (model was too conservative)"
-                logger.info(f"Using rule-based probability: {proba:.4f} (model was {model_proba:.4f})")
+            started = time.perf_counter()
+            if hasattr(active_model, "predict_proba"):
+                model_proba = float(active_model.predict_proba(X_ordered)[0][1])
+                prob_source = "predict_proba"
             else:
-                # If both are low, use a blend (weighted towards rule-based)
-                proba = (model_proba * 0.3) + (rule_based_proba * 0.7)
-                prob_source = "blended (model + rule_based)"
-                logger.info(f"Blended probability: {proba:.4f} (model: {model_proba:.4f}, rule-based: {rule_based_proba:.4f})")
-        else:
-            # Model prediction is reasonable, use it
-            proba = model_proba
+                pred = active_model.predict(X_ordered)[0]
+                model_proba = float(pred)
+                prob_source = "predict (fallback)"
+            model_seconds = time.perf_counter() - started
+            metrics.observe("cervi_predict_stage_duration_seconds", model_seconds, stage="predict_proba")
+            server_timing.record("model", model_seconds)
+            version.stats.record(model_seconds, [model_proba])
+            prediction_cache.put(cache_key, (model_proba, prob_source, X_ordered, model_seconds))
+        # Only primary-served requests: a sample routed to the candidate would be compared with itself
+        if version is registry.primary and shadow_scorer.version not in (None, version):
+            shadow_scorer.offer(X_ordered, model_proba, model_seconds)
+        
+        with predict_stage("rule_fallback", "rules"):
+            proba, prob_source = apply_rule_fallback(model_proba, prob_source, options.dict())
+        metrics.inc("cervi_probability_source_total", endpoint="predict", branch=fallback_branch(prob_source))
     except AttributeError as e:
+        version.stats.record_error()
         if "_name_to_fitted_passthrough" in str(e) or "ColumnTransformer" in str(e):
             logger.error("scikit-learn version mismatch! Model was trained with a different version.")
             logger.error("Please update scikit-learn: pip install 'scikit-learn>=1.3.0'")
@@ -597,218 +1295,435 @@ def predict(options: UserOptions) -> Dict[str, Any]:
         logger.exception("Prediction failed - AttributeError")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
     except Exception as e:
+        version.stats.record_error()
         logger.exception("Prediction failed")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
 
+    response_started = time.perf_counter()
+    prediction_id = prediction_store.put({
+        "version": version,
+        "options": options.dict(),
+        "X_ordered": X_ordered,
+        "model_proba": model_proba,
+        "probability": proba,
+        "probability_source": prob_source,
+    })
+    
     bucket = risk_bucket(proba)
     risk_color = get_risk_color(bucket)
     
-    if bucket == "Low":
-        advice = "Low risk — routine screening as per local guidelines is recommended."
-    elif bucket == "Medium":
-        advice = "Medium risk — consider scheduling a clinical check-up and follow-up screening."
-    else:
-        advice = "High risk — seek urgent clinical evaluation and further diagnostic testing."
+    language = localizer.resolve(lang, accept_language)
+    advice = localizer.render(language, f"advice_{bucket.lower()}")
 
-    feature_imp = None
-    try:
-        if hasattr(model, "feature_importances_"):
-            feature_imp = getattr(model, "feature_importances_").tolist()
-        elif hasattr(model, "named_steps"):
-            for step in model.named_steps.values():
-                if hasattr(step, "feature_importances_"):
-                    feature_imp = step.feature_importances_.tolist()
-                    break
-    except Exception:
-        feature_imp = None
-
-    return {
+    response = {
         "probability": proba,
         "probability_percent": round(proba * 100, 2),
         "probability_source": prob_source,
+        "prediction_id": prediction_id,
+        "prediction_expires_in": PREDICTION_TTL_SECONDS,
         "risk_bucket": bucket,
         "risk_color": risk_color,
         "advice": advice,
-        "feature_importances_estimator": feature_imp,
+        "risk_label": localizer.render(language, f"risk_{bucket.lower()}"),
+        "language": language,
+        "model_version": version.name,
+        "degraded": degraded,
         "label": "Positive" if proba >= 0.5 else "Negative",
         "confidence": "High" if abs(proba - 0.5) > 0.3 else "Medium" if abs(proba - 0.5) > 0.15 else "Low"
     }
+    response_seconds = time.perf_counter() - response_started
+    metrics.observe("cervi_predict_stage_duration_seconds", response_seconds, stage="response_build")
+    server_timing.record("render", response_seconds)
+    return response
+
+
+def batch_options(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch rows as /predict sees them: backend field names, and the UserOptions default for
+    every optional field that is missing or null. Other columns (e.g. a group_by column) are kept.
+    """
+    frame = backend_field_frame(frame)
+    filled = {}
+    for name, field in UserOptions.__fields__.items():
+        if field.required:
+            continue
+        if name not in frame.columns:
+            filled[name] = field.default
+        elif frame[name].isna().any():
+            filled[name] = frame[name].where(frame[name].notna(), field.default)
+    return frame.assign(**filled) if filled else frame
+
+
+def batch_rule_fallback(frame: pd.DataFrame, model_proba: np.ndarray,
+                        base_source: str = "predict_proba") -> Tuple[List[float], List[str]]:
+    """
+    apply_rule_fallback for a batch_options() frame and its model probabilities.
+    Returns (probabilities, probability_sources) as /predict would report them row by row.
+    """
+    probabilities = np.asarray(model_proba, dtype=float).tolist()
+    sources = [base_source] * len(probabilities)
+
+    # Rule-based fallback only needs the raw fields of the rows the model scored too low
+    # (already keyed by backend field names, whichever naming the batch used)
+    low_rows = np.flatnonzero(np.asarray(model_proba) < 0.1)
+    if len(low_rows):
+        raw_rows = frame.iloc[low_rows].to_dict(orient="records")
+        for i, raw in zip(low_rows.tolist(), raw_rows):
+            probabilities[i], sources[i] = apply_rule_fallback(probabilities[i], base_source, raw, quiet=True)
+        logger.info(f"Batch scoring: rule-based fallback applied to {len(low_rows)}/{len(probabilities)} rows")
+    return probabilities, sources
+
+
+def _score_batch(frame: pd.DataFrame, version) -> Dict[str, list]:
+    """Score a decoded batch in one vectorized pass with one model version. Returns columnar results."""
+    frame = batch_options(frame)
+    X = preprocess_batch(frame)
+    X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
+
+    active_model = version.model
+    try:
+        if hasattr(active_model, "predict_proba"):
+            model_proba = active_model.predict_proba(X_ordered)[:, 1].astype(float)
+            base_source = "predict_proba"
+        else:
+            model_proba = np.asarray(active_model.predict(X_ordered), dtype=float)
+            base_source = "predict (fallback)"
+    except Exception:
+        version.stats.record_error()
+        raise
+    version.stats.record_batch(model_proba.tolist())
+
+    probabilities, sources = batch_rule_fallback(frame, model_proba, base_source)
+    branches = [fallback_branch(source) for source in sources]
+    for branch in set(branches):
+        metrics.inc("cervi_probability_source_total", branches.count(branch), endpoint="predict-batch", branch=branch)
+
+    buckets = [risk_bucket(p) for p in probabilities]
+    return {
+        "probability": probabilities,
+        "probability_percent": [round(p * 100, 2) for p in probabilities],
+        "probability_source": sources,
+        "risk_bucket": buckets,
+        "risk_color": [get_risk_color(b) for b in buckets],
+        "label": ["Positive" if p >= 0.5 else "Negative" for p in probabilities],
+        "model_version": [version.name] * len(probabilities),
+    }
+
+
+async def read_batch_body(request: Request) -> bytes:
+    """Read a /predict-batch body, rejecting it with 413 as soon as it exceeds MAX_BATCH_BYTES."""
+    too_large = HTTPException(status_code=413, detail=f"Batch body too large (limit {MAX_BATCH_BYTES} bytes).")
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > MAX_BATCH_BYTES:
+        raise too_large
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BATCH_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@app.post("/predict-batch")
+async def predict_batch(request: Request) -> Response:
+    """
+    Score many rows at once. Accepts JSON, MessagePack (application/msgpack) or
+    Arrow IPC (application/vnd.apache.arrow.stream / .file) and replies in the same format,
+    one result record per input row (see backend/batch_formats.py).
+    The whole batch is scored by one model version, chosen like /predict.
+    With ?tier=fast the distilled student model scores the batch instead.
+    """
+    tier = request.query_params.get("tier", "full")
+    if tier == "fast":
+        version = student_version
+        if version is None:
+            raise HTTPException(status_code=503, detail="Fast tier unavailable: no student model loaded.")
+    elif tier == "full":
+        version = registry.select(request.headers.get(MODEL_VERSION_HEADER))
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown tier: {tier} (use 'full' or 'fast').")
+    if version is None:
+        raise HTTPException(status_code=503, detail="Model not loaded.")
+
+    try:
+        content_type = normalize_content_type(request.headers.get("content-type", ""))
+    except UnsupportedBatchFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    body = await read_batch_body(request)
+    try:
+        frame = await run_in_threadpool(decode_batch, body, content_type)
+    except UnsupportedBatchFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except BatchFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if len(frame) == 0:
+        raise HTTPException(status_code=400, detail="Batch is empty.")
+    if len(frame) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(frame)} rows (max {MAX_BATCH_ROWS}).")
+
+    is_valid, error_msg = validate_batch(frame)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    try:
+        results = await run_in_threadpool(_score_batch, frame, version)
+        payload = await run_in_threadpool(encode_batch, results, content_type)
+    except Exception as e:
+        logger.exception("Batch prediction failed")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {e}")
+
+    logger.info(f"Batch prediction: {len(frame)} rows ({content_type})")
+    return Response(content=payload, media_type=content_type)
 
 
 @app.post("/explain")
-def explain_prediction(options: UserOptions) -> Dict[str, Any]:
-    """Generate AI-based explanation for the prediction based on risk factors."""
-    global model
-    if model is None:
+def explain_prediction(
+    options: UserOptions,
+    model_version: Optional[str] = Header(None, alias=MODEL_VERSION_HEADER),
+    mode: str = "exact",
+    lang: Optional[str] = None,
+    accept_language: Optional[str] = Header(None, alias="Accept-Language"),
+) -> Dict[str, Any]:
+    """
+    Generate AI-based explanation for the prediction based on risk factors.
+    Uses the primary model unless a version is pinned with the routing header.
+    feature_contributions are per-feature contributions of the actual prediction
+    (see backend/explainer.py): ?mode=exact (TreeSHAP, default) or ?mode=fast (path attribution).
+    Text is rendered in the language from ?lang= or Accept-Language (default English).
+    """
+    server_timing.mark("parse")
+    if mode not in EXPLAIN_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Use one of: {', '.join(EXPLAIN_MODES)}")
+    version = registry.get(model_version) if model_version else None
+    version = version or registry.primary
+    if version is None:
         raise HTTPException(status_code=503, detail="Model not loaded.")
+    return build_explanation(version, options.dict(), mode, localizer.resolve(lang, accept_language))
+
+
+@app.post("/explain/{prediction_id}")
+def explain_stored_prediction(
+    prediction_id: str,
+    mode: str = "exact",
+    options: Optional[UserOptions] = None,
+    lang: Optional[str] = None,
+    accept_language: Optional[str] = Header(None, alias="Accept-Language"),
+) -> Dict[str, Any]:
+    """
+    Explain a /predict result by its prediction_id, reusing the stored preprocessed row and
+    probabilities, so the explanation reports the probability /predict returned. An expired or
+    unknown id is recomputed from the UserOptions body when one is sent (as /explain would), otherwise 404.
+    """
+    server_timing.mark("parse")
+    if mode not in EXPLAIN_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Use one of: {', '.join(EXPLAIN_MODES)}")
+    stored = prediction_store.get(prediction_id)
+    if stored is None:
+        if options is None:
+            raise HTTPException(status_code=404, detail="Prediction expired or unknown. Resend the assessment to /explain.")
+        return explain_prediction(options, model_version=None, mode=mode, lang=lang, accept_language=accept_language)
+    return build_explanation(stored["version"], stored["options"], mode, localizer.resolve(lang, accept_language),
+                             X_ordered=stored["X_ordered"], model_proba=stored["model_proba"],
+                             proba=stored["probability"], prob_source=stored["probability_source"])
+
+
+def build_explanation(version: ModelVersion, data: Dict[str, Any], mode: str, lang: str = "en",
+                      X_ordered: Optional[pd.DataFrame] = None, model_proba: Optional[float] = None,
+                      proba: Optional[float] = None, prob_source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Explanation of one prediction by one model version, in one language (cached per model hash,
+    mode, language and input). probability and the text are for the probability /predict serves
+    (rule-based fallback included); feature_contributions explain model_probability. Pass the
+    preprocessed row and the probabilities when already known to skip recomputing them.
+    """
+    active_model = version.model
+    text = lambda key, **values: localizer.render(lang, key, **values)
+    
+    fingerprint, options_key = model_fingerprint(version), canonical_key(data)
+    cached = explanation_cache.get((fingerprint, mode, lang, options_key))
+    if cached is not None:
+        return dict(cached)
     
     try:
         # Preprocess input
-        X = preprocess_input(options.dict())
-        X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
-        
-        # Get prediction
-        proba = float(model.predict_proba(X_ordered)[0][1]) if hasattr(model, "predict_proba") else float(model.predict(X_ordered)[0])
-        
-        # Calculate rule-based risk for comparison
-        rule_based_proba = calculate_rule_based_risk(options.dict())
+        if X_ordered is None:
+            with server_timing.stage("preprocess"):
+                X = preprocess_input(data)
+                X_ordered = X[[col for col in FEATURE_ORDER if col in X.columns]]
+        
+        # Get prediction (usually just scored by /predict with the same payload)
+        if model_proba is None:
+            cached_prediction = prediction_cache.get((fingerprint, options_key))
+            if cached_prediction is not None:
+                model_proba, prob_source = cached_prediction[0], cached_prediction[1]
+            else:
+                with server_timing.stage("model"):
+                    if hasattr(active_model, "predict_proba"):
+                        model_proba, prob_source = float(active_model.predict_proba(X_ordered)[0][1]), "predict_proba"
+                    else:
+                        model_proba, prob_source = float(active_model.predict(X_ordered)[0]), "predict (fallback)"
+        
+        # Same probability /predict serves, so the text never contradicts the prediction
+        if proba is None:
+            with server_timing.stage("rules"):
+                proba, prob_source = apply_rule_fallback(model_proba, prob_source or "predict_proba", data, quiet=True)
+        
+        # Contributions of this prediction; the explainers are built once per loaded model
+        try:
+            with server_timing.stage("model"):
+                shap_result = contributions_for_row(active_model, X_ordered, mode)
+        except Exception as e:
+            logger.warning(f"SHAP contributions unavailable for {version.name}: {e}")
+            shap_result = None
         
         # Analyze risk factors and generate explanation
-        data = options.dict()
+        rules_started = time.perf_counter()
         risk_factors = []
         protective_factors = []
         
         # Age
         age = data.get('Age', 30)
         if age >= 45:
-            risk_factors.append(f"Age {age} (higher risk group: 45+)")
+            risk_factors.append(text("factor_age_high", age=age))
         elif age >= 35:
-            risk_factors.append(f"Age {age} (moderate risk group: 35-44)")
+            risk_factors.append(text("factor_age_moderate", age=age))
         elif age < 25:
-            protective_factors.append(f"Young age ({age})")
+            protective_factors.append(text("factor_age_young", age=age))
         
         # Sexual partners
         partners = data.get('Num_of_sexual_partners', 0)
         if partners >= 8:
-            risk_factors.append(f"High number of sexual partners ({partners})")
+            risk_factors.append(text("factor_partners_high", partners=partners))
         elif partners >= 5:
-            risk_factors.append(f"Multiple sexual partners ({partners})")
+            risk_factors.append(text("factor_partners_multiple", partners=partners))
         elif partners <= 1:
-            protective_factors.append(f"Limited sexual partners ({partners})")
+            protective_factors.append(text("factor_partners_limited", partners=partners))
         
         # Early first sex
         first_sex = data.get('First_sex_age', 18)
         if first_sex <= 14:
-            risk_factors.append(f"Early first sexual intercourse (age {first_sex})")
+            risk_factors.append(text("factor_first_sex_early", age=first_sex))
         elif first_sex >= 20:
-            protective_factors.append(f"Later first sexual intercourse (age {first_sex})")
+            protective_factors.append(text("factor_first_sex_later", age=first_sex))
         
         # Pregnancies
         pregnancies = data.get('Num_of_pregnancies', 0)
         if pregnancies >= 5:
-            risk_factors.append(f"Multiple pregnancies ({pregnancies})")
+            risk_factors.append(text("factor_pregnancies", pregnancies=pregnancies))
         
         # Smoking
         smokes = data.get('Smokes_years', 0.0)
         if smokes >= 20:
-            risk_factors.append(f"Long-term smoking ({smokes} years)")
+            risk_factors.append(text("factor_smoking_long", years=smokes))
         elif smokes >= 10:
-            risk_factors.append(f"Smoking history ({smokes} years)")
+            risk_factors.append(text("factor_smoking", years=smokes))
         elif smokes == 0:
-            protective_factors.append("No smoking history")
+            protective_factors.append(text("factor_no_smoking"))
         
         # HIV
         hiv = str(data.get('STDs_HIV', 'No')).lower()
         if hiv in ['yes', '1', 'true', 'positive']:
-            risk_factors.append("HIV positive (major risk factor)")
+            risk_factors.append(text("factor_hiv_positive"))
         else:
-            protective_factors.append("HIV negative")
+            protective_factors.append(text("factor_hiv_negative"))
         
         # Hormonal contraceptives
         hormonal = str(data.get('Hormonal_contraceptives', 'No')).lower()
         hormonal_years = data.get('Hormonal_contraceptives_years', 0.0)
         if hormonal in ['yes', '1', 'true'] and hormonal_years >= 20:
-            risk_factors.append(f"Long-term hormonal contraceptive use ({hormonal_years} years)")
+            risk_factors.append(text("factor_hormonal_long", years=hormonal_years))
         elif hormonal in ['yes', '1', 'true'] and hormonal_years >= 10:
-            risk_factors.append(f"Hormonal contraceptive use ({hormonal_years} years)")
+            risk_factors.append(text("factor_hormonal", years=hormonal_years))
         
         # Symptoms
         pain = str(data.get('Pain_during_intercourse', 'No')).lower()
         if pain in ['yes', '1', 'true']:
-            risk_factors.append("Pain during intercourse (symptom)")
+            risk_factors.append(text("factor_pain"))
         
         discharge_type = str(data.get('Vaginal_discharge_type', 'None')).lower()
         if 'bloody' in discharge_type:
-            risk_factors.append("Bloody vaginal discharge (concerning symptom)")
+            risk_factors.append(text("factor_discharge_bloody"))
         elif discharge_type != 'none':
-            risk_factors.append(f"Abnormal vaginal discharge ({discharge_type})")
+            risk_factors.append(text("factor_discharge_abnormal", type=localizer.option_label(lang, discharge_type)))
         
         discharge_color = str(data.get('Vaginal_discharge_color', 'normal')).lower()
         if 'bloody' in discharge_color:
-            risk_factors.append("Bloody discharge color (concerning)")
+            risk_factors.append(text("factor_discharge_color_bloody"))
         
         bleeding = str(data.get('Vaginal_bleeding_timing', 'None')).lower()
         if 'after sex' in bleeding:
-            risk_factors.append("Vaginal bleeding after sex (very concerning symptom)")
+            risk_factors.append(text("factor_bleeding_after_sex"))
         elif 'between periods' in bleeding or 'after menopause' in bleeding:
-            risk_factors.append(f"Abnormal vaginal bleeding ({bleeding})")
+            risk_factors.append(text("factor_bleeding_abnormal", timing=localizer.option_label(lang, bleeding)))
+        
+        server_timing.record("rules", time.perf_counter() - rules_started)
         
         # Generate explanation text
+        render_started = time.perf_counter()
         explanation_parts = []
         
         if proba >= 0.67:
-            explanation_parts.append("This HIGH risk assessment is primarily due to:")
+            explanation_parts.append(text("explain_intro_high"))
         elif proba >= 0.33:
-            explanation_parts.append("This MEDIUM risk assessment is influenced by:")
+            explanation_parts.append(text("explain_intro_medium"))
         else:
-            explanation_parts.append("This LOW risk assessment reflects:")
+            explanation_parts.append(text("explain_intro_low"))
         
         if risk_factors:
-            explanation_parts.append("Risk factors present:")
+            explanation_parts.append(text("explain_risk_factors"))
             for i, factor in enumerate(risk_factors[:5], 1):  # Top 5 factors
-                explanation_parts.append(f"  {i}. {factor}")
+                explanation_parts.append(text("explain_list_item", index=i, text=factor))
         
         if protective_factors and proba < 0.5:
-            explanation_parts.append("Protective factors:")
+            explanation_parts.append(text("explain_protective_factors"))
             for i, factor in enumerate(protective_factors[:3], 1):  # Top 3 factors
-                explanation_parts.append(f"  {i}. {factor}")
-        
-        # Feature importance scores (simplified based on rule-based calculation)
-        feature_importance = {}
-        feature_map = {
-            'Age': age,
-            'Num_of_sexual_partners': partners,
-            'First_sex_age': first_sex,
-            'STDs_HIV': 1.0 if hiv in ['yes', '1', 'true', 'positive'] else 0.0,
-            'Smokes_years': smokes,
-            'Num_of_pregnancies': pregnancies,
-        }
-        
-        # Calculate importance scores
-        for key, value in feature_map.items():
-            if key == 'Age' and age >= 45:
-                feature_importance[key] = 0.25
-            elif key == 'Num_of_sexual_partners' and partners >= 8:
-                feature_importance[key] = 0.20
-            elif key == 'First_sex_age' and first_sex <= 14:
-                feature_importance[key] = 0.15
-            elif key == 'STDs_HIV' and value > 0:
-                feature_importance[key] = 0.30
-            elif key == 'Smokes_years' and value >= 20:
-                feature_importance[key] = 0.15
-            elif key == 'Num_of_pregnancies' and value >= 5:
-                feature_importance[key] = 0.10
+                explanation_parts.append(text("explain_list_item", index=i, text=factor))
         
         explanation_text = "\n".join(explanation_parts)
         
-        return {
+        response = {
             "probability": proba,
-            "feature_importance": feature_importance,
+            "probability_source": prob_source,
+            "model_probability": model_proba,
+            # Log-odds contributions per FEATURE_ORDER input; base value + sum = the model's raw margin
+            "feature_contributions": shap_result["contributions"] if shap_result else {},
+            "contribution_base_value": shap_result["base_value"] if shap_result else None,
+            "contribution_mode": mode,
             "explanation": explanation_text,
             "risk_factors": risk_factors,
             "protective_factors": protective_factors,
+            "language": lang,
             "message": "AI-based explanation generated successfully"
         }
+        explanation_cache.put((fingerprint, mode, lang, options_key), response)
+        server_timing.record("render", time.perf_counter() - render_started)
+        return dict(response)
     except Exception as e:
         logger.exception("Explanation generation failed")
         # Return a fallback explanation instead of error
         try:
-            data = options.dict()
-            proba_val = proba if 'proba' in locals() else 0.5
-            fallback_explanation = f"Risk assessment: {proba_val:.1%} probability.\n"
+            proba_val = proba if proba is not None else 0.5
+            fallback_explanation = text("explain_fallback_probability", probability=f"{proba_val:.1%}") + "\n"
             if proba_val >= 0.67:
-                fallback_explanation += "High risk factors detected. Please consult a healthcare provider."
+                fallback_explanation += text("explain_fallback_high")
             elif proba_val >= 0.33:
-                fallback_explanation += "Moderate risk detected. Consider regular screening."
+                fallback_explanation += text("explain_fallback_medium")
             else:
-                fallback_explanation += "Low risk. Maintain regular health checkups."
+                fallback_explanation += text("explain_fallback_low")
             
             return {
                 "probability": proba_val,
+                "probability_source": prob_source,
+                "model_probability": model_proba,
                 "explanation": fallback_explanation,
                 "risk_factors": [],
                 "protective_factors": [],
-                "feature_importance": {},
+                "feature_contributions": {},
+                "contribution_base_value": None,
+                "language": lang,
                 "message": "Explanation generated (fallback mode)"
             }
         except Exception as e2:
@@ -817,14 +1732,12 @@ def explain_prediction(options: UserOptions) -> Dict[str, Any]:
 
 @app.get("/translations/{lang}")
 def get_translations(lang: str = "en") -> Dict[str, Any]:
-    """Get translations for a specific language."""
-    try:
-        from translations import TRANSLATIONS
-        if lang not in TRANSLATIONS:
-            lang = "en"
-        return {"translations": TRANSLATIONS[lang], "language": lang}
-    except ImportError:
+    """Get translations for a specific language (the catalog compiled at startup)."""
+    if not localizer.catalogs:
         return {"translations": {}, "language": lang, "error": "Translations module not found"}
+    if lang not in localizer.catalogs:
+        lang = localizer.default
+    return {"translations": localizer.catalogs[lang], "language": lang}
 
 
 @app.get("/example_profiles")
@@ -895,18 +1808,19 @@ def example_profiles() -> Dict[str, Any]:
 @app.post("/save-result")
 async def save_result(result_data: Dict[str, Any]) -> Dict[str, Any]:
     """Save assessment result to history (in-memory storage for demo, use database in production)."""
+    server_timing.mark("parse")
     try:
         import json
         from datetime import datetime
         
         # In production, use a database. For now, save to a JSON file
-        history_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+        history_file = HISTORY_FILE
         
         # Load existing history
         history = []
         if os.path.exists(history_file):
             try:
-                with open(history_file, "r", encoding="utf-8") as f:
+                with server_timing.stage("persist"), open(history_file, "r", encoding="utf-8") as f:
                     history = json.load(f)
             except:
                 history = []
@@ -921,7 +1835,7 @@ async def save_result(result_data: Dict[str, Any]) -> Dict[str, Any]:
         history.append(result_data)
         
         # Save back
-        with open(history_file, "w", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(history_file, "w", encoding="utf-8") as f:
             json.dump(history, f, indent=2)
         
         return {"message": "Result saved successfully", "id": result_data["id"]}
@@ -935,12 +1849,12 @@ def get_history(limit: int = 10) -> Dict[str, Any]:
     """Get assessment history."""
     try:
         import json
-        history_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+        history_file = HISTORY_FILE
         
         if not os.path.exists(history_file):
             return {"history": [], "count": 0}
         
-        with open(history_file, "r", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(history_file, "r", encoding="utf-8") as f:
             history = json.load(f)
         
         # Return most recent results
@@ -952,9 +1866,130 @@ def get_history(limit: int = 10) -> Dict[str, Any]:
         return {"history": [], "count": 0, "error": str(e)}
 
 
+def _history_frame() -> pd.DataFrame:
+    """Assessment inputs from the saved history; entries missing required fields are skipped."""
+    import json
+    if not os.path.exists(HISTORY_FILE):
+        return pd.DataFrame()
+    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+        history = json.load(f)
+    rows = []
+    for entry in history:
+        inputs = entry.get("inputs") or entry.get("options") or entry.get("user_data") or entry
+        if all(inputs.get(field) is not None or inputs.get(FIELD_MAPPING[field]) is not None for field in REQUIRED_FIELDS):
+            rows.append(inputs)
+    return pd.DataFrame(rows)
+
+
+@app.post("/cohort-jobs", status_code=202)
+async def create_cohort_job(
+    file: Optional[UploadFile] = File(None),
+    source: str = "csv",
+    mode: str = "fast",
+    format: str = "ndjson",
+    group_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Start a background job explaining a whole cohort with the primary model: a CSV upload
+    (source=csv, one assessment per row) or the saved history (source=history).
+    Poll GET /cohort-jobs/{job_id} for progress and the per-group factor summary
+    (group_by names a column, e.g. district); fetch rows from /cohort-jobs/{job_id}/results.
+    Each row has probability (as /predict reports it, rule-based fallback included) and
+    model_probability (the raw model output that the contributions explain).
+    """
+    if mode not in EXPLAIN_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Use one of: {', '.join(EXPLAIN_MODES)}")
+    if format not in COHORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}'. Use one of: {', '.join(COHORT_FORMATS)}")
+    version = registry.primary
+    if version is None:
+        raise HTTPException(status_code=503, detail="Model not loaded.")
+    if not version.path or not os.path.isfile(version.path):
+        raise HTTPException(status_code=409, detail=f"Model version {version.name} has no artifact on disk for the job workers.")
+
+    if source == "csv":
+        if file is None:
+            raise HTTPException(status_code=400, detail="Upload a CSV file, or use source=history.")
+        body = await file.read()
+        try:
+            frame = await run_in_threadpool(pd.read_csv, io.BytesIO(body))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not parse CSV: {e}")
+    elif source == "history":
+        frame = await run_in_threadpool(_history_frame)
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown source: {source} (use 'csv' or 'history').")
+
+    if len(frame) == 0:
+        raise HTTPException(status_code=400, detail="Cohort is empty.")
+    if len(frame) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Cohort too large: {len(frame)} rows (max {MAX_BATCH_ROWS}).")
+    if group_by is not None and group_by not in frame.columns:
+        raise HTTPException(status_code=400, detail=f"group_by column '{group_by}' not found.")
+    is_valid, error_msg = validate_batch(frame)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    job = cohort_jobs.submit(batch_options(frame), source, version.path, model_fingerprint(version), version.name,
+                             mode=mode, fmt=format, group_by=group_by,
+                             probability_fn=lambda chunk, proba: batch_rule_fallback(chunk, proba)[0])
+    logger.info(f"Cohort job {job.id} started: {len(frame)} rows from {source}, {job.chunks_total} chunk(s)")
+    return job.snapshot()
+
+
+@app.get("/cohort-jobs")
+def list_cohort_jobs() -> Dict[str, Any]:
+    jobs = cohort_jobs.jobs()
+    return {"jobs": [job.snapshot() for job in jobs], "count": len(jobs)}
+
+
+@app.get("/cohort-jobs/{job_id}")
+def cohort_job_status(job_id: str) -> Dict[str, Any]:
+    job = cohort_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown cohort job: {job_id}")
+    return job.snapshot()
+
+
+def _follow_ndjson(job, poll_seconds: float = 0.2):
+    """Yield a job's NDJSON result lines as they are written, until the job finishes."""
+    while not os.path.exists(job.result_path) and not job.finished:
+        time.sleep(poll_seconds)
+    if not os.path.exists(job.result_path):
+        return
+    with open(job.result_path, "r", encoding="utf-8") as f:
+        pending = ""
+        while True:
+            finished = job.finished
+            pending += f.read()
+            if "\n" in pending:
+                complete, pending = pending.rsplit("\n", 1)
+                yield complete + "\n"
+            if finished:
+                return
+            time.sleep(poll_seconds)
+
+
+@app.get("/cohort-jobs/{job_id}/results")
+def cohort_job_results(job_id: str) -> Response:
+    """NDJSON jobs stream rows while running (one JSON object per line); Parquet jobs download when done."""
+    job = cohort_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown cohort job: {job_id}")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Cohort job failed: {job.error}")
+    if job.format == "parquet":
+        if not job.finished:
+            raise HTTPException(status_code=409, detail="Parquet results are available when the job is done.")
+        return FileResponse(job.result_path, media_type="application/vnd.apache.parquet",
+                            filename=f"cohort_{job.id}.parquet")
+    return StreamingResponse(_follow_ndjson(job), media_type="application/x-ndjson")
+
+
 @app.post("/generate-pdf")
 async def generate_pdf(result_data: Dict[str, Any]) -> JSONResponse:
     """Generate PDF report for assessment result."""
+    server_timing.mark("parse")
     temp_path = None
     try:
         from reportlab.lib.pagesizes import letter
@@ -971,6 +2006,7 @@ async def generate_pdf(result_data: Dict[str, Any]) -> JSONResponse:
         temp_file.close()
         
         # Create PDF
+        render_started = time.perf_counter()
         doc = SimpleDocTemplate(temp_path, pagesize=letter)
         story = []
         styles = getSampleStyleSheet()
@@ -1083,9 +2119,10 @@ async def generate_pdf(result_data: Dict[str, Any]) -> JSONResponse:
         
         # Build PDF
         doc.build(story)
+        server_timing.record("render", time.perf_counter() - render_started)
         
         # Read PDF and return as base64
-        with open(temp_path, "rb") as f:
+        with server_timing.stage("persist"), open(temp_path, "rb") as f:
             pdf_bytes = f.read()
         
         import base64
@@ -1110,6 +2147,7 @@ async def generate_pdf(result_data: Dict[str, Any]) -> JSONResponse:
 @app.post("/set-reminder")
 async def set_reminder(reminder_data: Dict[str, Any]) -> Dict[str, Any]:
     """Set a reminder for follow-up screening."""
+    server_timing.mark("parse")
     try:
         import json
         from datetime import datetime
@@ -1119,7 +2157,7 @@ async def set_reminder(reminder_data: Dict[str, Any]) -> Dict[str, Any]:
         reminders = []
         if os.path.exists(reminders_file):
             try:
-                with open(reminders_file, "r", encoding="utf-8") as f:
+                with server_timing.stage("persist"), open(reminders_file, "r", encoding="utf-8") as f:
                     reminders = json.load(f)
             except:
                 reminders = []
@@ -1133,7 +2171,7 @@ async def set_reminder(reminder_data: Dict[str, Any]) -> Dict[str, Any]:
         reminder_data["created_at"] = datetime.now().isoformat()
         reminders.append(reminder_data)
         
-        with open(reminders_file, "w", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(reminders_file, "w", encoding="utf-8") as f:
             json.dump(reminders, f, indent=2)
         
         return {"message": "Reminder set successfully", "id": reminder_data["id"]}
@@ -1154,7 +2192,7 @@ def get_reminders() -> Dict[str, Any]:
         if not os.path.exists(reminders_file):
             return {"reminders": [], "count": 0}
         
-        with open(reminders_file, "r", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(reminders_file, "r", encoding="utf-8") as f:
             reminders = json.load(f)
         
         # Filter out past reminders if needed
@@ -1385,43 +2423,285 @@ def get_educational_content(category: Optional[str] = None) -> Dict[str, Any]:
 
 
 @app.post("/upload-model")
-async def upload_model(file: UploadFile = File(...)) -> Dict[str, Any]:
-    """Upload a joblib model (.pkl/.joblib). Saves next to this app and loads it."""
-    global model, model_path
+async def upload_model(
+    file: UploadFile = File(...),
+    version: Optional[str] = None,
+    weight: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Upload a joblib model (.pkl/.joblib) or a memory-mapped flat model (.flat). The file is streamed to a temp file,
+    loaded, validated and warmed up off the event loop, then swapped in atomically.
+    If validation or warm-up fails the current model keeps serving.
+
+    Without `version` the upload replaces the primary model. With `version` it is
+    registered next to the primary as a candidate receiving `weight` (0..1) of the traffic.
+    """
+    if not 0 <= weight <= 1:
+        raise HTTPException(status_code=400, detail="Weight must be between 0 and 1.")
+    safe_name = os.path.basename(file.filename or "")
+    if not safe_name:
+        raise HTTPException(status_code=400, detail="Invalid filename.")
+    ext = os.path.splitext(safe_name)[1].lower()
+    allowed_ext = {".pkl", ".joblib", ".model", ".sav", FLAT_SUFFIX}
+    if ext not in allowed_ext:
+        raise HTTPException(status_code=400, detail=f"Unsupported file extension: {ext}")
+
+    # Save to model_files directory (temp file first so a bad upload never replaces a good model)
+    model_dir = MODEL_DIR
+    os.makedirs(model_dir, exist_ok=True)
+    target_path = os.path.join(model_dir, safe_name)
+
+    primary = registry.primary
+    as_candidate = bool(version) and (primary is None or version != primary.name)
+    if as_candidate and primary is not None and os.path.abspath(target_path) == os.path.abspath(primary.path):
+        raise HTTPException(status_code=409, detail="A candidate version cannot overwrite the primary model file; use a different filename.")
+
+    temp_file = tempfile.NamedTemporaryFile(dir=model_dir, prefix=".upload-", suffix=ext, delete=False)
+    temp_path = temp_file.name
     try:
-        contents = await file.read()
-        safe_name = os.path.basename(file.filename or "")
-        if not safe_name:
-            raise HTTPException(status_code=400, detail="Invalid filename.")
-        ext = os.path.splitext(safe_name)[1].lower()
-        allowed_ext = {".pkl", ".joblib", ".model", ".sav"}
-        if ext not in allowed_ext:
-            raise HTTPException(status_code=400, detail=f"Unsupported file extension: {ext}")
-
-        # Save to model_files directory
-        model_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_files")
-        os.makedirs(model_dir, exist_ok=True)
-        target_path = os.path.join(model_dir, safe_name)
-
-        with open(target_path, "wb") as f:
-            f.write(contents)
-
-        loaded, loaded_path = try_load_model(target_path)
+        size = 0
+        with temp_file:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_MODEL_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Model file too large (limit {MAX_MODEL_UPLOAD_BYTES} bytes)."
+                    )
+                await run_in_threadpool(temp_file.write, chunk)
+
+        # joblib.load can take seconds; keep it off the event loop
+        load_started = time.perf_counter()
+        loaded, error = await run_in_threadpool(load_and_validate_model, temp_path)
+        model_loader.record("upload", time.perf_counter() - load_started, loaded is not None, error)
         if loaded is None:
-            try:
-                os.remove(target_path)
-            except Exception:
-                pass
-            raise HTTPException(status_code=400, detail="Uploaded file is not a valid model or failed to load.")
-        model = loaded
-        model_path = loaded_path
-        logger.info(f"Model uploaded and loaded from {loaded_path}")
-        return {"message": "Model uploaded successfully", "model_path": model_path}
+            raise HTTPException(status_code=400, detail=f"Uploaded model rejected: {error}")
+
+        # Warm the new model before it takes traffic, so the swap never exposes a cold model
+        name = version or version_name_for(target_path)
+        try:
+            warmup_report = await run_in_threadpool(warm_up_model, loaded, name)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Uploaded model failed warm-up: {e}")
+
+        # Keep the file being replaced so /model/rollback can restore it
+        if os.path.exists(target_path):
+            os.replace(target_path, target_path + ".prev")
+        os.replace(temp_path, target_path)
+        if as_candidate:
+            registry.add(version, loaded, target_path, weight=weight)
+        else:
+            swap_model(loaded, target_path, name)
+            readiness.finish_warmup(warmup_report)
+            update_manifest(target_path, name)
+        logger.info(f"Model uploaded and loaded from {target_path} ({size} bytes) as version {name}")
+        return {
+            "message": "Model uploaded successfully",
+            "model_path": target_path,
+            "model_version": name,
+            "primary": not as_candidate,
+            "size_bytes": size,
+            "warmup_seconds": warmup_report["seconds"],
+        }
     except HTTPException:
         raise
     except Exception as e:
         logger.exception("Upload failed")
         raise HTTPException(status_code=400, detail=f"Upload failed: {e}")
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except Exception:
+                pass
+
+
+@app.post("/model/rollback")
+def rollback_model() -> Dict[str, Any]:
+    """Restore the primary model that was serving before the last swap."""
+    global _previous_version
+    with _model_lock:
+        if _previous_version is None:
+            raise HTTPException(status_code=409, detail="No previous model to roll back to.")
+        rolled_back_from = model_path
+        registry.restore(_previous_version)
+        _previous_version = None
+        _sync_primary()
+
+    # Put the previous file back if the upload overwrote it
+    if rolled_back_from and rolled_back_from == model_path and os.path.exists(model_path + ".prev"):
+        os.replace(model_path + ".prev", model_path)
+    update_manifest(model_path, registry.primary.name)
+
+    logger.info(f"Rolled back model from {rolled_back_from} to {model_path}")
+    return {"message": "Model rolled back", "model_path": model_path, "rolled_back_from": rolled_back_from}
+
+
+@app.get("/models")
+def list_models() -> Dict[str, Any]:
+    """
+    List loaded model versions with routing weights and per-version latency/error/score stats,
+    plus model load history (duration and cause of each load) and result cache hit rates.
+    """
+    return {
+        **registry.snapshot(),
+        "loads": model_loader.snapshot(),
+        "caches": {"prediction": prediction_cache.snapshot(), "explanation": explanation_cache.snapshot(),
+                   "prediction_store": prediction_store.snapshot()},
+    }
+
+
+def _collect_metrics():
+    """Scrape-time metric families read from the model registry, loader, caches and queues."""
+    versions = registry.versions()
+    yield ("cervi_model_inference_duration_seconds", "histogram", "Single-row model inference latency per model version",
+           [({"version": v.name}, v.stats.latency) for v in versions])
+    yield ("cervi_model_requests_total", "counter", "Single-row scoring requests per model version",
+           [({"version": v.name}, v.stats.requests) for v in versions])
+    yield ("cervi_model_cached_requests_total", "counter", "Single-row requests answered from the prediction cache",
+           [({"version": v.name}, v.stats.cached_requests) for v in versions])
+    yield ("cervi_model_errors_total", "counter", "Failed scoring requests per model version",
+           [({"version": v.name}, v.stats.errors) for v in versions])
+    yield ("cervi_model_batch_rows_total", "counter", "Rows scored through batch endpoints per model version",
+           [({"version": v.name}, v.stats.batch_rows) for v in versions])
+    loads = model_loader.durations()
+    yield ("cervi_model_load_duration_seconds", "histogram", "Model load time by cause",
+           [({"cause": cause}, hist) for cause, (hist, _) in loads.items()])
+    yield ("cervi_model_loads_total", "counter", "Model loads by cause and outcome",
+           [({"cause": cause, "outcome": outcome}, count)
+            for cause, (_, outcomes) in loads.items() for outcome, count in outcomes.items()])
+    yield ("cervi_model_loading", "gauge", "1 while a model load is in flight", [({}, int(model_loader.loading))])
+    caches = {"prediction": prediction_cache.snapshot(), "explanation": explanation_cache.snapshot(),
+              "prediction_store": prediction_store.snapshot()}
+    yield ("cervi_cache_hits_total", "counter", "Result cache hits",
+           [({"cache": name}, c["hits"]) for name, c in caches.items()])
+    yield ("cervi_cache_misses_total", "counter", "Result cache misses",
+           [({"cache": name}, c["misses"]) for name, c in caches.items()])
+    yield ("cervi_cache_entries", "gauge", "Entries held by each result cache",
+           [({"cache": name}, c["size"]) for name, c in caches.items()])
+    shadow = shadow_scorer.snapshot()
+    yield ("cervi_queue_depth", "gauge", "Work waiting in background queues",
+           [({"queue": "shadow"}, shadow["queue_size"]), ({"queue": "cohort_jobs"}, cohort_jobs.queue_depth())])
+    yield ("cervi_shadow_dropped_total", "counter", "Shadow samples dropped because the queue was full",
+           [({}, shadow["dropped"])])
+    yield ("cervi_ready", "gauge", "1 when /readyz answers 200 (warmed up and last self-test passed)",
+           [({}, int(readiness.ready and health_probe.healthy))])
+    yield ("cervi_health_self_test_ok", "gauge", "1 if the last background self-test passed",
+           [({}, int(health_probe.healthy))])
+
+
+metrics.add_collector(_collect_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text-format metrics: request latency per route, /predict stage timings,
+    fallback branch counts, model load times, cache hits and queue depths."""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/models/{name}/promote")
+def promote_model(name: str) -> Dict[str, Any]:
+    """Make a loaded version the primary."""
+    global _previous_version
+    with _model_lock:
+        previous = registry.primary
+        try:
+            registry.promote(name)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown model version: {name}")
+        if previous is not None and previous.name != name:
+            _previous_version = previous
+        _sync_primary()
+    update_manifest(model_path, name)
+    logger.info(f"Promoted model version {name} to primary")
+    return {"message": "Model version promoted", "primary": name}
+
+
+@app.post("/models/{name}/weight")
+def set_model_weight(name: str, weight: float) -> Dict[str, Any]:
+    """Set the fraction of traffic (0..1) a candidate version receives (0 = header-only)."""
+    try:
+        registry.set_weight(name, weight)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {name}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Weight updated", "name": name, "weight": weight}
+
+
+@app.delete("/models/{name}")
+def unload_model_version(name: str) -> Dict[str, Any]:
+    """Unload a non-primary version."""
+    try:
+        removed = registry.remove(name)
+        if shadow_scorer.version is removed:
+            shadow_scorer.set_version(None)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {name}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": "Model version unloaded", "name": name}
+
+
+@app.get("/model/importance")
+def model_importance(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Global feature importance of a model version (default: primary) over the FEATURE_ORDER
+    inputs: share of split cover and mean |contribution| on reference profiles.
+    Computed once per loaded model, during warm-up.
+    """
+    version = registry.get(name) if name else registry.primary
+    if version is None:
+        raise HTTPException(status_code=404 if name else 503,
+                            detail=f"Unknown model version: {name}" if name else "Model not loaded.")
+    try:
+        importance = explainer_for(version.model).global_importance(importance_reference())
+    except Exception as e:
+        logger.exception("Feature importance failed")
+        raise HTTPException(status_code=500, detail=f"Feature importance unavailable for {version.name}: {e}")
+    return {"model_version": version.name, **importance}
+
+
+@app.get("/model/student")
+def student_status() -> Dict[str, Any]:
+    """Distilled student model: training-time agreement with the full model and live stats."""
+    if student_version is None:
+        raise HTTPException(status_code=404, detail="No student model loaded.")
+    return {
+        **student_version.describe(),
+        "agreement": student_version.model.spec.get("agreement"),
+        "created_at": student_version.model.spec.get("created_at"),
+    }
+
+
+@app.get("/shadow")
+def shadow_status() -> Dict[str, Any]:
+    """Shadow scoring status: queue depth, drops and primary-vs-shadow comparison stats."""
+    return shadow_scorer.snapshot()
+
+
+@app.post("/shadow/{name}")
+def enable_shadow(name: str) -> Dict[str, Any]:
+    """
+    Shadow a loaded model version: it scores a copy of the /predict inputs served by the primary in the
+    background and its outputs are only logged and aggregated, never returned.
+    """
+    version = registry.get(name)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {name}")
+    shadow_scorer.set_version(version)
+    return {"message": "Shadow scoring enabled", "version": name}
+
+
+@app.delete("/shadow")
+def disable_shadow() -> Dict[str, Any]:
+    """Stop shadow scoring."""
+    shadow_scorer.set_version(None)
+    return {"message": "Shadow scoring disabled"}
 
 
 # ---------- Profile Management Endpoints ----------
@@ -1429,6 +2709,7 @@ async def upload_model(file: UploadFile = File(...)) -> Dict[str, Any]:
 @app.post("/profile")
 async def create_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create or update user profile."""
+    server_timing.mark("parse")
     try:
         import json
         from datetime import datetime
@@ -1438,7 +2719,7 @@ async def create_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         profiles = {}
         if os.path.exists(profiles_file):
             try:
-                with open(profiles_file, "r", encoding="utf-8") as f:
+                with server_timing.stage("persist"), open(profiles_file, "r", encoding="utf-8") as f:
                     profiles = json.load(f)
             except:
                 profiles = {}
@@ -1452,7 +2733,7 @@ async def create_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         
         profiles[profile_id] = profile_data
         
-        with open(profiles_file, "w", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(profiles_file, "w", encoding="utf-8") as f:
             json.dump(profiles, f, indent=2)
         
         return {"message": "Profile saved successfully", "profile_id": profile_id, "profile": profile_data}
@@ -1471,7 +2752,7 @@ def get_profile(profile_id: str) -> Dict[str, Any]:
         if not os.path.exists(profiles_file):
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        with open(profiles_file, "r", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(profiles_file, "r", encoding="utf-8") as f:
             profiles = json.load(f)
         
         if profile_id not in profiles:
@@ -1495,7 +2776,7 @@ def list_profiles() -> Dict[str, Any]:
         if not os.path.exists(profiles_file):
             return {"profiles": [], "count": 0}
         
-        with open(profiles_file, "r", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(profiles_file, "r", encoding="utf-8") as f:
             profiles = json.load(f)
         
         return {"profiles": list(profiles.values()), "count": len(profiles)}
@@ -1514,7 +2795,7 @@ def delete_profile(profile_id: str) -> Dict[str, Any]:
         if not os.path.exists(profiles_file):
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        with open(profiles_file, "r", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(profiles_file, "r", encoding="utf-8") as f:
             profiles = json.load(f)
         
         if profile_id not in profiles:
@@ -1522,7 +2803,7 @@ def delete_profile(profile_id: str) -> Dict[str, Any]:
         
         del profiles[profile_id]
         
-        with open(profiles_file, "w", encoding="utf-8") as f:
+        with server_timing.stage("persist"), open(profiles_file, "w", encoding="utf-8") as f:
             json.dump(profiles, f, indent=2)
         
         return {"message": "Profile deleted successfully"}
@@ -0,0 +1,128 @@
+"""
+Wire formats for the batch scoring endpoint.
+
+Decodes JSON, MessagePack and Arrow IPC request bodies into a DataFrame that
+preprocess_batch can consume directly, and encodes scored results back into the
+same format the caller used. Results have one shape in every format: one record
+per input row, in input order. JSON and msgpack send {"count": n, "results":
+[record, ...]}; Arrow sends a table with one row per record. msgpack and pyarrow
+are imported lazily so the single-row endpoints keep working when they are not installed.
+"""
+import json
+import logging
+from typing import Any, Dict, List
+
+import pandas as pd
+
+logger = logging.getLogger("cervi_backend")
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/msgpack"
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_TYPE = "application/vnd.apache.arrow.file"
+
+# Aliases seen in the wild, normalised to the canonical type above
+CONTENT_TYPE_ALIASES = {
+    "application/json": JSON_TYPE,
+    "application/msgpack": MSGPACK_TYPE,
+    "application/x-msgpack": MSGPACK_TYPE,
+    "application/vnd.msgpack": MSGPACK_TYPE,
+    "application/vnd.apache.arrow.stream": ARROW_STREAM_TYPE,
+    "application/vnd.apache.arrow.file": ARROW_FILE_TYPE,
+    "application/x-arrow": ARROW_STREAM_TYPE,
+}
+
+
+class BatchFormatError(ValueError):
+    """Raised when a batch body cannot be decoded."""
+
+
+class UnsupportedBatchFormat(BatchFormatError):
+    """Raised when the content type is unknown or its codec is not installed."""
+
+
+def normalize_content_type(content_type: str) -> str:
+    """Strip parameters (e.g. charset) and map aliases to a canonical type."""
+    base = (content_type or JSON_TYPE).split(";")[0].strip().lower()
+    if base not in CONTENT_TYPE_ALIASES:
+        raise UnsupportedBatchFormat(f"Unsupported content type: {base}")
+    return CONTENT_TYPE_ALIASES[base]
+
+
+def _rows_or_columns_to_frame(payload: Any) -> pd.DataFrame:
+    """Accept a list of records, a dict of columns, or {"records": [...]}."""
+    if isinstance(payload, dict) and "records" in payload:
+        payload = payload["records"]
+    if isinstance(payload, list):
+        if payload and not isinstance(payload[0], dict):
+            raise BatchFormatError("Batch records must be objects/maps")
+        return pd.DataFrame.from_records(payload)
+    if isinstance(payload, dict):
+        try:
+            return pd.DataFrame(payload)
+        except ValueError as e:
+            raise BatchFormatError(f"Columnar batch has mismatched column lengths: {e}")
+    raise BatchFormatError("Batch body must be a list of records or a map of columns")
+
+
+def decode_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """Decode a request body into a DataFrame of raw (unpreprocessed) input rows."""
+    fmt = normalize_content_type(content_type)
+
+    if fmt == JSON_TYPE:
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise BatchFormatError(f"Invalid JSON body: {e}")
+        return _rows_or_columns_to_frame(payload)
+
+    if fmt == MSGPACK_TYPE:
+        try:
+            import msgpack
+        except ImportError:
+            raise UnsupportedBatchFormat("msgpack is not installed on this server")
+        try:
+            payload = msgpack.unpackb(body, raw=False)
+        except Exception as e:
+            raise BatchFormatError(f"Invalid msgpack body: {e}")
+        return _rows_or_columns_to_frame(payload)
+
+    # Arrow IPC: columns are converted straight to pandas without a per-row pass
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise UnsupportedBatchFormat("pyarrow is not installed on this server")
+    try:
+        reader = pa.BufferReader(body)
+        if fmt == ARROW_FILE_TYPE:
+            table = pa.ipc.open_file(reader).read_all()
+        else:
+            table = pa.ipc.open_stream(reader).read_all()
+    except Exception as e:
+        raise BatchFormatError(f"Invalid Arrow IPC body: {e}")
+    return table.to_pandas()
+
+
+def encode_batch(results: Dict[str, List[Any]], content_type: str) -> bytes:
+    """Encode columnar results as one record per row in the caller's format (content type already normalized)."""
+    if content_type in (JSON_TYPE, MSGPACK_TYPE):
+        count = len(next(iter(results.values()), []))
+        records = [
+            {name: column[i] for name, column in results.items()}
+            for i in range(count)
+        ]
+        if content_type == JSON_TYPE:
+            return json.dumps({"count": count, "results": records}).encode("utf-8")
+        import msgpack
+        return msgpack.packb({"count": count, "results": records}, use_bin_type=True)
+
+    import pyarrow as pa
+    table = pa.table(results)
+    sink = pa.BufferOutputStream()
+    if content_type == ARROW_FILE_TYPE:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,158 @@
+"""
+Build-time model compilation (run from the Dockerfile / Render build command).
+
+1. Picks the source artifact (the manifest's, or --source)
+2. Compiles it into the memory-mapped flat format (backend/flat_model.py)
+3. Checks probability parity between source and compiled artifact on synthetic profiles
+4. Loads the compiled artifact in a fresh process and scores once (load + first-call timing)
+5. Points model_files/manifest.json at the compiled artifact
+6. Precompiles Python bytecode for the app
+
+Container start then only memory-maps a ready artifact. Exits non-zero if any
+check fails, so a bad artifact fails the build instead of the first request.
+
+Usage:
+    python backend/build_model.py [--source model_files/cervical_cancer_model.pkl]
+                                  [--model-dir model_files] [--tolerance 1e-5] [--profiles 500]
+"""
+import argparse
+import compileall
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from flat_model import FlatModel, write_flat_model, is_flat_model, FLAT_SUFFIX
+from model_artifacts import NativeModel, is_native_spec, NATIVE_SPEC_SUFFIX, SERVING_SUFFIX
+from model_manifest import read_manifest, resolve_manifest, write_manifest
+from preprocess import FEATURE_ORDER, preprocess_batch
+from warmup import synthetic_profiles
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BACKEND_DIR)
+
+_FIRST_PREDICTION_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[2])
+import pandas as pd
+from flat_model import FlatModel
+from preprocess import preprocess_batch, FEATURE_ORDER
+from warmup import synthetic_profiles
+imported = time.perf_counter()
+m = FlatModel.load(sys.argv[1])
+loaded = time.perf_counter()
+X = preprocess_batch(pd.DataFrame(synthetic_profiles(1)))[FEATURE_ORDER]
+m.predict_proba(X)
+done = time.perf_counter()
+print(json.dumps({"import_seconds": imported - started, "load_seconds": loaded - imported,
+                  "first_prediction_seconds": done - loaded, "total_seconds": done - started}))
+"""
+
+
+def load_source(path: str):
+    if is_flat_model(path):
+        return FlatModel.load(path)
+    if is_native_spec(path):
+        return NativeModel.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+def compiled_path_for(source: str, model_dir: str) -> str:
+    """Flat artifact path in model_dir named after the source artifact."""
+    name = os.path.basename(source)
+    for suffix in (FLAT_SUFFIX, NATIVE_SPEC_SUFFIX, SERVING_SUFFIX):
+        if name.endswith(suffix):
+            return os.path.join(model_dir, name[:-len(suffix)] + FLAT_SUFFIX)
+    return os.path.join(model_dir, os.path.splitext(name)[0] + FLAT_SUFFIX)
+
+
+def check_parity(source_model, compiled: FlatModel, n_profiles: int, tolerance: float) -> float:
+    frame = pd.DataFrame(synthetic_profiles(n_profiles, seed=42))
+    X = preprocess_batch(frame)[FEATURE_ORDER]
+    expected = np.asarray(source_model.predict_proba(X))[:, 1]
+    actual = compiled.predict_proba(X)[:, 1]
+    max_diff = float(np.abs(expected - actual).max())
+    if max_diff > tolerance:
+        raise SystemExit(f"✗ Parity check failed: max probability difference {max_diff:.2e} > {tolerance:.0e}")
+    return max_diff
+
+
+def measure_first_prediction(path: str) -> dict:
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", _FIRST_PREDICTION_SCRIPT, path, BACKEND_DIR],
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise SystemExit(f"✗ Compiled artifact failed to score in a fresh process: {result.stderr.strip()[-500:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the served model for fast container starts.")
+    parser.add_argument("--model-dir", default=os.path.join(APP_DIR, "model_files"))
+    parser.add_argument("--source", help="Artifact to compile (default: the one named by the manifest)")
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="Max allowed probability difference")
+    parser.add_argument("--profiles", type=int, default=500, help="Synthetic profiles used for the parity check")
+    parser.add_argument("--skip-compileall", action="store_true")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Build-time Model Compilation")
+    print("=" * 70)
+
+    source = args.source
+    if source is None:
+        source = resolve_manifest(args.model_dir)
+        if source is None:
+            source = os.path.join(args.model_dir, "cervical_cancer_model.pkl")
+    source = os.path.abspath(source)
+    if not os.path.isfile(source):
+        raise SystemExit(f"✗ Source artifact not found: {source}")
+    print(f"Source artifact: {source}")
+
+    started = time.perf_counter()
+    source_model = load_source(source)
+    print(f"✓ Source loaded in {time.perf_counter() - started:.2f}s ({type(source_model).__name__})")
+
+    model_dir = os.path.abspath(args.model_dir)
+    if is_flat_model(source):
+        if os.path.dirname(source) != model_dir:
+            raise SystemExit(f"✗ Flat source must already live in {model_dir}")
+        compiled_path = source
+        print("✓ Source is already a flat model; nothing to compile")
+    else:
+        compiled_path = write_flat_model(source_model, compiled_path_for(source, model_dir), FEATURE_ORDER)
+        print(f"✓ Compiled to: {compiled_path} ({os.path.getsize(compiled_path):,} bytes)")
+    compiled = FlatModel.load(compiled_path)
+
+    max_diff = check_parity(source_model, compiled, args.profiles, args.tolerance)
+    print(f"✓ Parity on {args.profiles} profiles: max probability difference {max_diff:.2e}")
+
+    timings = measure_first_prediction(compiled_path)
+    print(f"✓ Fresh process: imports {timings['import_seconds']:.2f}s, load {timings['load_seconds'] * 1000:.1f}ms, "
+          f"first prediction {timings['first_prediction_seconds'] * 1000:.1f}ms")
+
+    previous = read_manifest(model_dir)
+    manifest = write_manifest(model_dir, compiled_path, FEATURE_ORDER,
+                              version=previous.get("version") if previous else None)
+    print(f"✓ Manifest baked: {manifest['artifact']} ({manifest['format']}, {manifest['checksum'][:19]}...)")
+
+    if not args.skip_compileall:
+        # backend/app.py is the old standalone app; the served app never imports it
+        ok = compileall.compile_dir(BACKEND_DIR, quiet=1, rx=re.compile(r"backend[/\\]app\.py$"))
+        for name in ("app.py", "translations.py"):
+            path = os.path.join(APP_DIR, name)
+            if os.path.exists(path):
+                ok = compileall.compile_file(path, quiet=1) and ok
+        if not ok:
+            raise SystemExit("✗ Bytecode compilation failed")
+        print("✓ Python bytecode precompiled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Cohort explanation jobs: probabilities and per-feature contributions for a whole
+population (a CSV upload or the saved assessment history), so program managers
+can see which factors drive risk across a district instead of calling /explain
+once per person.
+
+A job splits its rows into chunks and explains them on a process pool. Each
+worker loads the model artifact once and computes contributions for a whole
+chunk in one vectorized pass (explainer.py). Results are appended as chunks
+finish: NDJSON (readable while the job runs) or Parquet. Progress and a running
+per-group summary (mean contribution and mean |contribution| per feature) are
+kept on the job.
+
+Each row carries model_probability (the raw model output the contributions
+explain) and probability. The app passes a probability_fn so that probability
+matches /predict, rule-based fallback included. Without one, it equals model_probability.
+"""
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("cervi_backend")
+
+COHORT_FORMATS = ("ndjson", "parquet")
+TOP_FACTORS = 5
+
+# ---------- Worker side (runs in the process pool) ----------
+_worker_models: Dict[str, Any] = {}
+
+
+def load_artifact(path: str):
+    from flat_model import FlatModel, is_flat_model
+    from model_artifacts import NativeModel, is_native_spec
+
+    if is_flat_model(path):
+        return FlatModel.load(path)
+    if is_native_spec(path):
+        return NativeModel.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+def explain_chunk(model_path: str, fingerprint: str, mode: str, frame: pd.DataFrame) -> Dict[str, Any]:
+    """Preprocess, score and explain one chunk. The model is loaded once per worker and fingerprint."""
+    from explainer import explainer_for
+    from preprocess import FEATURE_ORDER, preprocess_batch
+
+    model = _worker_models.get(fingerprint)
+    if model is None:
+        _worker_models.clear()
+        model = _worker_models[fingerprint] = load_artifact(model_path)
+    X = preprocess_batch(frame)[FEATURE_ORDER]
+    contributions, base_value = explainer_for(model).explain(X, mode)
+    return {
+        "model_probability": np.asarray(model.predict_proba(X))[:, 1].astype(float),
+        "contributions": contributions.to_numpy(dtype=float),
+        "base_value": base_value,
+        "features": list(FEATURE_ORDER),
+    }
+
+
+# ---------- Job state ----------
+class CohortJob:
+    """Progress, running summary and result file of one cohort job."""
+
+    def __init__(self, job_id: str, source: str, mode: str, fmt: str, group_by: Optional[str],
+                 rows_total: int, chunks_total: int, model_version: str, result_path: str):
+        self.id = job_id
+        self.source = source
+        self.mode = mode
+        self.format = fmt
+        self.group_by = group_by
+        self.rows_total = rows_total
+        self.rows_done = 0
+        self.chunks_total = chunks_total
+        self.chunks_done = 0
+        self.model_version = model_version
+        self.result_path = result_path
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.features: List[str] = []
+        # group -> {"rows", "probability_sum", "contribution_sum" (array), "abs_contribution_sum" (array)}
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def record_chunk(self, groups: List[str], probability: np.ndarray, contributions: np.ndarray,
+                     features: List[str]) -> None:
+        with self._lock:
+            self.features = features
+            for group in set(groups):
+                mask = np.asarray([g == group for g in groups])
+                acc = self._groups.setdefault(group, {
+                    "rows": 0, "probability_sum": 0.0,
+                    "contribution_sum": np.zeros(len(features)), "abs_contribution_sum": np.zeros(len(features)),
+                })
+                acc["rows"] += int(mask.sum())
+                acc["probability_sum"] += float(probability[mask].sum())
+                acc["contribution_sum"] += contributions[mask].sum(axis=0)
+                acc["abs_contribution_sum"] += np.abs(contributions[mask]).sum(axis=0)
+            self.rows_done += len(groups)
+            self.chunks_done += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = {}
+            for group, acc in self._groups.items():
+                n = max(acc["rows"], 1)
+                mean = acc["contribution_sum"] / n
+                summary[group] = {
+                    "rows": acc["rows"],
+                    "mean_probability": acc["probability_sum"] / n,
+                    "mean_contribution": dict(zip(self.features, mean.tolist())),
+                    "mean_abs_contribution": dict(zip(self.features, (acc["abs_contribution_sum"] / n).tolist())),
+                    "top_risk_factors": [self.features[i] for i in np.argsort(-mean)[:TOP_FACTORS] if mean[i] > 0],
+                }
+            return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "source": self.source,
+            "mode": self.mode,
+            "format": self.format,
+            "group_by": self.group_by,
+            "model_version": self.model_version,
+            "rows_total": self.rows_total,
+            "rows_done": self.rows_done,
+            "progress": (self.rows_done / self.rows_total) if self.rows_total else 1.0,
+            "chunks_total": self.chunks_total,
+            "chunks_done": self.chunks_done,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "summary": self.summary(),
+        }
+
+
+class CohortJobManager:
+    """
+    Runs cohort jobs one chunk per pool task. The process pool is created on the first
+    job (spawned processes, so no locks are inherited from the server's threads).
+
+    Args:
+        job_dir: directory for result files
+        workers: process pool size
+        chunk_rows: rows per pool task
+        max_jobs: finished jobs kept (with their result files) before the oldest is removed
+    """
+
+    def __init__(self, job_dir: str, workers: int = 2, chunk_rows: int = 2000, max_jobs: int = 20):
+        self.job_dir = job_dir
+        self.workers = max(1, workers)
+        self.chunk_rows = max(1, chunk_rows)
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, CohortJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def submit(self, frame: pd.DataFrame, source: str, model_path: str, fingerprint: str, model_version: str,
+               mode: str = "fast", fmt: str = "ndjson", group_by: Optional[str] = None,
+               probability_fn: Optional[Callable[[pd.DataFrame, np.ndarray], List[float]]] = None) -> CohortJob:
+        """probability_fn(chunk rows, model probabilities) gives the reported probabilities (runs on the job thread)."""
+        os.makedirs(self.job_dir, exist_ok=True)
+        job_id = secrets.token_urlsafe(9)
+        result_path = os.path.join(self.job_dir, f"cohort_{job_id}.{fmt}")
+        chunks_total = -(-len(frame) // self.chunk_rows)
+        job = CohortJob(job_id, source, mode, fmt, group_by, len(frame), chunks_total, model_version, result_path)
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict()
+        threading.Thread(target=self._run, args=(job, frame, model_path, fingerprint, probability_fn),
+                         name=f"cohort-{job_id}", daemon=True).start()
+        return job
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs. Hold _lock."""
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            self._jobs.pop(job.id, None)
+            try:
+                os.remove(job.result_path)
+            except OSError:
+                pass
+
+    def get(self, job_id: str) -> Optional[CohortJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[CohortJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def queue_depth(self) -> int:
+        return sum(1 for job in self.jobs() if not job.finished)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: CohortJob, frame: pd.DataFrame, model_path: str, fingerprint: str,
+             probability_fn: Optional[Callable[[pd.DataFrame, np.ndarray], List[float]]]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        groups = (frame[job.group_by].astype(str) if job.group_by else pd.Series("all", index=frame.index)).tolist()
+        writer = None
+        futures = {}
+        try:
+            pool = self._get_pool()
+            for start in range(0, len(frame), self.chunk_rows):
+                chunk = frame.iloc[start:start + self.chunk_rows]
+                futures[pool.submit(explain_chunk, model_path, fingerprint, job.mode, chunk)] = start
+            with open(job.result_path, "w", encoding="utf-8") if job.format == "ndjson" else contextlib.nullcontext() as out:
+                for future in as_completed(futures):
+                    start = futures[future]
+                    result = future.result()
+                    rows = range(start, start + len(result["model_probability"]))
+                    result["probability"] = (
+                        np.asarray(probability_fn(frame.iloc[start:start + len(rows)], result["model_probability"]), dtype=float)
+                        if probability_fn is not None else result["model_probability"]
+                    )
+                    chunk_groups = groups[start:start + len(rows)]
+                    if job.format == "ndjson":
+                        out.write(_ndjson_lines(rows, chunk_groups, result, job.group_by))
+                        out.flush()
+                    else:
+                        writer = _write_parquet_chunk(writer, job.result_path, rows, chunk_groups, result, job.group_by)
+                    job.record_chunk(chunk_groups, result["probability"], result["contributions"], result["features"])
+            job.status = "done"
+            logger.info(f"Cohort job {job.id}: {job.rows_done} rows explained in "
+                        f"{time.time() - job.started_at:.1f}s ({job.mode} mode)")
+        except Exception as e:
+            for future in futures:
+                future.cancel()
+            job.status = "failed"
+            job.error = str(e)
+            logger.exception(f"Cohort job {job.id} failed")
+        finally:
+            if writer is not None:
+                writer.close()
+            job.finished_at = time.time()
+
+
+def _ndjson_lines(rows, groups: List[str], result: Dict[str, Any], group_by: Optional[str]) -> str:
+    features = result["features"]
+    lines = []
+    for i, row in enumerate(rows):
+        record = {"row": row}
+        if group_by:
+            record[group_by] = groups[i]
+        record["probability"] = float(result["probability"][i])
+        record["model_probability"] = float(result["model_probability"][i])
+        record["base_value"] = result["base_value"]
+        record["contributions"] = dict(zip(features, result["contributions"][i].tolist()))
+        lines.append(json.dumps(record))
+    return "\n".join(lines) + "\n"
+
+
+def _write_parquet_chunk(writer, path: str, rows, groups: List[str], result: Dict[str, Any], group_by: Optional[str]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = {
+        "row": pa.array(list(rows), type=pa.int64()),
+        group_by or "group": pa.array(groups, type=pa.string()),
+        "probability": pa.array(result["probability"], type=pa.float64()),
+        "model_probability": pa.array(result["model_probability"], type=pa.float64()),
+        "base_value": pa.array([result["base_value"]] * len(groups), type=pa.float64()),
+    }
+    for j, feature in enumerate(result["features"]):
+        columns[f"contribution:{feature}"] = pa.array(result["contributions"][:, j], type=pa.float64())
+    table = pa.table(columns)
+    if writer is None:
+        writer = pq.ParquetWriter(path, table.schema)
+    writer.write_table(table)
+    return writer
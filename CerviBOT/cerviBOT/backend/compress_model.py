@@ -0,0 +1,270 @@
+"""
+Model compression tool: builds smaller variants of the trained XGBoost model and
+reports whether they are good enough to serve.
+
+Variants:
+- trees=K          keep the first K trees of every booster, with the original leaf
+                   weights and calibration
+- trees=K+prune    as above, plus the "prune" updater to drop low-gain splits
+- trees=K+refresh  (--refresh) also refresh the leaf weights (XGBoost "refresh" updater)
+                   on the SMOTE-resampled training split, as the original fit saw it, and
+                   refit calibration on the unresampled split
+- retrain          retrain the same pipeline with fewer / shallower trees (pickles only)
+
+For each variant, on the same held-out split train_model.py uses: AUC, recall,
+risk bucket agreement with the current model, flat artifact size, and single-row
+and batch latency of the served (flat) format. Recommends the smallest variant
+within tolerance and writes it, plus a JSON report, to the output directory.
+
+Usage:
+    python compress_model.py <dataset.csv> [model.pkl | model.spec.json]
+        [--trees 50,100,150,200] [--refresh] [--retrain 100:4,150:5] [--prune-gamma 0.5]
+        [--auc-tolerance 0.01] [--recall-tolerance 0.02] [--min-agreement 0.98]
+        [--output-dir ../model_files/compressed]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from flat_model import FlatModel, write_flat_model, FLAT_SUFFIX
+from model_artifacts import NativeModel, member_specs, transform_with_spec, is_native_spec
+
+# Same thresholds as risk_bucket() in app.py
+RISK_BUCKET_EDGES = (0.33, 0.67)
+
+
+def risk_buckets(proba: np.ndarray) -> np.ndarray:
+    return np.digitize(proba, RISK_BUCKET_EDGES)
+
+
+def load_model(path: str):
+    if is_native_spec(path):
+        return NativeModel.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+def load_split(csv_path: str):
+    """Train/test split identical to train_model.py."""
+    from train_model import clean_and_preprocess_data
+
+    X, y, feature_cols = clean_and_preprocess_data(pd.read_csv(csv_path))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    return X_train, X_test, y_train, y_test, feature_cols
+
+
+# ---------- Calibration ----------
+def refit_calibration(method, raw: np.ndarray, y: np.ndarray):
+    """Fit a calibration spec of the same kind as the original member's on the new raw scores."""
+    if method is None:
+        return None
+    if method == "isotonic":
+        from sklearn.isotonic import IsotonicRegression
+        iso = IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0).fit(raw, y)
+        return {"method": "isotonic", "x": iso.X_thresholds_.tolist(), "y": iso.y_thresholds_.tolist()}
+    from sklearn.linear_model import LogisticRegression
+    lr = LogisticRegression(C=1e6).fit(raw.reshape(-1, 1), y)
+    # calibrate() computes 1 / (1 + exp(a * p + b))
+    return {"method": "sigmoid", "a": float(-lr.coef_[0][0]), "b": float(-lr.intercept_[0])}
+
+
+# ---------- Variants ----------
+def resampled(Xt: np.ndarray, y: np.ndarray):
+    """SMOTE-balance a transformed training split with the settings train_model.py fits with."""
+    from imblearn.over_sampling import SMOTE
+    return SMOTE(random_state=42, k_neighbors=3).fit_resample(Xt, y)
+
+
+def truncated_variant(model, n_trees: int, X_train: pd.DataFrame, y_train,
+                      refresh: bool = False, prune_gamma: float = None) -> NativeModel:
+    """
+    First n_trees of every member. Plain truncation keeps the original leaf weights and
+    calibration; refresh re-estimates the leaf weights on the SMOTE-resampled training split
+    and refits calibration on the unresampled one; prune_gamma drops low-gain splits.
+    """
+    import xgboost as xgb
+
+    y = np.asarray(y_train)
+    updaters = (["refresh"] if refresh else []) + (["prune"] if prune_gamma is not None else [])
+    members, boosters = [], []
+    for member in member_specs(model):
+        booster = member["booster"][:n_trees]
+        calibration = member["calibration"]
+        if updaters:
+            Xt = transform_with_spec(member["preprocessor"], X_train)
+            X_fit, y_fit = resampled(Xt, y) if refresh else (Xt, y)
+            params = {"process_type": "update", "updater": ",".join(updaters), "refresh_leaf": True,
+                      "objective": "binary:logistic"}
+            if prune_gamma is not None:
+                params["gamma"] = prune_gamma
+            booster = xgb.train(params, xgb.DMatrix(X_fit, label=y_fit), num_boost_round=n_trees, xgb_model=booster)
+            if refresh and calibration:
+                raw = np.asarray(booster.inplace_predict(Xt), dtype=float)
+                calibration = refit_calibration(calibration["method"], raw, y)
+        booster.feature_names = None
+        members.append({"preprocessor": member["preprocessor"], "calibration": calibration})
+        boosters.append(booster)
+    return NativeModel({"feature_order": list(X_train.columns), "members": members}, boosters)
+
+
+def retrained_variant(model, n_estimators: int, max_depth: int, X_train: pd.DataFrame, y_train):
+    """Clone the fitted pipeline with fewer / shallower trees and fit it on the training split."""
+    from sklearn.base import clone
+
+    params = model.get_params()
+    overrides = {}
+    for key in params:
+        if key.endswith("__n_estimators") or key == "n_estimators":
+            overrides[key] = n_estimators
+        elif key.endswith("__max_depth") or key == "max_depth":
+            overrides[key] = max_depth
+    if not overrides:
+        raise ValueError("Model has no n_estimators / max_depth parameters to change")
+    variant = clone(model).set_params(**overrides)
+    return variant.fit(X_train, y_train)
+
+
+# ---------- Measurement ----------
+def measure_variant(model, X_test: pd.DataFrame, y_test, baseline_buckets: np.ndarray, work_dir: str, name: str):
+    """Quality metrics on the test split, plus size and latency of the model in the served flat format."""
+    proba = np.asarray(model.predict_proba(X_test))[:, 1]
+    flat_path = write_flat_model(model, os.path.join(work_dir, name.replace("/", "_") + FLAT_SUFFIX), list(X_test.columns))
+    flat = FlatModel.load(flat_path)
+
+    single = []
+    rows = [X_test.iloc[[i % len(X_test)]] for i in range(200)]
+    for row in rows:
+        started = time.perf_counter()
+        flat.predict_proba(row)
+        single.append(time.perf_counter() - started)
+    batch = pd.concat([X_test] * max(1, 1000 // len(X_test) + 1)).iloc[:1000]
+    started = time.perf_counter()
+    flat.predict_proba(batch)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "variant": name,
+        "trees_per_member": [m["n_trees"] for m in flat.members],
+        "max_depth": max(m["max_depth"] for m in flat.members),
+        "auc": float(roc_auc_score(y_test, proba)),
+        "recall": float(recall_score(y_test, (proba >= 0.5).astype(int), zero_division=0)),
+        "bucket_agreement": float(np.mean(risk_buckets(proba) == baseline_buckets)),
+        "size_bytes": os.path.getsize(flat_path),
+        "single_row_p50_ms": float(np.percentile(single, 50) * 1000),
+        "single_row_p99_ms": float(np.percentile(single, 99) * 1000),
+        "batch_rows_per_second": float(len(batch) / batch_seconds),
+        "flat_path": flat_path,
+    }
+
+
+def within_tolerance(result, baseline, args) -> bool:
+    return (result["auc"] >= baseline["auc"] - args.auc_tolerance
+            and result["recall"] >= baseline["recall"] - args.recall_tolerance
+            and result["bucket_agreement"] >= args.min_agreement)
+
+
+def print_table(results, baseline, args):
+    print(f"\n{'Variant':<22} {'Trees':>6} {'Depth':>5} {'AUC':>7} {'Recall':>7} {'Agree':>7} "
+          f"{'Size (KB)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Batch rows/s':>13} {'OK':>4}")
+    for r in results:
+        ok = "base" if r is baseline else ("yes" if within_tolerance(r, baseline, args) else "no")
+        print(f"{r['variant']:<22} {sum(r['trees_per_member']):>6} {r['max_depth']:>5} {r['auc']:>7.4f} "
+              f"{r['recall']:>7.4f} {r['bucket_agreement']:>7.3f} {r['size_bytes'] / 1024:>10.1f} "
+              f"{r['single_row_p50_ms']:>9.2f} {r['single_row_p99_ms']:>9.2f} {r['batch_rows_per_second']:>13,.0f} {ok:>4}")
+
+
+def main():
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Build and evaluate smaller variants of the XGBoost model.")
+    parser.add_argument("dataset")
+    parser.add_argument("model", nargs="?", default=os.path.join(app_dir, "model_files", "cervical_cancer_model.pkl"))
+    parser.add_argument("--trees", default="25,50,100,150,200", help="Tree counts to keep per booster")
+    parser.add_argument("--retrain", default="", help="n_estimators:max_depth pairs to retrain, e.g. 100:4,150:5")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Also build variants with leaf weights refreshed on the resampled training split")
+    parser.add_argument("--prune-gamma", type=float, default=None, help="Also build pruned variants with this gamma")
+    parser.add_argument("--auc-tolerance", type=float, default=0.01)
+    parser.add_argument("--recall-tolerance", type=float, default=0.02)
+    parser.add_argument("--min-agreement", type=float, default=0.98, help="Min risk bucket agreement with the current model")
+    parser.add_argument("--output-dir", default=os.path.join(app_dir, "model_files", "compressed"))
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, _ = load_split(args.dataset)
+    model = load_model(args.model)
+    baseline_proba = np.asarray(model.predict_proba(X_test))[:, 1]
+    baseline_buckets = risk_buckets(baseline_proba)
+    n_trees = min(spec["booster"].num_boosted_rounds() for spec in member_specs(model))
+
+    print("\n" + "=" * 70)
+    print("Model Compression")
+    print("=" * 70)
+    print(f"Model: {args.model} ({n_trees} trees per booster)")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as work_dir:
+        baseline = measure_variant(model, X_test, y_test, baseline_buckets, work_dir, "baseline")
+        results = [baseline]
+        for k in sorted({int(t) for t in args.trees.split(",") if t.strip()}):
+            if k >= n_trees:
+                continue
+            variants = [(f"trees={k}", False, None)]
+            if args.refresh:
+                variants.append((f"trees={k}+refresh", True, None))
+            if args.prune_gamma is not None:
+                variants += [(name + "+prune", refresh, args.prune_gamma) for name, refresh, _ in list(variants)]
+            for name, refresh, gamma in variants:
+                variant = truncated_variant(model, k, X_train, y_train, refresh, gamma)
+                results.append(measure_variant(variant, X_test, y_test, baseline_buckets, work_dir, name))
+                print(f"  ✓ {name}")
+        for pair in [p for p in args.retrain.split(",") if p.strip()]:
+            n_estimators, max_depth = (int(v) for v in pair.split(":"))
+            name = f"retrain {n_estimators}x{max_depth}"
+            try:
+                variant = retrained_variant(model, n_estimators, max_depth, X_train, y_train)
+            except Exception as e:
+                print(f"  ⚠ {name} skipped: {e}")
+                continue
+            results.append(measure_variant(variant, X_test, y_test, baseline_buckets, work_dir, name))
+            print(f"  ✓ {name}")
+
+        print_table(results, baseline, args)
+
+        passing = [r for r in results[1:] if within_tolerance(r, baseline, args)]
+        recommended = min(passing, key=lambda r: r["size_bytes"]) if passing else None
+        if recommended is not None:
+            target = os.path.join(args.output_dir, "cervical_cancer_model.compressed" + FLAT_SUFFIX)
+            # The work dir may be on another filesystem (tmpfs), where os.replace fails with EXDEV
+            shutil.move(recommended["flat_path"], target)
+            recommended["flat_path"] = target
+            print(f"\n✓ Recommended: {recommended['variant']} "
+                  f"({recommended['size_bytes'] / baseline['size_bytes']:.0%} of baseline size), written to {target}")
+        else:
+            print("\n✗ No variant is within tolerance; keep the current model.")
+
+    for r in results:
+        if r is not recommended:
+            r.pop("flat_path", None)
+    report = {
+        "model": os.path.abspath(args.model),
+        "dataset": os.path.abspath(args.dataset),
+        "tolerances": {"auc": args.auc_tolerance, "recall": args.recall_tolerance, "min_agreement": args.min_agreement},
+        "results": results,
+        "recommended": recommended["variant"] if recommended else None,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    report_path = os.path.join(args.output_dir, "compression_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Report saved to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
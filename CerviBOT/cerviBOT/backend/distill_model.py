@@ -0,0 +1,184 @@
+"""
+Distilled student model: a logistic regression over the teacher's transformed
+features (scaled numerics + one-hot categoricals), fitted to the XGBoost
+teacher's probabilities rather than to the labels.
+
+Scoring is one dot product per row with no tree library, so the student serves
+as a fast tier for high-volume batch scoring (/predict-batch?tier=fast) and as
+the degraded-mode model when the full model is unavailable. Its agreement with
+the teacher is measured at training time and stored with it.
+
+Usage:
+    python distill_model.py <dataset.csv> [teacher.pkl | teacher.spec.json] [output.student.json]
+        [--augment 20000] [--C 1.0]
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from model_artifacts import member_specs, transform_with_spec
+
+STUDENT_FORMAT = "linear-student"
+STUDENT_FORMAT_VERSION = 1
+STUDENT_SUFFIX = ".student.json"
+
+# Same thresholds as risk_bucket() in app.py
+RISK_BUCKET_EDGES = (0.33, 0.67)
+
+
+class StudentModel:
+    """predict/predict_proba for a distilled linear student (pure numpy)."""
+
+    def __init__(self, spec: Dict[str, Any], path: Optional[str] = None):
+        self.spec = spec
+        self.path = path
+        self.feature_order = spec.get("feature_order", [])
+        self.coef = np.asarray(spec["coef"], dtype=float)
+        self.intercept = float(spec["intercept"])
+
+    @classmethod
+    def load(cls, path: str) -> "StudentModel":
+        with open(path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        if spec.get("format") != STUDENT_FORMAT:
+            raise ValueError(f"{path} is not a {STUDENT_FORMAT} model")
+        return cls(spec, path)
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.spec, f, indent=2)
+        self.path = path
+        return path
+
+    def decision_function(self, X: pd.DataFrame) -> np.ndarray:
+        return transform_with_spec(self.spec["preprocessor"], X).astype(float) @ self.coef + self.intercept
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def augmentation_rows(n: int, feature_order) -> pd.DataFrame:
+    """Synthetic chatbot inputs in model columns; the teacher labels them for free."""
+    from preprocess import preprocess_batch
+    from warmup import synthetic_profiles
+
+    X = preprocess_batch(pd.DataFrame(synthetic_profiles(n, seed=7)))
+    return X[list(feature_order)]
+
+
+def fit_student(teacher, X: pd.DataFrame, C: float = 1.0, augment: int = 0) -> StudentModel:
+    """
+    Fit a logistic regression to the teacher's probabilities on X (plus `augment`
+    synthetic rows). Soft labels are expressed as each row appearing once as
+    positive with weight p and once as negative with weight 1 - p.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    feature_order = list(X.columns)
+    if augment:
+        X = pd.concat([X, augmentation_rows(augment, feature_order)], ignore_index=True)
+    soft = np.asarray(teacher.predict_proba(X))[:, 1]
+
+    preprocessor = member_specs(teacher)[0]["preprocessor"]
+    Xt = transform_with_spec(preprocessor, X).astype(float)
+    lr = LogisticRegression(C=C, max_iter=2000)
+    lr.fit(np.vstack([Xt, Xt]), np.concatenate([np.ones(len(Xt)), np.zeros(len(Xt))]),
+           sample_weight=np.concatenate([soft, 1.0 - soft]))
+
+    return StudentModel({
+        "format": STUDENT_FORMAT,
+        "format_version": STUDENT_FORMAT_VERSION,
+        "feature_order": feature_order,
+        "preprocessor": preprocessor,
+        "coef": lr.coef_[0].tolist(),
+        "intercept": float(lr.intercept_[0]),
+        "training_rows": int(len(X)),
+        "C": C,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+
+
+def evaluate_student(student: StudentModel, teacher, X: pd.DataFrame, y=None) -> Dict[str, Any]:
+    """Agreement with the teacher (risk bucket, label, probability gap) and AUC when labels are given."""
+    teacher_proba = np.asarray(teacher.predict_proba(X))[:, 1]
+    student_proba = student.predict_proba(X)[:, 1]
+    diff = np.abs(student_proba - teacher_proba)
+    report = {
+        "rows": int(len(X)),
+        "bucket_agreement": float(np.mean(np.digitize(student_proba, RISK_BUCKET_EDGES)
+                                          == np.digitize(teacher_proba, RISK_BUCKET_EDGES))),
+        "label_agreement": float(np.mean((student_proba >= 0.5) == (teacher_proba >= 0.5))),
+        "mean_abs_diff": float(diff.mean()),
+        "max_abs_diff": float(diff.max()),
+    }
+    if y is not None and len(np.unique(y)) > 1:
+        from sklearn.metrics import roc_auc_score
+        report["student_auc"] = float(roc_auc_score(y, student_proba))
+        report["teacher_auc"] = float(roc_auc_score(y, teacher_proba))
+
+    started = time.perf_counter()
+    student.predict_proba(X)
+    report["student_rows_per_second"] = float(len(X) / max(time.perf_counter() - started, 1e-9))
+    return report
+
+
+def distill(teacher, X_train: pd.DataFrame, X_test: pd.DataFrame, y_test, output_path: str,
+            C: float = 1.0, augment: int = 20000) -> Dict[str, Any]:
+    """Fit, evaluate (held-out split + synthetic profiles) and save a student. Returns the agreement report."""
+    student = fit_student(teacher, X_train, C=C, augment=augment)
+    agreement = {
+        "test": evaluate_student(student, teacher, X_test, y_test),
+        "synthetic": evaluate_student(student, teacher, augmentation_rows(2000, X_test.columns)),
+    }
+    student.spec["agreement"] = agreement
+    student.save(output_path)
+    return agreement
+
+
+def print_agreement(agreement: Dict[str, Any]) -> None:
+    for split, stats in agreement.items():
+        line = (f"  {split:<10} bucket agreement {stats['bucket_agreement']:.3f}, "
+                f"label agreement {stats['label_agreement']:.3f}, mean |diff| {stats['mean_abs_diff']:.4f}")
+        if "student_auc" in stats:
+            line += f", AUC {stats['student_auc']:.4f} (teacher {stats['teacher_auc']:.4f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    from sklearn.model_selection import train_test_split
+    from train_model import clean_and_preprocess_data
+
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Distil the XGBoost model into a linear student.")
+    parser.add_argument("dataset")
+    parser.add_argument("teacher", nargs="?", default=os.path.join(app_dir, "model_files", "cervical_cancer_model.pkl"))
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--augment", type=int, default=20000, help="Synthetic rows labelled by the teacher")
+    parser.add_argument("--C", type=float, default=1.0, help="Inverse regularization strength")
+    args = parser.parse_args()
+
+    if args.teacher.endswith(".spec.json"):
+        from model_artifacts import NativeModel
+        teacher = NativeModel.load(args.teacher)
+        stem = args.teacher[:-len(".spec.json")]
+    else:
+        import joblib
+        teacher = joblib.load(args.teacher)
+        stem = os.path.splitext(args.teacher)[0]
+    output = args.output or stem + STUDENT_SUFFIX
+
+    X, y, _ = clean_and_preprocess_data(pd.read_csv(args.dataset))
+    X_train, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    agreement = distill(teacher, X_train, X_test, y_test, output, C=args.C, augment=args.augment)
+    print(f"\n✓ Student model saved to: {output}")
+    print_agreement(agreement)
@@ -0,0 +1,245 @@
+"""
+Per-prediction SHAP explanations for the served tree models.
+
+A shap.TreeExplainer is built once per loaded model object (one per calibration
+member) and cached with it, so /explain only pays for the SHAP pass itself; the
+app builds it during warm-up, before a model takes traffic. Contributions are
+computed on the transformed features (scaled numerics + one-hot categoricals),
+summed back to the model's input columns and averaged over members. They are in
+log-odds of the uncalibrated booster: base_value + sum(contributions) is the
+booster margin, which calibration then maps monotonically to the probability.
+
+Two modes:
+- exact  TreeSHAP (shap.TreeExplainer)
+- fast   path attribution (Saabas): along each row's decision path, the change in
+         node mean value at every split is credited to the split feature. Same
+         additivity, no feature interactions averaged out; costs about one scoring
+         pass, vectorized over rows and trees (XGBoost approx_contribs for boosters,
+         the flat node tables for flat models).
+
+Global importance (per model, computed once): total cover of the splits on each
+input and mean |contribution| over a reference set, both summed back to inputs.
+"""
+import threading
+import weakref
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from flat_model import FlatModel
+from model_artifacts import member_specs, output_feature_groups, transform_with_spec
+
+EXPLAIN_MODES = ("exact", "fast")
+
+
+def node_mean_values(t: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Value of every node in a flat member's tables: leaf weight for leaves, cover-weighted
+    mean of the children for splits. Indexed like the tables (global node index).
+    """
+    is_leaf = np.asarray(t["is_leaf"], dtype=bool)
+    left = np.asarray(t["left"], dtype=np.int64)
+    right = np.asarray(t["right"], dtype=np.int64)
+    cover = np.asarray(t["cover"], dtype=float)
+    values = np.where(is_leaf, np.asarray(t["value"], dtype=float), 0.0)
+    # XGBoost node ids are assigned breadth-first, so children come after their parent
+    for i in np.flatnonzero(~is_leaf)[::-1]:
+        weight = cover[left[i]] + cover[right[i]]
+        values[i] = ((cover[left[i]] * values[left[i]] + cover[right[i]] * values[right[i]]) / weight
+                     if weight > 0 else (values[left[i]] + values[right[i]]) / 2)
+    return values
+
+
+def flat_member_trees(model: FlatModel, member: int, node_values: np.ndarray) -> Dict[str, Any]:
+    """A flat model member as shap's dictionary tree-ensemble format (shap reads the expected value from the roots)."""
+    t = model.tables(member)
+    roots = np.asarray(t["roots"], dtype=np.int64)
+    ends = np.append(roots[1:], len(t["left"]))
+    trees = []
+    for start, end in zip(roots, ends):
+        is_leaf = np.asarray(t["is_leaf"][start:end], dtype=bool)
+        left = np.where(is_leaf, -1, np.asarray(t["left"][start:end], dtype=np.int64) - start)
+        right = np.where(is_leaf, -1, np.asarray(t["right"][start:end], dtype=np.int64) - start)
+        default_left = np.asarray(t["default_left"][start:end], dtype=bool)
+        cover = np.asarray(t["cover"][start:end], dtype=float)
+        values = node_values[start:end]
+        thresholds = np.asarray(t["threshold"][start:end], dtype=np.float32)
+        trees.append({
+            "children_left": left,
+            "children_right": right,
+            "children_default": np.where(default_left, left, right),
+            "features": np.where(is_leaf, -1, np.asarray(t["feature"][start:end], dtype=np.int64)),
+            # XGBoost splits on x < threshold, shap on x <= threshold
+            "thresholds": np.where(is_leaf, 0.0, np.nextafter(thresholds, np.float32(-np.inf))).astype(float),
+            "values": values.reshape(-1, 1),
+            "node_sample_weight": cover,
+        })
+    return {
+        "trees": trees,
+        "base_offset": float(model.members[member]["base_margin"]),
+        "tree_output": "log_odds",
+        "objective": "binary_crossentropy",
+        "input_dtype": np.float32,
+        "internal_dtype": np.float64,
+    }
+
+
+def path_contributions(member: Dict[str, Any], Xt: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Path attribution over flat node tables, vectorized over rows and trees: one traversal
+    step per depth level, crediting value(child) - value(node) to the split feature.
+    """
+    t, values = member["tables"], member["node_values"]
+    roots = np.asarray(t["roots"])
+    n_rows, n_features = Xt.shape
+    node = np.broadcast_to(roots, (n_rows, len(roots))).copy()
+    rows = np.arange(n_rows)[:, None]
+    phi = np.zeros(n_rows * n_features, dtype=float)
+    for _ in range(member["max_depth"]):
+        feature = np.asarray(t["feature"])[node]
+        x = Xt[rows, feature]
+        go_left = np.where(np.isnan(x), t["default_left"][node], x < t["threshold"][node])
+        child = np.where(go_left, t["left"][node], t["right"][node])
+        # Leaves point to themselves, so finished paths add zero
+        phi += np.bincount((rows * n_features + feature).ravel(), weights=(values[child] - values[node]).ravel(),
+                           minlength=n_rows * n_features)
+        node = child
+    return phi.reshape(n_rows, n_features), member["base_margin"] + float(values[roots].sum())
+
+
+def booster_approx_contributions(booster, Xt: np.ndarray) -> Tuple[np.ndarray, float]:
+    """XGBoost's own path attribution (pred_contribs + approx_contribs); the last column is the bias."""
+    import xgboost as xgb
+
+    contribs = booster.predict(xgb.DMatrix(Xt), pred_contribs=True, approx_contribs=True)
+    return contribs[:, :-1].astype(float), float(contribs[0, -1]) if len(contribs) else 0.0
+
+
+class ModelExplainer:
+    """Exact and fast explainers for every member of a model, plus the transformed-to-input column mapping."""
+
+    def __init__(self, model):
+        import shap
+
+        self.members = []
+        self._importance = None
+        if isinstance(model, FlatModel):
+            for i, member in enumerate(model.members):
+                tables = model.tables(i)
+                node_values = node_mean_values(tables)
+                self.members.append({
+                    "preprocessor": member["preprocessor"],
+                    "groups": output_feature_groups(member["preprocessor"]),
+                    "explainer": shap.TreeExplainer(flat_member_trees(model, i, node_values)),
+                    "booster": None,
+                    "tables": tables,
+                    "node_values": node_values,
+                    "max_depth": member["max_depth"],
+                    "base_margin": float(member["base_margin"]),
+                })
+        else:
+            for spec in member_specs(model):
+                self.members.append({
+                    "preprocessor": spec["preprocessor"],
+                    "groups": output_feature_groups(spec["preprocessor"]),
+                    "explainer": shap.TreeExplainer(spec["booster"]),
+                    "booster": spec["booster"],
+                })
+
+    def _member_contributions(self, member: Dict[str, Any], Xt: np.ndarray, mode: str) -> Tuple[np.ndarray, float]:
+        if mode == "fast":
+            if member["booster"] is not None:
+                return booster_approx_contributions(member["booster"], Xt)
+            return path_contributions(member, Xt)
+        explainer = member["explainer"]
+        phi = np.asarray(explainer.shap_values(Xt, check_additivity=False), dtype=float).reshape(len(Xt), -1)
+        return phi, float(np.ravel(explainer.expected_value)[0])
+
+    def explain(self, X: pd.DataFrame, mode: str = "exact") -> Tuple[pd.DataFrame, float]:
+        """Per-row contributions over X's columns (log-odds) and the base value."""
+        if mode not in EXPLAIN_MODES:
+            raise ValueError(f"Unknown explanation mode '{mode}'; expected one of {EXPLAIN_MODES}")
+        columns = list(X.columns)
+        total = np.zeros((len(X), len(columns)), dtype=float)
+        base_value = 0.0
+        for member in self.members:
+            phi, base = self._member_contributions(member, transform_with_spec(member["preprocessor"], X), mode)
+            total += phi @ _group_matrix(member["groups"], columns)
+            base_value += base
+        n = len(self.members)
+        return pd.DataFrame(total / n, index=X.index, columns=columns), base_value / n
+
+    def global_importance(self, X_reference: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Per input column: share of total split cover (structural, identical across artifact
+        formats) and mean |fast contribution| over X_reference. Computed once, then cached.
+        """
+        if self._importance is not None:
+            return self._importance
+        columns = list(X_reference.columns)
+        cover = np.zeros(len(columns))
+        for member in self.members:
+            cover += _member_split_cover(member) @ _group_matrix(member["groups"], columns)
+        cover /= cover.sum() or 1.0
+        contributions, _ = self.explain(X_reference, "fast")
+        mean_abs = np.abs(contributions.to_numpy()).mean(axis=0)
+        order = np.argsort(-cover)
+        self._importance = {
+            "features": [{"feature": columns[i], "importance": float(cover[i]),
+                          "mean_abs_contribution": float(mean_abs[i])} for i in order],
+            "reference_rows": len(X_reference),
+        }
+        return self._importance
+
+
+def _group_matrix(groups, columns) -> np.ndarray:
+    """(transformed features x input columns) 0/1 matrix that sums one-hot columns back to their input."""
+    groups = np.asarray(groups, dtype=object)
+    return (groups[:, None] == np.asarray(columns, dtype=object)[None, :]).astype(float)
+
+
+def _member_split_cover(member: Dict[str, Any]) -> np.ndarray:
+    """Total cover of the splits on each transformed feature."""
+    n_features = len(member["groups"])
+    if member["booster"] is not None:
+        scores = member["booster"].get_score(importance_type="total_cover")
+        cover = np.zeros(n_features)
+        for name, value in scores.items():
+            cover[int(name.lstrip("f"))] = value
+        return cover
+    t = member["tables"]
+    splits = ~np.asarray(t["is_leaf"], dtype=bool)
+    return np.bincount(np.asarray(t["feature"])[splits], weights=np.asarray(t["cover"], dtype=float)[splits],
+                       minlength=n_features)
+
+
+_explainers: "weakref.WeakKeyDictionary[Any, ModelExplainer]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def explainer_for(model) -> ModelExplainer:
+    """The cached explainer for a loaded model object, built on first use. Dropped with the model."""
+    with _lock:
+        explainer = _explainers.get(model)
+    if explainer is None:
+        # Built outside the lock so explaining the serving model never waits on a candidate's build
+        built = ModelExplainer(model)
+        with _lock:
+            explainer = _explainers.setdefault(model, built)
+    return explainer
+
+
+def has_explainer(model) -> bool:
+    with _lock:
+        return model in _explainers
+
+
+def contributions_for_row(model, X: pd.DataFrame, mode: str = "exact") -> Dict[str, Any]:
+    """Contributions for a single preprocessed row, keyed by input column name."""
+    contributions, base_value = explainer_for(model).explain(X, mode)
+    row = contributions.iloc[0]
+    return {
+        "base_value": base_value,
+        "contributions": {name: float(value) for name, value in row.items()},
+    }
@@ -0,0 +1,289 @@
+"""
+Memory-mappable flat model format (*.flat).
+
+All large numeric arrays of the model are written into one flat file:
+per ensemble member the XGBoost tree node tables (children, split feature,
+threshold, default direction, leaf value, cover), the scaler vectors and the
+calibration table. A small JSON header describes where each array lives.
+
+FlatModel opens the file with np.memmap in read-only mode, so every worker
+process on a node shares the same page-cache pages instead of holding a private
+unpickled copy. Loading is a header read plus a few mmap calls, and scoring is
+pure numpy (no xgboost import needed at serve time).
+
+File layout:
+    8 bytes  magic b"CERVFLAT"
+    4 bytes  format version (little-endian uint32)
+    8 bytes  header length (little-endian uint64)
+    header   UTF-8 JSON
+    arrays   each aligned to ARRAY_ALIGNMENT bytes
+
+Usage:
+    python flat_model.py <model.pkl | model.spec.json> [output.flat]
+"""
+import copy
+import json
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from model_artifacts import calibrate, member_specs, transform_with_spec
+
+FLAT_MAGIC = b"CERVFLAT"
+FLAT_FORMAT_VERSION = 1
+FLAT_SUFFIX = ".flat"
+ARRAY_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sIQ")
+
+# Node table columns written per member, with their on-disk dtypes
+NODE_ARRAYS = {
+    "left": np.int32,
+    "right": np.int32,
+    "feature": np.int32,
+    "threshold": np.float32,
+    "default_left": np.bool_,
+    "is_leaf": np.bool_,
+    "value": np.float32,
+    "cover": np.float32,
+}
+
+
+# ---------- Flattening XGBoost boosters ----------
+def base_margin(booster) -> float:
+    """Model-level bias in margin space (logit of base_score for binary:logistic)."""
+    config = json.loads(booster.save_config())
+    learner = config["learner"]
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Only binary:logistic boosters can be flattened, got {objective}")
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+    return float(np.log(base_score / (1.0 - base_score)))
+
+
+def flatten_booster(booster) -> Dict[str, Any]:
+    """
+    Convert a booster into node tables. Node i of tree t lives at roots[t] + nodeid.
+    Leaves point to themselves so traversal can run a fixed number of steps.
+    """
+    feature_names = booster.feature_names
+    dumps = booster.get_dump(dump_format="json", with_stats=True)
+
+    tables = {name: [] for name in NODE_ARRAYS}
+    roots = []
+    max_depth = 0
+    offset = 0
+
+    for dump in dumps:
+        nodes = {}
+        stack = [(json.loads(dump), 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes[node["nodeid"]] = node
+            max_depth = max(max_depth, depth)
+            for child in node.get("children", []):
+                stack.append((child, depth + 1))
+
+        n_nodes = max(nodes) + 1
+        tree = {name: [0] * n_nodes for name in NODE_ARRAYS}
+        for nodeid, node in nodes.items():
+            tree["cover"][nodeid] = node.get("cover", 0.0)
+            if "leaf" in node:
+                tree["left"][nodeid] = offset + nodeid
+                tree["right"][nodeid] = offset + nodeid
+                tree["is_leaf"][nodeid] = True
+                tree["value"][nodeid] = node["leaf"]
+                continue
+            split = node["split"]
+            if feature_names and split in feature_names:
+                feature = feature_names.index(split)
+            else:
+                feature = int(split.lstrip("f"))
+            tree["left"][nodeid] = offset + node["yes"]
+            tree["right"][nodeid] = offset + node["no"]
+            tree["feature"][nodeid] = feature
+            tree["threshold"][nodeid] = node["split_condition"]
+            tree["default_left"][nodeid] = node["missing"] == node["yes"]
+
+        for name in NODE_ARRAYS:
+            tables[name].extend(tree[name])
+        roots.append(offset)
+        offset += n_nodes
+
+    arrays = {name: np.asarray(tables[name], dtype=dtype) for name, dtype in NODE_ARRAYS.items()}
+    arrays["roots"] = np.asarray(roots, dtype=np.int32)
+    return {"arrays": arrays, "max_depth": max_depth, "base_margin": base_margin(booster)}
+
+
+# ---------- Writing ----------
+def write_flat_model(model, output_path: str, feature_order: List[str]) -> str:
+    """Write a fitted pipeline / CalibratedClassifierCV / NativeModel as a flat mmap-able file."""
+    arrays: Dict[str, np.ndarray] = {}
+    members = []
+    for i, member in enumerate(member_specs(model)):
+        flat = flatten_booster(member["booster"])
+        for name, array in flat["arrays"].items():
+            arrays[f"m{i}.{name}"] = array
+
+        # Move the numeric vectors of the specs into the flat file, keep references in the header
+        preprocessor = copy.deepcopy(member["preprocessor"])
+        for j, t in enumerate(preprocessor["transformers"]):
+            if t["kind"] == "standard_scaler":
+                for key in ("mean", "scale"):
+                    arrays[f"m{i}.t{j}.{key}"] = np.asarray(t[key], dtype=np.float64)
+                    t[key] = f"m{i}.t{j}.{key}"
+        calibration = copy.deepcopy(member["calibration"])
+        if calibration is not None and calibration["method"] == "isotonic":
+            for key in ("x", "y"):
+                arrays[f"m{i}.cal.{key}"] = np.asarray(calibration[key], dtype=np.float64)
+                calibration[key] = f"m{i}.cal.{key}"
+
+        members.append({
+            "preprocessor": preprocessor,
+            "calibration": calibration,
+            "max_depth": flat["max_depth"],
+            "base_margin": flat["base_margin"],
+            "n_trees": int(len(flat["arrays"]["roots"])),
+        })
+
+    # Lay out arrays after the header, each aligned for efficient mmap access
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        position = -(-position // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+        position += array.nbytes
+
+    header = {
+        "feature_order": list(feature_order),
+        "members": members,
+        "arrays": layout,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = -(-(_PREAMBLE.size + len(header_bytes)) // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(FLAT_MAGIC, FLAT_FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+# ---------- Serving ----------
+class FlatModel:
+    """predict/predict_proba over a memory-mapped flat model file."""
+
+    def __init__(self, path: str, header: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.header = header
+        self.arrays = arrays
+        self.feature_order = header["feature_order"]
+        self.members = header["members"]
+
+    @classmethod
+    def load(cls, path: str) -> "FlatModel":
+        with open(path, "rb") as f:
+            magic, version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != FLAT_MAGIC:
+                raise ValueError(f"{path} is not a flat model file")
+            if version != FLAT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported flat model version {version}")
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        data_start = -(-(_PREAMBLE.size + header_len) // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+        arrays = {}
+        for name, info in header["arrays"].items():
+            shape = tuple(info["shape"])
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.zeros(shape, dtype=np.dtype(info["dtype"]))
+                continue
+            arrays[name] = np.memmap(path, dtype=np.dtype(info["dtype"]), mode="r",
+                                     offset=data_start + info["offset"], shape=shape)
+
+        # Resolve array references in the specs back to (memory-mapped) arrays
+        for member in header["members"]:
+            for t in member["preprocessor"]["transformers"]:
+                for key in ("mean", "scale"):
+                    if isinstance(t.get(key), str):
+                        t[key] = arrays[t[key]]
+            calibration = member["calibration"]
+            if calibration is not None and calibration["method"] == "isotonic":
+                for key in ("x", "y"):
+                    calibration[key] = arrays[calibration[key]]
+        return cls(path, header, arrays)
+
+    def transform(self, X: pd.DataFrame, member: int = 0) -> np.ndarray:
+        return transform_with_spec(self.members[member]["preprocessor"], X)
+
+    def tables(self, member: int) -> Dict[str, np.ndarray]:
+        prefix = f"m{member}."
+        return {name[len(prefix):]: array for name, array in self.arrays.items() if name.startswith(prefix)}
+
+    def leaf_nodes(self, member: int, Xt: np.ndarray) -> np.ndarray:
+        """Global leaf index reached by every (row, tree). Vectorized over rows and trees."""
+        t = self.tables(member)
+        n_rows = Xt.shape[0]
+        node = np.broadcast_to(np.asarray(t["roots"]), (n_rows, len(t["roots"]))).copy()
+        rows = np.arange(n_rows)[:, None]
+        for _ in range(self.members[member]["max_depth"]):
+            x = Xt[rows, t["feature"][node]]
+            go_left = np.where(np.isnan(x), t["default_left"][node], x < t["threshold"][node])
+            node = np.where(go_left, t["left"][node], t["right"][node])
+        return node
+
+    def margin(self, member: int, Xt: np.ndarray) -> np.ndarray:
+        leaves = self.leaf_nodes(member, Xt)
+        values = np.asarray(self.tables(member)["value"])[leaves]
+        return self.members[member]["base_margin"] + values.sum(axis=1, dtype=np.float32)
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        positive = np.zeros(len(X), dtype=float)
+        for i, member in enumerate(self.members):
+            raw = 1.0 / (1.0 + np.exp(-self.margin(i, self.transform(X, i)).astype(float)))
+            positive += calibrate(member["calibration"], raw)
+        positive /= len(self.members)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def is_flat_model(path: str) -> bool:
+    return path.endswith(FLAT_SUFFIX)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python flat_model.py <model.pkl | model.spec.json> [output.flat]")
+        sys.exit(1)
+
+    from model_artifacts import NativeModel, is_native_spec, NATIVE_SPEC_SUFFIX
+    from preprocess import FEATURE_ORDER
+
+    source = sys.argv[1]
+    if is_native_spec(source):
+        loaded = NativeModel.load(source)
+        stem = source[:-len(NATIVE_SPEC_SUFFIX)]
+    else:
+        import joblib
+        loaded = joblib.load(source)
+        stem = os.path.splitext(source)[0]
+    output = sys.argv[2] if len(sys.argv) > 2 else stem + FLAT_SUFFIX
+
+    write_flat_model(loaded, output, FEATURE_ORDER)
+    started = time.perf_counter()
+    flat = FlatModel.load(output)
+    load_seconds = time.perf_counter() - started
+
+    print(f"✓ Flat model written: {output}")
+    print(f"  Size: {os.path.getsize(output):,} bytes, load (mmap) time: {load_seconds * 1000:.2f} ms")
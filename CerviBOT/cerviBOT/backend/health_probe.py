@@ -0,0 +1,99 @@
+"""
+Background health self-test.
+
+The self-test (preprocess plus predict_proba on a fixed profile) runs on a
+background thread every interval_seconds and after each model change, and the
+last result is cached. /health, /livez and /readyz only read that cache, so
+load balancers and uptime pingers never put inference work on the request path.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("cervi_backend")
+
+
+class HealthProbe:
+    """
+    Args:
+        check: callable returning the self-test result dict (must include "status")
+        interval_seconds: time between background runs
+    """
+
+    def __init__(self, check: Callable[[], Dict[str, Any]], interval_seconds: float = 30.0):
+        self.check = check
+        self.interval_seconds = interval_seconds
+        self.runs = 0
+        self.failures = 0
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._duration: Optional[float] = None
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def trigger(self) -> None:
+        """Ask the background thread to re-run the self-test now (e.g. after a model swap)."""
+        self._wake.set()
+
+    def refresh(self) -> Dict[str, Any]:
+        """Run the self-test on the calling thread and cache the result. Concurrent callers share one run."""
+        with self._run_lock:
+            start = time.perf_counter()
+            try:
+                result = self.check()
+            except Exception as e:
+                logger.warning(f"Health self-test raised: {e}")
+                result = {"status": "error", "test_prediction_error": str(e)}
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._result = result
+                self._checked_at = time.time()
+                self._duration = duration
+                self.runs += 1
+                if result.get("status") != "ok":
+                    self.failures += 1
+            return dict(result)
+
+    @property
+    def healthy(self) -> bool:
+        with self._lock:
+            return self._result is not None and self._result.get("status") == "ok"
+
+    def cached(self) -> Optional[Dict[str, Any]]:
+        """Last self-test result, or None before the first run."""
+        with self._lock:
+            return dict(self._result) if self._result is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": self._result.get("status") if self._result is not None else None,
+                "checked_at": self._checked_at,
+                "age_seconds": (time.time() - self._checked_at) if self._checked_at is not None else None,
+                "duration_ms": (self._duration * 1000) if self._duration is not None else None,
+                "interval_seconds": self.interval_seconds,
+                "runs": self.runs,
+                "failures": self.failures,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(self.interval_seconds)
@@ -0,0 +1,92 @@
+"""
+Localized response text.
+
+Every string in translations.TRANSLATIONS is parsed once at startup into a
+template (literal pieces plus placeholder names), so rendering a response in the
+caller's language is a dictionary lookup and a join. Missing keys fall back to
+English, then to the key itself.
+"""
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_LANGUAGE = "en"
+
+
+class Template:
+    """A pre-parsed str.format template without format specs or conversions."""
+
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        try:
+            for literal, field, spec, conversion in string.Formatter().parse(text):
+                if spec or conversion:
+                    # Not expected in the catalogue; keep exact str.format semantics for it
+                    self.parts = []
+                    break
+                self.parts.append((literal, field))
+        except ValueError:
+            self.parts = [(text, None)]
+
+    def render(self, values: Dict[str, Any]) -> str:
+        if not self.parts:
+            return self.text.format(**values)
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(values[field]) if field in values else "{" + field + "}")
+        return "".join(out)
+
+
+class Localizer:
+    """Compiled templates for every language in a translations dictionary."""
+
+    def __init__(self, translations: Dict[str, Dict[str, str]], default: str = DEFAULT_LANGUAGE):
+        self.default = default
+        self.catalogs = {lang: dict(strings) for lang, strings in translations.items()}
+        self.templates = {
+            lang: {key: Template(text) for key, text in strings.items()}
+            for lang, strings in translations.items()
+        }
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.templates)
+
+    def resolve(self, lang: Optional[str] = None, accept_language: Optional[str] = None) -> str:
+        """Language to answer in: explicit ?lang= first, then Accept-Language, then the default."""
+        candidates = [lang] if lang else []
+        if accept_language:
+            weighted = []
+            for i, item in enumerate(accept_language.split(",")):
+                code, _, params = item.strip().partition(";")
+                q = 1.0
+                if params.strip().startswith("q="):
+                    try:
+                        q = float(params.strip()[2:])
+                    except ValueError:
+                        q = 0.0
+                weighted.append((-q, i, code.strip()))
+            candidates.extend(code for _, _, code in sorted(weighted))
+        for code in candidates:
+            code = code.lower()
+            if code in self.templates:
+                return code
+            if code.split("-")[0] in self.templates:
+                return code.split("-")[0]
+        return self.default
+
+    def render(self, lang: str, key: str, **values) -> str:
+        template = self.templates.get(lang, {}).get(key) or self.templates.get(self.default, {}).get(key)
+        return template.render(values) if template is not None else key
+
+    def has(self, lang: str, key: str) -> bool:
+        return key in self.templates.get(lang, {}) or key in self.templates.get(self.default, {})
+
+    def option_label(self, lang: str, value: Any) -> str:
+        """Translated answer option (opt_* keys), or the value itself."""
+        key = "opt_" + str(value).strip().lower().replace(" ", "_")
+        return self.render(lang, key) if self.has(lang, key) else str(value)
@@ -0,0 +1,175 @@
+"""
+In-process metric primitives shared by the model registry and the endpoints.
+Kept dependency-free so every worker can record without extra installs.
+
+MetricsRegistry holds named counters and histograms (with labels) and renders
+them, plus anything reported by registered collectors, in the Prometheus text
+exposition format for /metrics.
+"""
+import bisect
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, tuned for single-row inference (sub-ms to a few seconds)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Model load buckets in seconds (memory-mapped loads are milliseconds, full unpickles seconds)
+LOAD_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Probability buckets for score distributions
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics: each bucket counts values <= its bound)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def observe_many(self, values: Sequence[float]) -> None:
+        indexes = [bisect.bisect_left(self.buckets, v) for v in values]
+        with self._lock:
+            for index in indexes:
+                self._counts[index] += 1
+            self._sum += float(sum(values))
+            self._count += len(indexes)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: upper bound of the bucket that contains it."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            if running >= rank:
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total = self._count
+        cumulative: List[int] = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return {
+            "buckets": {str(bound): c for bound, c in zip(self.buckets + ("+Inf",), cumulative)},
+            "sum": total_sum,
+            "count": total,
+        }
+
+
+# A collector returns families as (name, kind, help, samples); kind is "counter", "gauge"
+# or "histogram", samples are (labels, value) with a Histogram as the value for histograms.
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], Any]]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels.items()) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Labeled counters and histograms, rendered in the Prometheus text format (0.0.4)."""
+
+    def __init__(self):
+        # name -> {"kind", "help", "buckets", "series": {label items: float or Histogram}}
+        self._families: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._families.setdefault(name, {"kind": "counter", "help": help_text, "series": {}})
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._families.setdefault(name, {"kind": "histogram", "help": help_text,
+                                         "buckets": tuple(buckets), "series": {}})
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        family = self._families[name]
+        key = tuple(labels.items())
+        with self._lock:
+            family["series"][key] = family["series"].get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        family = self._families[name]
+        key = tuple(labels.items())
+        histogram = family["series"].get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = family["series"].setdefault(key, Histogram(family["buckets"]))
+        histogram.observe(value)
+
+    @contextlib.contextmanager
+    def time(self, name: str, **labels: str):
+        """Observe the duration of the with-block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Register a callable that reports families read from other components at scrape time."""
+        self._collectors.append(collector)
+
+    def _own_families(self) -> List[Family]:
+        with self._lock:
+            return [
+                (name, family["kind"], family["help"],
+                 [(dict(key), value) for key, value in family["series"].items()])
+                for name, family in self._families.items()
+            ]
+
+    def render(self) -> str:
+        families = self._own_families()
+        for collector in self._collectors:
+            families.extend(collector())
+        lines = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {_escape(help_text)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind == "histogram":
+                    snapshot = value.snapshot()
+                    for bound, count in snapshot["buckets"].items():
+                        le = "+Inf" if bound == "+Inf" else _number(float(bound))
+                        lines.append(f"{name}_bucket{_labels(labels, ('le', le))} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(snapshot['sum'])}")
+                    lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,412 @@
+"""
+Serving artifact formats.
+
+Instead of pickling the whole imblearn Pipeline (and CalibratedClassifierCV
+wrapper) with joblib, the export writes:
+
+  - one XGBoost booster per ensemble member in XGBoost's native UBJSON format
+  - a small JSON spec with the ColumnTransformer parameters (scaler statistics,
+    one-hot categories), the calibration tables and FEATURE_ORDER
+
+Loading it needs only numpy, pandas and xgboost: no sklearn/imblearn object
+graphs are unpickled, so it is faster, smaller and survives library upgrades.
+
+It also provides a slim "serving" pickle (ServingModel): the fitted
+ColumnTransformer and XGBoost model of each member, with SMOTE, the imblearn
+Pipeline and the CalibratedClassifierCV wrapper stripped. It still needs sklearn
+to unpickle, but not imblearn.
+
+Usage:
+    python model_artifacts.py export <model.pkl> [output_dir]
+    python model_artifacts.py serving <model.pkl> [output_path]
+"""
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("cervi_backend")
+
+NATIVE_FORMAT = "xgboost-native"
+NATIVE_FORMAT_VERSION = 1
+NATIVE_SPEC_SUFFIX = ".spec.json"
+SERVING_SUFFIX = ".serving.pkl"
+DEFAULT_BASENAME = "cervical_cancer_model"
+
+
+# ---------- Reading fitted sklearn objects ----------
+def unwrap_members(model) -> List[Dict[str, Any]]:
+    """
+    Split a fitted model into ensemble members of {"pipeline", "calibrator"}.
+    A plain pipeline is one member without calibration; CalibratedClassifierCV
+    contributes one member per fold.
+    """
+    if hasattr(model, "calibrated_classifiers_"):
+        members = []
+        for calibrated in model.calibrated_classifiers_:
+            # sklearn >= 1.2 uses `estimator`, older releases `base_estimator`
+            pipeline = getattr(calibrated, "estimator", None) or getattr(calibrated, "base_estimator")
+            members.append({"pipeline": pipeline, "calibrator": calibrated.calibrators[0]})
+        return members
+    return [{"pipeline": model, "calibrator": None}]
+
+
+def split_pipeline(pipeline):
+    """Return (column_transformer, xgb_classifier), skipping samplers such as SMOTE."""
+    steps = getattr(pipeline, "steps", None)
+    if not steps:
+        raise ValueError(f"Expected a Pipeline with a preprocessor and XGBoost model, got {type(pipeline).__name__}")
+    preprocessor = None
+    estimator = steps[-1][1]
+    for _, step in steps[:-1]:
+        if hasattr(step, "transformers_"):
+            preprocessor = step
+    if preprocessor is None:
+        raise ValueError("Pipeline has no fitted ColumnTransformer step")
+    if not hasattr(estimator, "get_booster"):
+        raise ValueError(f"Final pipeline step is not an XGBoost model: {type(estimator).__name__}")
+    return preprocessor, estimator
+
+
+def preprocessor_spec(column_transformer) -> Dict[str, Any]:
+    """Extract the parameters of a fitted ColumnTransformer into plain JSON types."""
+    input_names = list(getattr(column_transformer, "feature_names_in_", []))
+    transformers = []
+    for name, transformer, columns in column_transformer.transformers_:
+        if isinstance(columns, slice) or (len(columns) and not isinstance(columns[0], str)):
+            columns = [input_names[i] for i in np.arange(len(input_names))[columns]]
+        columns = list(columns)
+        if not columns or transformer == "drop":
+            continue
+        if transformer == "passthrough":
+            transformers.append({"kind": "passthrough", "columns": columns})
+        elif type(transformer).__name__ == "StandardScaler":
+            n = len(columns)
+            mean = transformer.mean_ if transformer.with_mean else np.zeros(n)
+            scale = transformer.scale_ if transformer.with_std else np.ones(n)
+            transformers.append({
+                "kind": "standard_scaler",
+                "columns": columns,
+                "mean": np.asarray(mean, dtype=float).tolist(),
+                "scale": np.asarray(scale, dtype=float).tolist(),
+            })
+        elif type(transformer).__name__ == "OneHotEncoder":
+            drop_idx = getattr(transformer, "drop_idx_", None)
+            transformers.append({
+                "kind": "one_hot",
+                "columns": columns,
+                "categories": [[str(c) for c in cats] for cats in transformer.categories_],
+                "drop_idx": None if drop_idx is None else [None if d is None else int(d) for d in drop_idx],
+            })
+        else:
+            raise ValueError(f"Unsupported transformer in ColumnTransformer: {type(transformer).__name__}")
+    return {"transformers": transformers}
+
+
+def calibrator_spec(calibrator) -> Optional[Dict[str, Any]]:
+    """Extract an isotonic or sigmoid calibrator into plain JSON types."""
+    if calibrator is None:
+        return None
+    if hasattr(calibrator, "X_thresholds_"):
+        return {
+            "method": "isotonic",
+            "x": np.asarray(calibrator.X_thresholds_, dtype=float).tolist(),
+            "y": np.asarray(calibrator.y_thresholds_, dtype=float).tolist(),
+        }
+    if hasattr(calibrator, "a_"):
+        return {"method": "sigmoid", "a": float(calibrator.a_), "b": float(calibrator.b_)}
+    raise ValueError(f"Unsupported calibrator: {type(calibrator).__name__}")
+
+
+# ---------- Serving-side implementation of the spec ----------
+def transform_with_spec(spec: Dict[str, Any], X: pd.DataFrame) -> np.ndarray:
+    """Apply a preprocessor spec to a DataFrame; equivalent to ColumnTransformer.transform."""
+    blocks = []
+    for t in spec["transformers"]:
+        if t["kind"] == "standard_scaler":
+            values = X[t["columns"]].to_numpy(dtype=float)
+            blocks.append((values - np.asarray(t["mean"])) / np.asarray(t["scale"]))
+        elif t["kind"] == "one_hot":
+            for i, column in enumerate(t["columns"]):
+                cats = np.asarray(t["categories"][i], dtype=object)
+                values = X[column].astype(str).to_numpy(dtype=object)
+                encoded = (values[:, None] == cats[None, :]).astype(float)
+                drop = t["drop_idx"][i] if t["drop_idx"] is not None else None
+                if drop is not None:
+                    encoded = np.delete(encoded, drop, axis=1)
+                blocks.append(encoded)
+        else:
+            blocks.append(X[t["columns"]].to_numpy(dtype=float))
+    return np.hstack(blocks).astype(np.float32)
+
+
+def output_feature_groups(spec: Dict[str, Any]) -> List[str]:
+    """Name of the original input column behind each transformed (post one-hot) feature."""
+    groups = []
+    for t in spec["transformers"]:
+        if t["kind"] == "one_hot":
+            for i, column in enumerate(t["columns"]):
+                n_out = len(t["categories"][i])
+                if t["drop_idx"] is not None and t["drop_idx"][i] is not None:
+                    n_out -= 1
+                groups.extend([column] * n_out)
+        else:
+            groups.extend(t["columns"])
+    return groups
+
+
+def calibrate(calibration: Optional[Dict[str, Any]], proba: np.ndarray) -> np.ndarray:
+    """Map raw positive-class probabilities through a calibration spec."""
+    if calibration is None:
+        return proba
+    if calibration["method"] == "isotonic":
+        x = np.asarray(calibration["x"])
+        # IsotonicRegression(out_of_bounds="clip") semantics
+        return np.interp(np.clip(proba, x[0], x[-1]), x, np.asarray(calibration["y"]))
+    return 1.0 / (1.0 + np.exp(calibration["a"] * proba + calibration["b"]))
+
+
+class NativeModel:
+    """
+    predict/predict_proba over a native export. Mirrors the sklearn estimator API
+    used by app.py, so it can be served interchangeably with a joblib pipeline.
+    """
+
+    def __init__(self, spec: Dict[str, Any], boosters: List[Any], spec_path: Optional[str] = None):
+        self.spec = spec
+        self.boosters = boosters
+        self.spec_path = spec_path
+        self.feature_order = spec.get("feature_order", [])
+        self.members = spec["members"]
+
+    @classmethod
+    def load(cls, spec_path: str) -> "NativeModel":
+        import xgboost as xgb
+
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        if spec.get("format") != NATIVE_FORMAT:
+            raise ValueError(f"{spec_path} is not a {NATIVE_FORMAT} spec")
+        base_dir = os.path.dirname(os.path.abspath(spec_path))
+        boosters = []
+        for member in spec["members"]:
+            booster = xgb.Booster()
+            booster.load_model(os.path.join(base_dir, member["booster"]))
+            # Inputs are positional float arrays built by transform_with_spec
+            booster.feature_names = None
+            boosters.append(booster)
+        return cls(spec, boosters, spec_path)
+
+    def transform(self, X: pd.DataFrame, member: int = 0) -> np.ndarray:
+        return transform_with_spec(self.members[member]["preprocessor"], X)
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        positive = np.zeros(len(X), dtype=float)
+        for i, (member, booster) in enumerate(zip(self.members, self.boosters)):
+            raw = booster.inplace_predict(self.transform(X, i))
+            positive += calibrate(member["calibration"], np.asarray(raw, dtype=float))
+        positive /= len(self.members)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+class ServingModel:
+    """
+    Inference-only replacement for the training pipeline: per member, the fitted
+    preprocessor and XGBoost estimator plus the calibration table as plain data.
+    """
+
+    def __init__(self, members: List[Dict[str, Any]], feature_order: List[str]):
+        self.members = members
+        self.feature_order = list(feature_order)
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        positive = np.zeros(len(X), dtype=float)
+        for member in self.members:
+            Xt = member["preprocessor"].transform(X)
+            raw = member["estimator"].predict_proba(Xt)[:, 1]
+            positive += calibrate(member["calibration"], np.asarray(raw, dtype=float))
+        positive /= len(self.members)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def member_specs(model) -> List[Dict[str, Any]]:
+    """
+    Per ensemble member: {"booster", "preprocessor" (spec), "calibration" (spec)}.
+    Works for fitted pipelines / CalibratedClassifierCV and for a loaded NativeModel.
+    """
+    if isinstance(model, NativeModel):
+        return [
+            {"booster": booster, "preprocessor": member["preprocessor"], "calibration": member["calibration"]}
+            for member, booster in zip(model.members, model.boosters)
+        ]
+    specs = []
+    for member in unwrap_members(model):
+        preprocessor, estimator = split_pipeline(member["pipeline"])
+        specs.append({
+            "booster": estimator.get_booster(),
+            "preprocessor": preprocessor_spec(preprocessor),
+            "calibration": calibrator_spec(member["calibrator"]),
+        })
+    return specs
+
+
+# ---------- Export ----------
+def export_native(model, output_dir: str, feature_order: List[str], basename: str = DEFAULT_BASENAME) -> str:
+    """
+    Write a fitted pipeline (optionally wrapped in CalibratedClassifierCV) as
+    native boosters plus a JSON spec. Returns the spec path.
+    """
+    import sklearn
+    import xgboost as xgb
+
+    os.makedirs(output_dir, exist_ok=True)
+    members = []
+    for i, member in enumerate(member_specs(model)):
+        booster_name = f"{basename}.m{i}.ubj"
+        member["booster"].save_model(os.path.join(output_dir, booster_name))
+        members.append({
+            "booster": booster_name,
+            "preprocessor": member["preprocessor"],
+            "calibration": member["calibration"],
+        })
+
+    spec = {
+        "format": NATIVE_FORMAT,
+        "format_version": NATIVE_FORMAT_VERSION,
+        "feature_order": list(feature_order),
+        "members": members,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "xgboost_version": xgb.__version__,
+        "sklearn_version": sklearn.__version__,
+    }
+    spec_path = os.path.join(output_dir, basename + NATIVE_SPEC_SUFFIX)
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2)
+    return spec_path
+
+
+def export_serving(model, output_path: str, feature_order: List[str]) -> str:
+    """Write a ServingModel pickle without SMOTE / imblearn / calibration wrappers. Returns the path."""
+    import joblib
+
+    members = []
+    for member in unwrap_members(model):
+        preprocessor, estimator = split_pipeline(member["pipeline"])
+        members.append({
+            "preprocessor": preprocessor,
+            "estimator": estimator,
+            "calibration": calibrator_spec(member["calibrator"]),
+        })
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    joblib.dump(ServingModel(members, feature_order), output_path)
+    return output_path
+
+
+def is_native_spec(path: str) -> bool:
+    return path.endswith(NATIVE_SPEC_SUFFIX)
+
+
+def artifact_size(path: str) -> int:
+    """On-disk size of an artifact; a native spec counts its booster files too."""
+    if not is_native_spec(path):
+        return os.path.getsize(path)
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return os.path.getsize(path) + sum(os.path.getsize(os.path.join(base_dir, m["booster"])) for m in spec["members"])
+
+
+# Runs in a fresh interpreter so each measurement includes the libraries the artifact pulls in
+_MEASURE_SCRIPT = """
+import json, os, resource, sys, time
+def rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+sys.path.insert(0, sys.argv[2])
+before = rss()
+started = time.perf_counter()
+path = sys.argv[1]
+if path.endswith(%r):
+    from model_artifacts import NativeModel
+    NativeModel.load(path)
+elif path.endswith(".flat"):
+    from flat_model import FlatModel
+    FlatModel.load(path)
+else:
+    import joblib
+    joblib.load(path)
+elapsed = time.perf_counter() - started
+print(json.dumps({"load_seconds": elapsed, "rss_before_bytes": before, "rss_after_bytes": rss(),
+                  "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+                  "imblearn_imported": "imblearn" in sys.modules}))
+""" % NATIVE_SPEC_SUFFIX
+
+
+def measure_artifact(path: str) -> Dict[str, Any]:
+    """Size, load time and resident memory after loading an artifact in a fresh process."""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _MEASURE_SCRIPT, path, os.path.dirname(os.path.abspath(__file__))],
+        capture_output=True, text=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring {path} failed: {result.stderr.strip()[-500:]}")
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["size_bytes"] = artifact_size(path)
+    stats["rss_delta_bytes"] = stats["rss_after_bytes"] - stats["rss_before_bytes"]
+    return stats
+
+
+def print_artifact_report(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Measure each artifact and print a comparison table. Returns the measurements."""
+    report = {}
+    print(f"\n{'Artifact':<45} {'Size (MB)':>10} {'Load (s)':>9} {'RSS after (MB)':>15} {'imblearn':>9}")
+    for path in paths:
+        stats = measure_artifact(path)
+        report[os.path.basename(path)] = stats
+        print(f"{os.path.basename(path):<45} {stats['size_bytes']/1024/1024:>10.2f} {stats['load_seconds']:>9.3f} "
+              f"{stats['rss_after_bytes']/1024/1024:>15.1f} {str(stats['imblearn_imported']):>9}")
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("export", "serving"):
+        print("Usage: python model_artifacts.py export <model.pkl> [output_dir]")
+        print("       python model_artifacts.py serving <model.pkl> [output_path]")
+        sys.exit(1)
+
+    import joblib
+    from preprocess import FEATURE_ORDER
+    # Re-import by module name so pickled classes reference model_artifacts, not __main__
+    import model_artifacts as artifacts
+
+    source = sys.argv[2]
+    pipeline = joblib.load(source)
+
+    if sys.argv[1] == "export":
+        output_dir = sys.argv[3] if len(sys.argv) > 3 else os.path.dirname(os.path.abspath(source))
+        written = artifacts.export_native(pipeline, output_dir, FEATURE_ORDER)
+        print(f"✓ Native model written: {written}")
+    else:
+        default_path = os.path.splitext(os.path.abspath(source))[0] + SERVING_SUFFIX
+        written = artifacts.export_serving(pipeline, sys.argv[3] if len(sys.argv) > 3 else default_path, FEATURE_ORDER)
+        print(f"✓ Serving model written: {written}")
+
+    artifacts.print_artifact_report([source, written])
@@ -0,0 +1,150 @@
+"""
+Single-flight model loading.
+
+Loading a model can take seconds. When the model is missing, every concurrent
+request used to start its own load. SingleFlightLoader lets exactly one caller
+(the leader) run the load; callers arriving meanwhile wait for the leader's
+result up to a deadline, or fail fast. After a failed load, further attempts
+fail fast until a cooldown passes, so a missing artifact is not re-read on
+every request.
+
+Each load is recorded with its cause (import, startup, emergency, upload, ...)
+and duration.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from metrics import Histogram, LOAD_BUCKETS
+
+
+class ModelLoadError(RuntimeError):
+    """The load ran (or recently ran) and failed."""
+
+
+class ModelLoadTimeout(ModelLoadError):
+    """Another load is in flight and did not finish within the wait deadline."""
+
+
+class _Attempt:
+    def __init__(self, cause: str):
+        self.cause = cause
+        self.started = time.time()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightLoader:
+    """
+    Args:
+        wait_timeout: seconds a follower waits for the in-flight load (0 = fail fast)
+        failure_cooldown: seconds after a failed load during which new loads fail fast
+        history: number of recent loads kept for reporting
+    """
+
+    def __init__(self, wait_timeout: float = 10.0, failure_cooldown: float = 5.0, history: int = 20):
+        self.wait_timeout = wait_timeout
+        self.failure_cooldown = failure_cooldown
+        self._lock = threading.Lock()
+        self._inflight: Optional[_Attempt] = None
+        self._last_failure_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._durations: Dict[str, Histogram] = {}
+        self._outcomes: Dict[str, Dict[str, int]] = {}
+        self._recent = deque(maxlen=history)
+        self.waited = 0
+        self.timeouts = 0
+        self.fast_failures = 0
+
+    @property
+    def loading(self) -> bool:
+        return self._inflight is not None
+
+    def run(self, cause: str, load_fn: Callable[[], Any], wait_timeout: Optional[float] = None) -> Any:
+        """
+        Run load_fn unless a load is already in flight, in which case wait for its result.
+        load_fn signals failure by raising. Raises ModelLoadError / ModelLoadTimeout.
+        """
+        with self._lock:
+            attempt = self._inflight
+            leader = attempt is None
+            if leader:
+                if self._last_failure_at is not None and time.time() - self._last_failure_at < self.failure_cooldown:
+                    self.fast_failures += 1
+                    raise ModelLoadError(f"Recent model load failed, retrying later: {self._last_error}")
+                attempt = self._inflight = _Attempt(cause)
+            else:
+                self.waited += 1
+
+        if not leader:
+            timeout = self.wait_timeout if wait_timeout is None else wait_timeout
+            if not attempt.done.wait(timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise ModelLoadTimeout(f"Model load ({attempt.cause}) still in progress after {timeout:.1f}s")
+            if attempt.error is not None:
+                raise ModelLoadError(str(attempt.error))
+            return attempt.result
+
+        started = time.perf_counter()
+        try:
+            attempt.result = load_fn()
+        except Exception as e:
+            attempt.error = e
+        finally:
+            self.record(cause, time.perf_counter() - started, attempt.error is None,
+                        str(attempt.error) if attempt.error is not None else None)
+            with self._lock:
+                self._inflight = None
+                if attempt.error is None:
+                    self._last_failure_at = self._last_error = None
+                else:
+                    self._last_failure_at = time.time()
+                    self._last_error = str(attempt.error)
+            attempt.done.set()
+
+        if attempt.error is not None:
+            if isinstance(attempt.error, ModelLoadError):
+                raise attempt.error
+            raise ModelLoadError(str(attempt.error)) from attempt.error
+        return attempt.result
+
+    def record(self, cause: str, seconds: float, ok: bool, error: Optional[str] = None) -> None:
+        """Record a load duration; also used for loads that bypass single-flight (e.g. uploads)."""
+        with self._lock:
+            histogram = self._durations.setdefault(cause, Histogram(LOAD_BUCKETS))
+            outcomes = self._outcomes.setdefault(cause, {"ok": 0, "failed": 0})
+            outcomes["ok" if ok else "failed"] += 1
+            self._recent.append({
+                "cause": cause,
+                "seconds": seconds,
+                "ok": ok,
+                "error": error,
+                "finished_at": time.time(),
+            })
+        histogram.observe(seconds)
+
+    def durations(self) -> Dict[str, Tuple[Histogram, Dict[str, int]]]:
+        """Load duration histogram and ok/failed counts per cause."""
+        with self._lock:
+            return {cause: (hist, dict(self._outcomes[cause])) for cause, hist in self._durations.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = self._inflight
+            return {
+                "loading": inflight is not None,
+                "loading_cause": inflight.cause if inflight is not None else None,
+                "loading_for_seconds": (time.time() - inflight.started) if inflight is not None else None,
+                "waited": self.waited,
+                "timeouts": self.timeouts,
+                "fast_failures": self.fast_failures,
+                "last_error": self._last_error,
+                "by_cause": {
+                    cause: {**self._outcomes[cause], "duration_seconds": hist.snapshot()}
+                    for cause, hist in self._durations.items()
+                },
+                "recent": list(self._recent),
+            }
@@ -0,0 +1,102 @@
+"""
+model_files/manifest.json: the single source of truth for which artifact is served.
+
+The manifest names the active artifact (relative to model_files/), its format,
+a SHA-256 checksum and the feature order it expects. The app reads it at startup
+instead of probing paths and unpickling whatever it finds. train_model.py and
+/upload-model (and rollback/promote) rewrite it whenever the active model changes.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+_CHECKSUM_CHUNK = 1024 * 1024
+
+
+class ManifestError(ValueError):
+    """The manifest is missing fields, points at a missing file, or the checksum does not match."""
+
+
+def artifact_format(path: str) -> str:
+    """Format label for an artifact, from its file name."""
+    if path.endswith(".flat"):
+        return "flat"
+    if path.endswith(".spec.json"):
+        return "xgboost-native"
+    if path.endswith(".serving.pkl"):
+        return "serving-pickle"
+    return "joblib"
+
+
+def file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHECKSUM_CHUNK), b""):
+            digest.update(chunk)
+    return "sha256:" + digest.hexdigest()
+
+
+def manifest_path(model_dir: str) -> str:
+    return os.path.join(model_dir, MANIFEST_NAME)
+
+
+def write_manifest(model_dir: str, artifact_path: str, feature_order: List[str],
+                   version: Optional[str] = None) -> Dict[str, Any]:
+    """Point the manifest at artifact_path (must live in model_dir). Written atomically."""
+    artifact_path = os.path.abspath(artifact_path)
+    model_dir = os.path.abspath(model_dir)
+    if os.path.dirname(artifact_path) != model_dir:
+        raise ManifestError(f"Artifact {artifact_path} is not inside {model_dir}")
+
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "artifact": os.path.basename(artifact_path),
+        "format": artifact_format(artifact_path),
+        "checksum": file_checksum(artifact_path),
+        "size_bytes": os.path.getsize(artifact_path),
+        "feature_order": list(feature_order),
+        "version": version,
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    target = manifest_path(model_dir)
+    temp_path = target + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, target)
+    return manifest
+
+
+def read_manifest(model_dir: str) -> Optional[Dict[str, Any]]:
+    """Parsed manifest, or None when model_dir has no manifest."""
+    path = manifest_path(model_dir)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Unreadable manifest {path}: {e}")
+    for key in ("artifact", "format", "checksum", "feature_order"):
+        if key not in manifest:
+            raise ManifestError(f"Manifest {path} is missing '{key}'")
+    return manifest
+
+
+def resolve_manifest(model_dir: str, verify_checksum: bool = True) -> Optional[str]:
+    """
+    Absolute path of the active artifact named by the manifest, or None without a manifest.
+    Raises ManifestError if the artifact is missing or its checksum does not match.
+    """
+    manifest = read_manifest(model_dir)
+    if manifest is None:
+        return None
+    artifact = os.path.join(os.path.abspath(model_dir), os.path.basename(manifest["artifact"]))
+    if not os.path.isfile(artifact):
+        raise ManifestError(f"Manifest artifact not found: {artifact}")
+    if verify_checksum and file_checksum(artifact) != manifest["checksum"]:
+        raise ManifestError(f"Checksum mismatch for {artifact}")
+    return artifact
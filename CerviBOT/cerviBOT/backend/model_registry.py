@@ -0,0 +1,179 @@
+"""
+Registry of loaded model versions.
+
+Holds several models at once so a retrained artifact can take a share of live
+traffic next to the primary. Requests are routed either explicitly (a version
+name in a request header) or by weight, and every version keeps its own latency,
+error and score statistics so versions can be compared before promotion.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from metrics import Histogram, LATENCY_BUCKETS, SCORE_BUCKETS
+
+
+class VersionStats:
+    """Per-version counters: latency histogram, error count and score distribution."""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.scores = Histogram(SCORE_BUCKETS)
+        self.requests = 0
+        self.cached_requests = 0
+        self.errors = 0
+        self.batch_rows = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, scores: List[float]) -> None:
+        self.latency.observe(seconds)
+        self.scores.observe_many(scores)
+        with self._lock:
+            self.requests += 1
+
+    def record_cached(self, scores: List[float]) -> None:
+        """A request answered from the result cache: counted and scored, but no model latency."""
+        self.scores.observe_many(scores)
+        with self._lock:
+            self.requests += 1
+            self.cached_requests += 1
+
+    def record_batch(self, scores: List[float]) -> None:
+        """Batch calls feed the score distribution only, so they don't skew single-row latency."""
+        self.scores.observe_many(scores)
+        with self._lock:
+            self.batch_rows += len(scores)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cached_requests": self.cached_requests,
+            "errors": self.errors,
+            "error_rate": (self.errors / self.requests) if self.requests else 0.0,
+            "batch_rows": self.batch_rows,
+            "latency_p50_seconds": self.latency.quantile(0.5),
+            "latency_p99_seconds": self.latency.quantile(0.99),
+            "latency_seconds": self.latency.snapshot(),
+            "score_distribution": self.scores.snapshot(),
+        }
+
+
+class ModelVersion:
+    """A loaded model plus the metadata needed to route to it and report on it."""
+
+    def __init__(self, name: str, model: Any, path: str, weight: float = 0.0):
+        self.name = name
+        self.model = model
+        self.path = path
+        self.weight = weight
+        self.loaded_at = time.time()
+        self.stats = VersionStats()
+        # Artifact content hash, computed on first use; part of the result cache keys
+        self.fingerprint: Optional[str] = None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "model_type": type(self.model).__name__,
+            "weight": self.weight,
+            "loaded_at": self.loaded_at,
+            "stats": self.stats.snapshot(),
+        }
+
+
+class ModelRegistry:
+    """
+    Thread-safe collection of ModelVersion objects with one designated primary.
+
+    A non-primary version's weight is the fraction of traffic (0..1) it receives;
+    the primary serves whatever is left. A version with weight 0 gets no weighted
+    traffic but can still be reached through the routing header. If candidate
+    weights add up to more than 1 they are scaled down proportionally.
+    """
+
+    def __init__(self):
+        self._versions: "OrderedDict[str, ModelVersion]" = OrderedDict()
+        self._primary: Optional[str] = None
+        self._lock = threading.RLock()
+
+    @property
+    def primary(self) -> Optional[ModelVersion]:
+        with self._lock:
+            return self._versions.get(self._primary) if self._primary else None
+
+    def get(self, name: str) -> Optional[ModelVersion]:
+        with self._lock:
+            return self._versions.get(name)
+
+    def versions(self) -> List[ModelVersion]:
+        with self._lock:
+            return list(self._versions.values())
+
+    def add(self, name: str, model: Any, path: str, weight: float = 0.0, primary: bool = False) -> ModelVersion:
+        """Register a version, replacing any existing version with the same name."""
+        version = ModelVersion(name, model, path, weight)
+        with self._lock:
+            self._versions[name] = version
+            if primary or self._primary is None:
+                self._primary = name
+        return version
+
+    def restore(self, version: ModelVersion) -> None:
+        """Re-register a previously built version object (keeps its stats) as the primary."""
+        with self._lock:
+            self._versions[version.name] = version
+            self._primary = version.name
+
+    def remove(self, name: str) -> ModelVersion:
+        with self._lock:
+            if name == self._primary:
+                raise ValueError("Cannot remove the primary version; promote another version first.")
+            if name not in self._versions:
+                raise KeyError(name)
+            return self._versions.pop(name)
+
+    def promote(self, name: str) -> ModelVersion:
+        with self._lock:
+            if name not in self._versions:
+                raise KeyError(name)
+            self._primary = name
+            return self._versions[name]
+
+    def set_weight(self, name: str, weight: float) -> ModelVersion:
+        if not 0 <= weight <= 1:
+            raise ValueError("Weight must be between 0 and 1.")
+        with self._lock:
+            if name not in self._versions:
+                raise KeyError(name)
+            self._versions[name].weight = weight
+            return self._versions[name]
+
+    def select(self, requested: Optional[str] = None) -> Optional[ModelVersion]:
+        """Pick the version for one request: explicit name first, then weighted choice, then primary."""
+        with self._lock:
+            if requested and requested in self._versions:
+                return self._versions[requested]
+            candidates = [v for v in self._versions.values() if v.weight > 0 and v.name != self._primary]
+            total = sum(v.weight for v in candidates)
+            draw = random.random() * max(total, 1.0)
+            cumulative = 0.0
+            for candidate in candidates:
+                cumulative += candidate.weight
+                if draw < cumulative:
+                    return candidate
+            return self._versions.get(self._primary) if self._primary else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "primary": self._primary,
+                "versions": [v.describe() for v in self._versions.values()],
+            }
@@ -0,0 +1,122 @@
+"""
+Watch model_files/ and trigger a hot reload when an artifact or the manifest changes.
+
+Uses watchfiles (inotify on Linux; installed with uvicorn[standard]) when available
+and falls back to polling file sizes and modification times. Bursts of events
+(a training run writes several files) are debounced into one callback, which
+runs on the watcher thread so the event loop is never blocked.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger("cervi_backend")
+
+# Files written as part of an in-progress save; never trigger a reload on their own
+IGNORED_PREFIXES = (".",)
+IGNORED_SUFFIXES = (".tmp", ".prev", ".swp", "~")
+
+
+def _relevant(path: str) -> bool:
+    name = os.path.basename(path)
+    return not name.startswith(IGNORED_PREFIXES) and not name.endswith(IGNORED_SUFFIXES)
+
+
+class ModelWatcher:
+    """
+    Args:
+        directory: directory to watch (model_files/)
+        on_change: callable(set of changed paths), called once per debounced burst
+        debounce_seconds: quiet period after the last event before on_change fires
+        poll_interval: polling period when watchfiles is unavailable (or force_polling)
+    """
+
+    def __init__(self, directory: str, on_change: Callable[[Set[str]], None],
+                 debounce_seconds: float = 2.0, poll_interval: float = 5.0, force_polling: bool = False):
+        self.directory = directory
+        self.on_change = on_change
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.force_polling = force_polling
+        self.backend: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        try:
+            if not self.force_polling:
+                try:
+                    import watchfiles  # noqa: F401
+                except ImportError:
+                    logger.info("watchfiles not installed; polling model_files/ for changes")
+                else:
+                    self.backend = "watchfiles"
+                    self._watch_events()
+                    return
+            self.backend = "polling"
+            self._watch_polling()
+        except Exception:
+            logger.exception("Model watcher stopped unexpectedly")
+
+    def _dispatch(self, changed: Set[str]) -> None:
+        changed = {p for p in changed if _relevant(p)}
+        if not changed:
+            return
+        logger.info(f"Model files changed: {sorted(os.path.basename(p) for p in changed)}")
+        try:
+            self.on_change(changed)
+        except Exception:
+            logger.exception("Model reload after file change failed")
+
+    def _watch_events(self) -> None:
+        from watchfiles import watch
+
+        # step: quiet period that ends a burst; debounce: upper bound on how long one burst is grouped
+        quiet_ms = max(int(self.debounce_seconds * 1000), 50)
+        for changes in watch(self.directory, stop_event=self._stop, step=quiet_ms,
+                             debounce=quiet_ms * 10, recursive=False):
+            self._dispatch({path for _, path in changes})
+
+    def _snapshot(self) -> Dict[str, Tuple[float, int]]:
+        state = {}
+        try:
+            entries = os.scandir(self.directory)
+        except OSError:
+            return state
+        with entries:
+            for entry in entries:
+                if entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[entry.path] = (stat.st_mtime, stat.st_size)
+        return state
+
+    def _watch_polling(self) -> None:
+        previous = self._snapshot()
+        pending: Set[str] = set()
+        last_change = 0.0
+        while not self._stop.wait(min(self.poll_interval, self.debounce_seconds) if pending else self.poll_interval):
+            current = self._snapshot()
+            changed = {p for p in set(previous) | set(current) if previous.get(p) != current.get(p)}
+            previous = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce_seconds:
+                self._dispatch(pending)
+                pending = set()
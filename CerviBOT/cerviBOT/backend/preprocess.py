@@ -26,6 +26,45 @@ FEATURE_ORDER = [
     'Vaginal bleeding(time-b/w periods , After sex or after menopause)',
 ]
 
+# Map backend field names to model column names
+FIELD_MAPPING = {
+    'Age': 'Age',
+    'Num_of_sexual_partners': 'Num of sexual partners',
+    'First_sex_age': '1st sexual intercourse (age)',
+    'Num_of_pregnancies': 'Num of pregnancies',
+    'Smokes_years': 'Smokes (years)',
+    'Hormonal_contraceptives': 'Hormonal contraceptives',
+    'Hormonal_contraceptives_years': 'Hormonal contraceptives (years)',
+    'STDs_HIV': 'STDs:HIV',
+    'Pain_during_intercourse': 'Pain during intercourse',
+    'Vaginal_discharge_type': 'Vaginal discharge (type- watery, bloody or thick)',
+    'Vaginal_discharge_color': 'Vaginal discharge(color-pink, pale or bloody)',
+    'Vaginal_bleeding_timing': 'Vaginal bleeding(time-b/w periods , After sex or after menopause)',
+}
+FIELD_MAPPING_REVERSE = {model_col: backend_key for backend_key, model_col in FIELD_MAPPING.items()}
+
+# Yes/No fields the model expects as 0/1
+YES_NO_COLUMNS = ['Hormonal contraceptives', 'STDs:HIV']
+
+# Fields the model expects as floats
+NUMERIC_COLUMNS = ['Age', 'Num of sexual partners', '1st sexual intercourse (age)',
+                   'Num of pregnancies', 'Smokes (years)', 'Hormonal contraceptives (years)']
+
+REQUIRED_FIELDS = ['Age', 'Num_of_sexual_partners', 'First_sex_age', 'Num_of_pregnancies']
+
+# (min, max) of the numeric fields, mirroring the UserOptions constraints in app.py; None = unbounded
+NUMERIC_BOUNDS = {
+    'Age': (0, 120),
+    'Num_of_sexual_partners': (0, None),
+    'First_sex_age': (0, 120),
+    'Num_of_pregnancies': (0, None),
+    'Smokes_years': (0, None),
+    'Hormonal_contraceptives_years': (0, None),
+}
+
+# Row indices listed in a batch validation error
+MAX_REPORTED_ROWS = 10
+
 
 def yes_no_to_int(value):
     """
@@ -70,22 +109,6 @@ def preprocess_input(data: dict) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Single-row DataFrame ready for model prediction
     """
-    # Map backend field names to model column names
-    field_mapping = {
-        'Age': 'Age',
-        'Num_of_sexual_partners': 'Num of sexual partners',
-        'First_sex_age': '1st sexual intercourse (age)',
-        'Num_of_pregnancies': 'Num of pregnancies',
-        'Smokes_years': 'Smokes (years)',
-        'Hormonal_contraceptives': 'Hormonal contraceptives',
-        'Hormonal_contraceptives_years': 'Hormonal contraceptives (years)',
-        'STDs_HIV': 'STDs:HIV',
-        'Pain_during_intercourse': 'Pain during intercourse',
-        'Vaginal_discharge_type': 'Vaginal discharge (type- watery, bloody or thick)',
-        'Vaginal_discharge_color': 'Vaginal discharge(color-pink, pale or bloody)',
-        'Vaginal_bleeding_timing': 'Vaginal bleeding(time-b/w periods , After sex or after menopause)',
-    }
-    
     # Build row dictionary with proper column names
     row = {}
     
@@ -98,7 +121,7 @@ def preprocess_input(data: dict) -> pd.DataFrame:
             value = data[model_col]
         # Then try field mapping
         else:
-            for backend_key, mapped_col in field_mapping.items():
+            for backend_key, mapped_col in FIELD_MAPPING.items():
                 if mapped_col == model_col and backend_key in data:
                     value = data[backend_key]
                     break
@@ -106,7 +129,7 @@ def preprocess_input(data: dict) -> pd.DataFrame:
         # Convert value based on column type
         if value is None:
             # Handle missing values
-            if model_col in ['Hormonal contraceptives', 'STDs:HIV']:
+            if model_col in YES_NO_COLUMNS:
                 value = 0  # Default to 0 for numeric Yes/No fields
             elif model_col in ['Pain during intercourse', 
                               'Vaginal discharge (type- watery, bloody or thick)',
@@ -117,11 +140,10 @@ def preprocess_input(data: dict) -> pd.DataFrame:
                 value = 0  # Default for numeric
         else:
             # Convert Yes/No to 0/1 for numeric fields
-            if model_col in ['Hormonal contraceptives', 'STDs:HIV']:
+            if model_col in YES_NO_COLUMNS:
                 value = yes_no_to_int(value)
             # Ensure numeric fields are numeric
-            elif model_col in ['Age', 'Num of sexual partners', '1st sexual intercourse (age)',
-                              'Num of pregnancies', 'Smokes (years)', 'Hormonal contraceptives (years)']:
+            elif model_col in NUMERIC_COLUMNS:
                 try:
                     value = float(value) if value is not None else 0.0
                 except (ValueError, TypeError):
@@ -143,6 +165,119 @@ def preprocess_input(data: dict) -> pd.DataFrame:
     return df
 
 
+def preprocess_batch(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized counterpart of preprocess_input for many rows at once.
+
+    Applies the same conversions column-by-column instead of row-by-row, so a
+    batch of tens of thousands of rows costs a handful of pandas operations.
+
+    Args:
+        frame: DataFrame whose columns use either backend field names
+            ('Hormonal_contraceptives') or model column names ('Hormonal contraceptives')
+
+    Returns:
+        pd.DataFrame: DataFrame with FEATURE_ORDER columns ready for model prediction
+    """
+    n_rows = len(frame)
+    out = {}
+
+    for model_col in FEATURE_ORDER:
+        # Same lookup order as preprocess_input: direct name first, then backend name
+        if model_col in frame.columns:
+            column = frame[model_col]
+        elif FIELD_MAPPING_REVERSE[model_col] in frame.columns:
+            column = frame[FIELD_MAPPING_REVERSE[model_col]]
+        else:
+            column = pd.Series([None] * n_rows, index=frame.index, dtype=object)
+
+        if model_col in YES_NO_COLUMNS:
+            out[model_col] = _yes_no_series(column)
+        elif model_col in NUMERIC_COLUMNS:
+            out[model_col] = pd.to_numeric(column, errors='coerce').fillna(0.0).astype(float)
+        else:
+            out[model_col] = column.where(column.notna(), 'None').astype(str)
+
+    df = pd.DataFrame(out, index=frame.index)
+
+    logger.debug(f"Preprocessed batch shape: {df.shape}")
+
+    return df
+
+
+def backend_field_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    The batch with model column names ('Num of sexual partners') renamed to backend
+    field names ('Num_of_sexual_partners'), the names the rule-based score reads.
+    A backend name already present wins over its model column; other columns are kept.
+    """
+    renames = {model_col: backend_key for model_col, backend_key in FIELD_MAPPING_REVERSE.items()
+               if model_col != backend_key and model_col in frame.columns and backend_key not in frame.columns}
+    return frame.rename(columns=renames) if renames else frame
+
+
+def _yes_no_series(column: pd.Series) -> pd.Series:
+    """Vectorized yes_no_to_int for a whole column."""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.fillna(0).astype(int)
+
+    lowered = column.astype(str).str.lower().str.strip()
+    result = pd.to_numeric(lowered, errors='coerce')
+    result = result.mask(lowered.isin(['yes', '1', 'true', 'positive']), 1)
+    result = result.mask(lowered.isin(['no', '0', 'false', 'none', '', 'negative', 'nan']), 0)
+    return result.fillna(0).astype(int)
+
+
+def _row_list(mask: pd.Series) -> str:
+    rows = mask.to_numpy().nonzero()[0]
+    listed = ", ".join(str(int(i)) for i in rows[:MAX_REPORTED_ROWS])
+    return listed + (f" and {len(rows) - MAX_REPORTED_ROWS} more" if len(rows) > MAX_REPORTED_ROWS else "")
+
+
+def validate_batch(frame: pd.DataFrame) -> tuple[bool, str]:
+    """
+    Validate that required fields are present for every row of a batch and that numeric
+    fields are numbers within the same bounds /predict enforces. Rows are 0-based positions.
+
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    missing_fields = []
+    for field in REQUIRED_FIELDS:
+        if field not in frame.columns and FIELD_MAPPING[field] not in frame.columns:
+            missing_fields.append(field)
+
+    if missing_fields:
+        return False, f"Missing required fields: {', '.join(missing_fields)}"
+
+    for field in REQUIRED_FIELDS:
+        column = frame[field] if field in frame.columns else frame[FIELD_MAPPING[field]]
+        null_rows = column.isna()
+        if null_rows.any():
+            first_bad = int(null_rows.to_numpy().nonzero()[0][0])
+            return False, f"Missing required field '{field}' in row {first_bad}"
+
+    for field, (low, high) in NUMERIC_BOUNDS.items():
+        if field in frame.columns:
+            column = frame[field]
+        elif FIELD_MAPPING[field] in frame.columns:
+            column = frame[FIELD_MAPPING[field]]
+        else:
+            continue
+        values = pd.to_numeric(column, errors='coerce')
+        not_numeric = values.isna() & column.notna()
+        if not_numeric.any():
+            return False, f"Field '{field}' must be a number in rows {_row_list(not_numeric)}"
+        out_of_range = values < low
+        if high is not None:
+            out_of_range |= values > high
+        if out_of_range.any():
+            bounds = f"between {low} and {high}" if high is not None else f">= {low}"
+            return False, f"Field '{field}' must be {bounds} in rows {_row_list(out_of_range)}"
+
+    return True, ""
+
+
 def validate_input(data: dict) -> tuple[bool, str]:
     """
     Validate that required fields are present in the input data.
@@ -150,12 +285,8 @@ def validate_input(data: dict) -> tuple[bool, str]:
     Returns:
         tuple: (is_valid, error_message)
     """
-    required_fields = [
-        'Age', 'Num_of_sexual_partners', 'First_sex_age', 'Num_of_pregnancies'
-    ]
-    
     missing_fields = []
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in data or data[field] is None:
             missing_fields.append(field)
     
@@ -0,0 +1,77 @@
+"""
+Server-Timing response headers.
+
+The request middleware opens a timing record for each request in a context
+variable; endpoints time their stages (parse, validate, preprocess, model, rules,
+persist, render) with stage() or mark(). Sync endpoints run in the threadpool
+with a copy of the request context, and the record is shared by reference, so
+stages timed there still reach the response. Outside a request (warm-up,
+background jobs) every call is a no-op.
+"""
+import contextlib
+import contextvars
+import time
+from collections import OrderedDict
+from typing import Optional
+
+_current: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar("server_timing", default=None)
+
+
+class RequestTimings:
+    """Stage durations of one request; repeated stages accumulate."""
+
+    __slots__ = ("started", "last_mark", "stages")
+
+    def __init__(self):
+        self.started = self.last_mark = time.perf_counter()
+        self.stages: "OrderedDict[str, float]" = OrderedDict()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        """Header value with every recorded stage plus the total, durations in milliseconds."""
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def begin() -> contextvars.Token:
+    """Start timing the current request (called by the middleware)."""
+    return _current.set(RequestTimings())
+
+
+def end(token: contextvars.Token) -> Optional[RequestTimings]:
+    timings = _current.get()
+    _current.reset(token)
+    return timings
+
+
+def record(name: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def mark(name: str) -> None:
+    """Record the time since the request started (or the previous mark) as a stage.
+    Called first thing in an endpoint, mark("parse") covers reading and validating the body."""
+    timings = _current.get()
+    if timings is not None:
+        now = time.perf_counter()
+        timings.add(name, now - timings.last_mark)
+        timings.last_mark = now
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Time the with-block as a stage of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
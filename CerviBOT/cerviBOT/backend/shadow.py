@@ -0,0 +1,167 @@
+"""
+Shadow scoring of a candidate model version.
+
+/predict hands a copy of each input scored by the primary version (not those
+routed to a candidate by traffic weight) to ShadowScorer.offer(). Samples go
+through a bounded asyncio queue to a background worker that scores them with
+the candidate in a thread, then logs and aggregates the comparison with the
+primary. Shadow results are never returned to users. When the queue is full the
+sample is dropped, so the request path never waits on the shadow model.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from metrics import Histogram, LATENCY_BUCKETS
+
+logger = logging.getLogger("cervi_backend")
+
+# Absolute probability difference buckets for primary vs shadow
+DIFF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)
+
+
+class ShadowScorer:
+    """
+    Owns the shadow queue and worker.
+
+    Args:
+        score_fn: callable(model, X) -> float probability, run in a worker thread
+        bucket_fn: callable(probability) -> risk bucket label, for agreement stats
+        maxsize: queue bound; extra samples are dropped
+    """
+
+    def __init__(self, score_fn: Callable[[Any, Any], float], bucket_fn: Callable[[float], str], maxsize: int = 256):
+        self._score_fn = score_fn
+        self._bucket_fn = bucket_fn
+        self._maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.version = None  # ModelVersion being shadowed, or None when disabled
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        with self._lock:
+            self.offered = 0
+            self.dropped = 0
+            self.scored = 0
+            self.errors = 0
+            self.bucket_agreements = 0
+            self.abs_diff_sum = 0.0
+        self.primary_latency = Histogram(LATENCY_BUCKETS)
+        self.shadow_latency = Histogram(LATENCY_BUCKETS)
+        self.abs_diff = Histogram(DIFF_BUCKETS)
+
+    @property
+    def enabled(self) -> bool:
+        return self.version is not None and self._queue is not None
+
+    def start(self) -> None:
+        """Create the queue and worker on the running event loop (call from startup)."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._maxsize)
+        self._task = self._loop.create_task(self._worker())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._queue = None
+
+    def set_version(self, version) -> None:
+        """Start shadowing a ModelVersion (None disables). Resets comparison stats."""
+        self.version = version
+        self._reset_stats()
+        if version is not None:
+            logger.info(f"Shadow scoring enabled for model version {version.name}")
+        else:
+            logger.info("Shadow scoring disabled")
+
+    def offer(self, X: Any, primary_proba: float, primary_seconds: float) -> None:
+        """
+        Hand an input scored by the primary version to the shadow worker. Safe to
+        call from threadpool workers; never blocks. The sample is dropped if the queue is full.
+        """
+        if not self.enabled or self._loop is None:
+            return
+        sample = (self.version, X, primary_proba, primary_seconds)
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, sample)
+        except RuntimeError:
+            # Event loop already closed (shutdown in progress)
+            pass
+
+    def _enqueue(self, sample) -> None:
+        with self._lock:
+            self.offered += 1
+        try:
+            self._queue.put_nowait(sample)
+        except asyncio.QueueFull:
+            with self._lock:
+                self.dropped += 1
+
+    async def _worker(self) -> None:
+        while True:
+            version, X, primary_proba, primary_seconds = await self._queue.get()
+            try:
+                if version is not self.version:
+                    continue  # shadow target changed while the sample was queued
+                started = time.perf_counter()
+                shadow_proba = await self._loop.run_in_executor(None, self._score_fn, version.model, X)
+                self._record(version.name, primary_proba, primary_seconds, shadow_proba, time.perf_counter() - started)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.warning(f"Shadow[{version.name}] scoring failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _record(self, name: str, primary_proba: float, primary_seconds: float,
+                shadow_proba: float, shadow_seconds: float) -> None:
+        diff = shadow_proba - primary_proba
+        agree = self._bucket_fn(shadow_proba) == self._bucket_fn(primary_proba)
+        self.primary_latency.observe(primary_seconds)
+        self.shadow_latency.observe(shadow_seconds)
+        self.abs_diff.observe(abs(diff))
+        with self._lock:
+            self.scored += 1
+            self.abs_diff_sum += abs(diff)
+            if agree:
+                self.bucket_agreements += 1
+        logger.info(
+            f"Shadow[{name}] primary={primary_proba:.4f} ({primary_seconds * 1000:.1f}ms) "
+            f"shadow={shadow_proba:.4f} ({shadow_seconds * 1000:.1f}ms) diff={diff:+.4f} bucket_agree={agree}"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            scored = self.scored
+            stats = {
+                "enabled": self.enabled,
+                "version": self.version.name if self.version is not None else None,
+                "queue_size": self._queue.qsize() if self._queue is not None else 0,
+                "queue_capacity": self._maxsize,
+                "offered": self.offered,
+                "dropped": self.dropped,
+                "scored": scored,
+                "errors": self.errors,
+                "bucket_agreement_rate": (self.bucket_agreements / scored) if scored else None,
+                "mean_abs_diff": (self.abs_diff_sum / scored) if scored else None,
+            }
+        stats.update({
+            "primary_latency_p50_seconds": self.primary_latency.quantile(0.5),
+            "shadow_latency_p50_seconds": self.shadow_latency.quantile(0.5),
+            "primary_latency_p99_seconds": self.primary_latency.quantile(0.99),
+            "shadow_latency_p99_seconds": self.shadow_latency.quantile(0.99),
+            "abs_diff": self.abs_diff.snapshot(),
+        })
+        return stats
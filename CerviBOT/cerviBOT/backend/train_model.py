@@ -5,9 +5,18 @@ Improved Training Script for Cervical Cancer Risk Prediction Model
 - Full metrics (AUC, precision, recall, confusion matrix)
 - Probability calibration
 - Saves to model_files/cervical_cancer_model.pkl
+- Also exports the native XGBoost format (model_files/cervical_cancer_model.spec.json)
+  and a slim serving pickle without SMOTE/imblearn (model_files/cervical_cancer_model.serving.pkl)
+- Writes a memory-mappable flat model shared across workers (model_files/cervical_cancer_model.flat)
+- Distils a linear student model for the fast tier (model_files/cervical_cancer_model.student.json)
+- Writes model_files/manifest.json naming the artifact the app should serve
+- Writes a JSON training report next to the model (cervical_cancer_model.training_report.json):
+  quality metrics, single-row and batch latency, artifact sizes, load times and peak RSS
 """
 import sys
 import os
+import json
+import time
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -22,9 +31,18 @@ from imblearn.pipeline import Pipeline as ImbPipeline
 from imblearn.over_sampling import SMOTE
 import xgboost as xgb
 import joblib
+from model_artifacts import export_native, export_serving, NativeModel, print_artifact_report, SERVING_SUFFIX
+from flat_model import write_flat_model, FlatModel, FLAT_SUFFIX
+from model_manifest import write_manifest
+from distill_model import distill, print_agreement, STUDENT_SUFFIX
 import warnings
 warnings.filterwarnings('ignore')
 
+TRAINING_REPORT_SUFFIX = ".training_report.json"
+# Batch sizes for the throughput measurement (1 = one kiosk request, 1000 = a /predict-batch upload)
+THROUGHPUT_BATCH_SIZES = (1, 10, 100, 1000)
+LATENCY_SAMPLES = 200
+
 # Expected feature order (must match preprocessing)
 FEATURE_ORDER = [
     'Age',
@@ -179,8 +197,40 @@ def create_pipeline(X, feature_cols, y):
     
     return pipeline
 
+def measure_inference(model, X):
+    """Single-row predict_proba latency (p50/p99) and rows/s at THROUGHPUT_BATCH_SIZES."""
+    model.predict_proba(X.iloc[:1])  # first call pays lazy initialization
+    single = []
+    for i in range(LATENCY_SAMPLES):
+        row = X.iloc[[i % len(X)]]
+        started = time.perf_counter()
+        model.predict_proba(row)
+        single.append(time.perf_counter() - started)
+    
+    throughput = {}
+    for size in THROUGHPUT_BATCH_SIZES:
+        batch = pd.concat([X] * (size // len(X) + 1)).iloc[:size]
+        repeats = max(1, 2000 // size)
+        started = time.perf_counter()
+        for _ in range(repeats):
+            model.predict_proba(batch)
+        throughput[str(size)] = size * repeats / (time.perf_counter() - started)
+    
+    return {
+        "single_row_p50_ms": float(np.percentile(single, 50) * 1000),
+        "single_row_p99_ms": float(np.percentile(single, 99) * 1000),
+        "batch_rows_per_second": throughput,
+    }
+
+
+def print_inference(inference):
+    print(f"  Single row: p50 {inference['single_row_p50_ms']:.2f} ms, p99 {inference['single_row_p99_ms']:.2f} ms")
+    for size, rows_per_second in inference["batch_rows_per_second"].items():
+        print(f"  Batch of {size:>4}: {rows_per_second:>10,.0f} rows/s")
+
+
 def evaluate_model(model, X_test, y_test, X_train=None, y_train=None):
-    """Evaluate model with comprehensive metrics."""
+    """Evaluate model with comprehensive metrics, including inference latency and throughput."""
     print("\n" + "=" * 70)
     print("Model Evaluation")
     print("=" * 70)
@@ -243,15 +293,39 @@ def evaluate_model(model, X_test, y_test, X_train=None, y_train=None):
         train_accuracy = accuracy_score(y_train, y_train_pred)
         print(f"\nTrain Set Accuracy: {train_accuracy:.4f} ({train_accuracy*100:.2f}%)")
     
+    print(f"\nInference (predict_proba, in-process):")
+    inference = measure_inference(model, X_test)
+    print_inference(inference)
+    
     return {
-        'accuracy': accuracy,
-        'precision': precision,
-        'recall': recall,
-        'f1': f1,
-        'auc': auc,
-        'confusion_matrix': cm.tolist()
+        'accuracy': float(accuracy),
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1': float(f1),
+        'auc': float(auc),
+        'confusion_matrix': cm.tolist(),
+        'probability_mean': float(y_proba.mean()),
+        'probability_max': float(y_proba.max()),
+        'inference': inference,
     }
 
+
+def write_training_report(output_path, report):
+    """Save the training report next to the model; returns its path."""
+    report_path = os.path.splitext(output_path)[0] + TRAINING_REPORT_SUFFIX
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report_path
+
+
+def peak_rss_bytes():
+    """Peak RSS of this process, or None where the resource module is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
 def train_model(csv_path, output_path=None):
     """Train the model and save it."""
     # Load data
@@ -304,6 +378,13 @@ def train_model(csv_path, output_path=None):
     orig_max = y_proba_orig.max()
     print(f"Original model probability stats:")
     print(f"  Mean: {orig_mean:.4f}, Max: {orig_max:.4f}")
+    calibration = {
+        "method": "sigmoid",
+        "chosen": "uncalibrated",
+        "uncalibrated": {"auc": metrics['auc'], "probability_mean": float(orig_mean),
+                         "probability_max": float(orig_max), "inference": metrics['inference']},
+        "calibrated": None,
+    }
     
     try:
         calibrated_pipeline = CalibratedClassifierCV(pipeline, method='sigmoid', cv=3)
@@ -319,6 +400,10 @@ def train_model(csv_path, output_path=None):
         print(f"  Calibrated AUC-ROC: {auc_cal:.4f}")
         print(f"  Calibrated probability stats:")
         print(f"    Mean: {cal_mean:.4f}, Max: {cal_max:.4f}")
+        cal_inference = measure_inference(calibrated_pipeline, X_test)
+        print_inference(cal_inference)
+        calibration["calibrated"] = {"auc": float(auc_cal), "probability_mean": float(cal_mean),
+                                     "probability_max": float(cal_max), "inference": cal_inference}
         
         # Only use calibrated model if:
         # 1. AUC is better or similar (within 0.01)
@@ -332,11 +417,13 @@ def train_model(csv_path, output_path=None):
         
         if use_calibrated:
             pipeline = calibrated_pipeline
+            calibration["chosen"] = "calibrated"
             print("  ✓ Using calibrated model (maintains reasonable risk levels)")
         else:
             print("  ✗ Using original model (calibration would reduce risk predictions too much)")
             print(f"    Reason: AUC diff={auc_cal - metrics['auc']:.4f}, Mean reduction={((orig_mean - cal_mean)/orig_mean)*100:.1f}%")
     except Exception as e:
+        calibration["error"] = str(e)
         print(f"  Calibration skipped: {e}")
         print("  Using original model")
     
@@ -365,6 +452,86 @@ def train_model(csv_path, output_path=None):
     joblib.dump(feature_cols, feature_order_path)
     print(f"✓ Feature order saved to: {feature_order_path}")
     
+    # Native export: UBJSON boosters + JSON preprocessing spec (preferred by the app when present)
+    try:
+        basename = os.path.splitext(os.path.basename(output_path))[0]
+        spec_path = export_native(pipeline, os.path.dirname(output_path), feature_cols, basename)
+        native = NativeModel.load(spec_path)
+        max_diff = np.abs(native.predict_proba(X_test)[:, 1] - pipeline.predict_proba(X_test)[:, 1]).max()
+        print(f"✓ Native model exported to: {spec_path}")
+        print(f"  Max probability difference vs pickle on test set: {max_diff:.2e}")
+    except Exception as e:
+        spec_path = None
+        print(f"⚠ Native export skipped: {e}")
+    
+    # Serving-only pickle: no SMOTE, no imblearn, no calibration wrapper objects
+    print("\n" + "=" * 70)
+    print("Serving Artifact Export")
+    print("=" * 70)
+    try:
+        serving_path = os.path.splitext(output_path)[0] + SERVING_SUFFIX
+        export_serving(pipeline, serving_path, feature_cols)
+        print(f"✓ Serving model exported to: {serving_path}")
+    except Exception as e:
+        serving_path = None
+        print(f"⚠ Serving export skipped: {e}")
+    
+    # Memory-mappable flat model: node tables + scaler/calibration arrays shared across workers
+    try:
+        flat_path = os.path.splitext(output_path)[0] + FLAT_SUFFIX
+        write_flat_model(pipeline, flat_path, feature_cols)
+        flat = FlatModel.load(flat_path)
+        max_diff = np.abs(flat.predict_proba(X_test)[:, 1] - pipeline.predict_proba(X_test)[:, 1]).max()
+        print(f"✓ Flat model exported to: {flat_path}")
+        print(f"  Max probability difference vs pickle on test set: {max_diff:.2e}")
+    except Exception as e:
+        flat_path = None
+        print(f"⚠ Flat export skipped: {e}")
+    
+    # Distilled linear student: fast tier for batch scoring and degraded mode
+    print("\n" + "=" * 70)
+    print("Student Model Distillation")
+    print("=" * 70)
+    try:
+        student_path = os.path.splitext(output_path)[0] + STUDENT_SUFFIX
+        agreement = distill(pipeline, X_train, X_test, y_test, student_path)
+        print(f"✓ Student model saved to: {student_path}")
+        print_agreement(agreement)
+    except Exception as e:
+        print(f"⚠ Student distillation skipped: {e}")
+    
+    try:
+        artifacts = print_artifact_report([p for p in (output_path, serving_path, spec_path, flat_path) if p])
+    except Exception as e:
+        artifacts = {}
+        print(f"⚠ Artifact report skipped: {e}")
+    
+    # Manifest: the app serves exactly the artifact named here (fastest available format)
+    try:
+        active_path = next(p for p in (flat_path, spec_path, serving_path, output_path) if p)
+        manifest = write_manifest(os.path.dirname(os.path.abspath(output_path)), active_path, feature_cols)
+        print(f"✓ Manifest written: active artifact {manifest['artifact']} ({manifest['format']}, {manifest['checksum'][:19]}...)")
+    except Exception as e:
+        print(f"⚠ Manifest not written: {e}")
+    
+    # Machine-readable report saved with the model, so performance regressions show up before deployment
+    try:
+        report_path = write_training_report(output_path, {
+            "model": os.path.basename(output_path),
+            "dataset": os.path.abspath(csv_path),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "train_rows": int(len(X_train)),
+            "test_rows": int(len(X_test)),
+            "metrics": metrics,
+            "calibration": calibration,
+            "inference": calibration[calibration["chosen"]]["inference"],
+            "artifacts": artifacts,
+            "training_peak_rss_bytes": peak_rss_bytes(),
+        })
+        print(f"✓ Training report saved to: {report_path}")
+    except Exception as e:
+        print(f"⚠ Training report not written: {e}")
+    
     # Verify the saved model can be loaded
     print("\nVerifying saved model...")
     try:
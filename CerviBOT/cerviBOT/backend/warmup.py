@@ -0,0 +1,85 @@
+"""
+Warm-up inputs and readiness state.
+
+After a model is loaded the app pushes a few synthetic and example profiles
+through every hot path (preprocessing, predict_proba, explanation, PDF styles)
+so lazy imports, XGBoost initialization and first-call allocations happen
+before real users arrive. Readiness tracks whether that has finished.
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Categorical answers the chatbot can send, per field
+CATEGORICAL_CHOICES = {
+    "Hormonal_contraceptives": ["Yes", "No"],
+    "STDs_HIV": ["Yes", "No"],
+    "Pain_during_intercourse": ["Yes", "No"],
+    "Vaginal_discharge_type": ["None", "watery", "bloody", "thick"],
+    "Vaginal_discharge_color": ["normal", "pink", "pale", "bloody"],
+    "Vaginal_bleeding_timing": ["None", "Between periods", "After sex", "After menopause"],
+}
+
+
+def synthetic_profiles(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """n plausible chatbot inputs covering the numeric ranges and every categorical answer."""
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(n):
+        age = rng.randint(18, 70)
+        profile = {
+            "Age": age,
+            "Num_of_sexual_partners": rng.randint(0, 12),
+            "First_sex_age": rng.randint(12, min(age, 30)),
+            "Num_of_pregnancies": rng.randint(0, 7),
+            "Smokes_years": float(rng.choice([0, 0, rng.randint(1, 30)])),
+            "Hormonal_contraceptives_years": float(rng.choice([0, rng.randint(1, 20)])),
+        }
+        for field, choices in CATEGORICAL_CHOICES.items():
+            profile[field] = rng.choice(choices)
+        profiles.append(profile)
+    return profiles
+
+
+class Readiness:
+    """
+    Thread-safe readiness state.
+
+    Phases: "starting" (nothing loaded yet), "warming", "ready", "no_model".
+    Only "ready" counts as ready to take traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phase = "starting"
+        self.reason: Optional[str] = None
+        self.since = time.time()
+        self.last_warmup: Optional[Dict[str, Any]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.phase == "ready"
+
+    def set(self, phase: str, reason: Optional[str] = None) -> None:
+        with self._lock:
+            self.phase = phase
+            self.reason = reason
+            self.since = time.time()
+
+    def finish_warmup(self, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self.last_warmup = report
+            self.phase = "ready"
+            self.reason = None
+            self.since = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.phase == "ready",
+                "phase": self.phase,
+                "reason": self.reason,
+                "since": self.since,
+                "last_warmup": self.last_warmup,
+            }
@@ -0,0 +1,29 @@
+"""
+Shared pytest setup: puts the app and backend/ on sys.path, the way app.py does,
+and provides a TestClient for the app with background watchers turned off.
+"""
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, "backend"))
+# Ahead of backend/, which holds a legacy app.py
+sys.path.insert(0, APP_DIR)
+
+# Read by app.py at import time
+os.environ.setdefault("MODEL_WATCH", "false")
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    from fastapi.testclient import TestClient
+    with TestClient(app_module.app) as test_client:
+        yield test_client
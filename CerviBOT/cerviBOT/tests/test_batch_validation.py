@@ -0,0 +1,63 @@
+import pandas as pd
+
+from preprocess import NUMERIC_BOUNDS, validate_batch
+
+ROW = {"Age": 35, "Num_of_sexual_partners": 2, "First_sex_age": 18, "Num_of_pregnancies": 1}
+
+
+def batch(*overrides):
+    return pd.DataFrame([dict(ROW, **override) for override in overrides])
+
+
+def test_valid_batch_passes():
+    assert validate_batch(batch({}, {"Age": 120, "Smokes_years": 0})) == (True, "")
+
+
+def test_model_column_names_are_accepted():
+    frame = batch({}).rename(columns={"Num_of_sexual_partners": "Num of sexual partners"})
+    assert validate_batch(frame) == (True, "")
+
+
+def test_missing_required_column():
+    ok, error = validate_batch(batch({}).drop(columns=["Age"]))
+    assert not ok
+    assert error == "Missing required fields: Age"
+
+
+def test_null_required_value_reports_row():
+    ok, error = validate_batch(batch({}, {"First_sex_age": None}))
+    assert not ok
+    assert error == "Missing required field 'First_sex_age' in row 1"
+
+
+def test_non_numeric_value_reports_rows():
+    ok, error = validate_batch(batch({"Age": "forty"}, {}, {"Age": "n/a"}))
+    assert not ok
+    assert error == "Field 'Age' must be a number in rows 0, 2"
+
+
+def test_numeric_strings_are_accepted():
+    assert validate_batch(batch({"Age": "42"})) == (True, "")
+
+
+def test_values_outside_bounds_are_rejected():
+    for field, (low, high) in NUMERIC_BOUNDS.items():
+        ok, error = validate_batch(batch({}, {field: low - 1}))
+        assert not ok, field
+        assert error.startswith(f"Field '{field}' must be ") and error.endswith("in rows 1")
+        if high is not None:
+            ok, error = validate_batch(batch({field: high + 1}))
+            assert not ok, field
+            assert error == f"Field '{field}' must be between {low} and {high} in rows 0"
+
+
+def test_bounds_are_inclusive():
+    low_row = {field: low for field, (low, _) in NUMERIC_BOUNDS.items()}
+    high_row = {field: high for field, (_, high) in NUMERIC_BOUNDS.items() if high is not None}
+    assert validate_batch(batch(low_row, high_row)) == (True, "")
+
+
+def test_reported_rows_are_capped():
+    ok, error = validate_batch(batch(*[{"Num_of_pregnancies": -1}] * 13))
+    assert not ok
+    assert error == "Field 'Num_of_pregnancies' must be >= 0 in rows 0, 1, 2, 3, 4, 5, 6, 7, 8, 9 and 3 more"
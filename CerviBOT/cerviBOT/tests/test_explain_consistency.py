@@ -0,0 +1,54 @@
+import pytest
+
+HIGH_RISK = {
+    "Age": 45,
+    "Num_of_sexual_partners": 8,
+    "First_sex_age": 14,
+    "Num_of_pregnancies": 5,
+    "Smokes_years": 20.0,
+    "Hormonal_contraceptives": "Yes",
+    "Hormonal_contraceptives_years": 25.0,
+    "STDs_HIV": "Yes",
+    "Pain_during_intercourse": "Yes",
+    "Vaginal_discharge_type": "bloody",
+    "Vaginal_discharge_color": "bloody",
+    "Vaginal_bleeding_timing": "After sex",
+}
+LOW_RISK = {"Age": 22, "Num_of_sexual_partners": 1, "First_sex_age": 21, "Num_of_pregnancies": 0}
+
+INTRO = {"High": "This HIGH risk", "Medium": "This MEDIUM risk", "Low": "This LOW risk"}
+
+
+@pytest.mark.parametrize("profile", [HIGH_RISK, LOW_RISK], ids=["high", "low"])
+@pytest.mark.parametrize("mode", ["exact", "fast"])
+def test_explain_by_id_matches_the_prediction(client, profile, mode):
+    prediction = client.post("/predict", json=profile).json()
+    response = client.post(f"/explain/{prediction['prediction_id']}", params={"mode": mode})
+    assert response.status_code == 200
+    explanation = response.json()
+    assert explanation["probability"] == pytest.approx(prediction["probability"])
+    assert explanation["probability_source"] == prediction["probability_source"]
+    assert explanation["explanation"].startswith(INTRO[prediction["risk_bucket"]])
+
+
+def test_rule_fallback_prediction_is_not_explained_as_low(client):
+    prediction = client.post("/predict", json=HIGH_RISK).json()
+    assert prediction["risk_bucket"] == "High"
+    explanation = client.post(f"/explain/{prediction['prediction_id']}").json()
+    # The contributions explain the raw model output, which the rule fallback overrode
+    assert explanation["model_probability"] <= explanation["probability"]
+    assert "LOW" not in explanation["explanation"].splitlines()[0]
+
+
+def test_explain_without_id_matches_predict(client):
+    prediction = client.post("/predict", json=HIGH_RISK).json()
+    explanation = client.post("/explain", json=HIGH_RISK).json()
+    assert explanation["probability"] == pytest.approx(prediction["probability"])
+    assert explanation["probability_source"] == prediction["probability_source"]
+
+
+def test_unknown_id_is_recomputed_from_the_body_or_404(client):
+    assert client.post("/explain/not-a-real-id").status_code == 404
+    prediction = client.post("/predict", json=HIGH_RISK).json()
+    explanation = client.post("/explain/not-a-real-id", json=HIGH_RISK).json()
+    assert explanation["probability"] == pytest.approx(prediction["probability"])
@@ -0,0 +1,71 @@
+import shutil
+
+import joblib
+import numpy as np
+import pytest
+
+from model_manifest import write_manifest
+
+
+class ConstantModel:
+    """Loads and returns well-formed probabilities, but the same one for every input."""
+
+    def predict_proba(self, X):
+        return np.column_stack([np.ones(len(X)), np.zeros(len(X))])
+
+
+class DriftedModel:
+    """Varies across inputs, but far from anything the serving model outputs."""
+
+    def predict_proba(self, X):
+        positive = np.where(np.arange(len(X)) % 2, 0.9, 0.6)
+        return np.column_stack([1 - positive, positive])
+
+
+@pytest.fixture
+def model_dir(app_module, client, tmp_path, monkeypatch):
+    """Point hot reload at an empty model dir; restore the serving primary afterwards."""
+    monkeypatch.setattr(app_module, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(app_module, "_manifest_key", None)
+    # A rejected reload would otherwise make the next one fail fast
+    monkeypatch.setattr(app_module.model_loader, "failure_cooldown", 0)
+    primary = app_module.registry.primary
+    yield tmp_path
+    with app_module._model_lock:
+        app_module.registry.restore(primary)
+        app_module._sync_primary()
+
+
+def publish(app_module, model_dir, filename, model=None, source=None):
+    path = model_dir / filename
+    if source is not None:
+        shutil.copyfile(source, path)
+    else:
+        joblib.dump(model, path)
+    write_manifest(str(model_dir), str(path), app_module.FEATURE_ORDER)
+    return str(path)
+
+
+@pytest.mark.parametrize("broken", [ConstantModel(), DriftedModel()], ids=["constant", "drifted"])
+def test_hot_reload_rejects_a_model_that_only_passes_after_the_fallback(app_module, model_dir, broken):
+    serving = app_module.registry.primary
+    publish(app_module, model_dir, "broken.pkl", model=broken)
+    app_module.hot_reload_model()
+    assert app_module.registry.primary is serving
+    assert app_module.model is serving.model
+    assert app_module._manifest_key is None
+
+
+def test_hot_reload_swaps_in_a_valid_model(app_module, model_dir):
+    serving = app_module.registry.primary
+    path = publish(app_module, model_dir, "retrained.pkl", source=serving.path)
+    app_module.hot_reload_model()
+    assert app_module.registry.primary is not serving
+    assert app_module.model_path == path
+
+
+def test_validation_reads_raw_scores(app_module, client):
+    serving = app_module.registry.primary.model
+    assert app_module.validate_model(serving, serving) is None
+    assert "constant model" in app_module.validate_model(ConstantModel())
+    assert "differ from the serving model" in app_module.validate_model(DriftedModel(), serving)
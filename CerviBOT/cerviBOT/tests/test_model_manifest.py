@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from model_manifest import (
+    ManifestError, file_checksum, manifest_path, read_manifest, resolve_manifest, write_manifest,
+)
+
+FEATURES = ["Age", "Num of sexual partners"]
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    (tmp_path / "model_a.pkl").write_bytes(b"model a")
+    (tmp_path / "model_b.flat").write_bytes(b"model b")
+    return tmp_path
+
+
+def test_no_manifest_resolves_to_none(model_dir):
+    assert read_manifest(str(model_dir)) is None
+    assert resolve_manifest(str(model_dir)) is None
+
+
+def test_resolves_the_named_artifact(model_dir):
+    manifest = write_manifest(str(model_dir), str(model_dir / "model_b.flat"), FEATURES, version="b")
+    assert manifest["format"] == "flat"
+    assert manifest["checksum"] == file_checksum(str(model_dir / "model_b.flat"))
+    assert resolve_manifest(str(model_dir)) == str(model_dir / "model_b.flat")
+    assert read_manifest(str(model_dir))["version"] == "b"
+
+
+def test_rewrite_switches_the_artifact(model_dir):
+    write_manifest(str(model_dir), str(model_dir / "model_b.flat"), FEATURES)
+    write_manifest(str(model_dir), str(model_dir / "model_a.pkl"), FEATURES)
+    assert resolve_manifest(str(model_dir)) == str(model_dir / "model_a.pkl")
+    assert not (model_dir / "manifest.json.tmp").exists()
+
+
+def test_checksum_mismatch_is_rejected(model_dir):
+    write_manifest(str(model_dir), str(model_dir / "model_a.pkl"), FEATURES)
+    (model_dir / "model_a.pkl").write_bytes(b"replaced in place")
+    with pytest.raises(ManifestError, match="Checksum mismatch"):
+        resolve_manifest(str(model_dir))
+    assert resolve_manifest(str(model_dir), verify_checksum=False) == str(model_dir / "model_a.pkl")
+
+
+def test_missing_artifact_is_rejected(model_dir):
+    write_manifest(str(model_dir), str(model_dir / "model_a.pkl"), FEATURES)
+    (model_dir / "model_a.pkl").unlink()
+    with pytest.raises(ManifestError, match="not found"):
+        resolve_manifest(str(model_dir))
+
+
+def test_artifact_name_cannot_leave_the_model_dir(model_dir, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("elsewhere") / "model_a.pkl"
+    outside.write_bytes(b"model a")
+    with pytest.raises(ManifestError, match="not inside"):
+        write_manifest(str(model_dir), str(outside), FEATURES)
+    # A hand-edited path is reduced to its file name inside model_dir
+    manifest = write_manifest(str(model_dir), str(model_dir / "model_a.pkl"), FEATURES)
+    manifest["artifact"] = "../elsewhere/model_a.pkl"
+    with open(manifest_path(str(model_dir)), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    assert resolve_manifest(str(model_dir)) == str(model_dir / "model_a.pkl")
+
+
+def test_incomplete_or_unreadable_manifest_is_rejected(model_dir):
+    with open(manifest_path(str(model_dir)), "w", encoding="utf-8") as f:
+        json.dump({"artifact": "model_a.pkl"}, f)
+    with pytest.raises(ManifestError, match="missing 'format'"):
+        resolve_manifest(str(model_dir))
+    with open(manifest_path(str(model_dir)), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    with pytest.raises(ManifestError, match="Unreadable"):
+        resolve_manifest(str(model_dir))
+
+
+def test_app_serves_the_manifest_artifact(app_module, model_dir, monkeypatch):
+    monkeypatch.setattr(app_module, "MODEL_DIR", str(model_dir))
+    monkeypatch.chdir(model_dir)
+    write_manifest(str(model_dir), str(model_dir / "model_b.flat"), app_module.FEATURE_ORDER)
+    assert app_module.find_model_path() == str(model_dir / "model_b.flat")
+
+
+def test_app_without_usable_manifest_does_not_probe(app_module, model_dir, monkeypatch):
+    monkeypatch.setattr(app_module, "MODEL_DIR", str(model_dir))
+    monkeypatch.setattr(app_module, "MODEL_DISCOVERY_SCAN", False)
+    monkeypatch.chdir(model_dir)
+    assert app_module.find_model_path() is None
+    write_manifest(str(model_dir), str(model_dir / "model_a.pkl"), app_module.FEATURE_ORDER)
+    (model_dir / "model_a.pkl").write_bytes(b"tampered")
+    assert app_module.find_model_path() is None
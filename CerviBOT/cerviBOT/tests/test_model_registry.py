@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+
+import pytest
+
+from model_registry import ModelRegistry
+
+DRAWS = 20000
+
+
+@pytest.fixture
+def registry():
+    registry = ModelRegistry()
+    registry.add("primary", object(), "primary.pkl", primary=True)
+    return registry
+
+
+def traffic(registry, draws=DRAWS):
+    random.seed(1234)
+    counts = Counter(registry.select().name for _ in range(draws))
+    return {name: count / draws for name, count in counts.items()}
+
+
+def test_primary_takes_all_traffic_without_weighted_candidates(registry):
+    registry.add("candidate", object(), "candidate.pkl", weight=0.0)
+    assert traffic(registry) == {"primary": 1.0}
+
+
+def test_candidate_weight_is_its_traffic_share(registry):
+    registry.add("candidate", object(), "candidate.pkl", weight=0.2)
+    share = traffic(registry)
+    assert share["candidate"] == pytest.approx(0.2, abs=0.015)
+    assert share["primary"] == pytest.approx(0.8, abs=0.015)
+
+
+def test_several_candidates_split_by_weight(registry):
+    registry.add("a", object(), "a.pkl", weight=0.1)
+    registry.add("b", object(), "b.pkl", weight=0.3)
+    share = traffic(registry)
+    assert share["a"] == pytest.approx(0.1, abs=0.015)
+    assert share["b"] == pytest.approx(0.3, abs=0.015)
+    assert share["primary"] == pytest.approx(0.6, abs=0.015)
+
+
+def test_weights_over_one_are_scaled_down(registry):
+    registry.add("a", object(), "a.pkl", weight=0.9)
+    registry.add("b", object(), "b.pkl", weight=0.3)
+    share = traffic(registry)
+    assert "primary" not in share
+    assert share["a"] == pytest.approx(0.75, abs=0.015)
+    assert share["b"] == pytest.approx(0.25, abs=0.015)
+
+
+def test_primary_weight_is_ignored(registry):
+    registry.set_weight("primary", 0.5)
+    registry.add("candidate", object(), "candidate.pkl", weight=0.25)
+    assert traffic(registry)["candidate"] == pytest.approx(0.25, abs=0.015)
+
+
+def test_header_pins_a_version_regardless_of_weight(registry):
+    registry.add("candidate", object(), "candidate.pkl", weight=0.0)
+    assert registry.select("candidate").name == "candidate"
+    assert registry.select("unknown").name == "primary"
+
+
+def test_promote_moves_the_remaining_traffic(registry):
+    registry.add("candidate", object(), "candidate.pkl", weight=0.2)
+    registry.promote("candidate")
+    share = traffic(registry)
+    assert share == {"candidate": 1.0}
+    registry.set_weight("primary", 0.4)
+    assert traffic(registry)["primary"] == pytest.approx(0.4, abs=0.015)
+
+
+def test_weight_must_be_a_fraction(registry):
+    with pytest.raises(ValueError):
+        registry.set_weight("primary", 1.5)
+    with pytest.raises(KeyError):
+        registry.set_weight("missing", 0.5)
+
+
+def test_primary_cannot_be_removed(registry):
+    registry.add("candidate", object(), "candidate.pkl", weight=0.2)
+    with pytest.raises(ValueError):
+        registry.remove("primary")
+    registry.remove("candidate")
+    assert traffic(registry) == {"primary": 1.0}
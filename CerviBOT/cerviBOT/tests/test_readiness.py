@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def ready_client(app_module, client):
+    """The shared client once warm-up and the first background self-test have finished."""
+    deadline = time.time() + 60
+    while client.get("/readyz").status_code != 200:
+        assert time.time() < deadline, client.get("/readyz").json()
+        time.sleep(0.1)
+    return client
+
+
+def probe_states(client):
+    ready, readyz = client.get("/ready"), client.get("/readyz")
+    return ready.status_code, readyz.status_code, ready.json()["ready"], readyz.json()["ready"]
+
+
+def test_ready_is_an_alias_of_readyz(ready_client):
+    assert probe_states(ready_client) == (200, 200, True, True)
+    assert ready_client.get("/health").json()["ready"] is True
+
+
+def test_not_ready_while_warming(app_module, ready_client, monkeypatch):
+    monkeypatch.setattr(app_module.readiness, "phase", "warming")
+    assert probe_states(ready_client) == (503, 503, False, False)
+    assert ready_client.get("/health").json()["ready"] is False
+    assert ready_client.get("/livez").status_code == 200
+
+
+def test_not_ready_when_the_self_test_fails(app_module, ready_client, monkeypatch):
+    monkeypatch.setattr(app_module.health_probe, "check", lambda: {"status": "error"})
+    app_module.health_probe.refresh()
+    try:
+        assert probe_states(ready_client) == (503, 503, False, False)
+        assert ready_client.get("/health").json()["ready"] is False
+    finally:
+        monkeypatch.undo()
+        app_module.health_probe.refresh()
+    assert probe_states(ready_client) == (200, 200, True, True)
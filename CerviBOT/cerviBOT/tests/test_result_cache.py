@@ -0,0 +1,75 @@
+from result_cache import LRUCache, TTLStore, canonical_key
+
+PROFILE = {"Age": 45, "Num_of_sexual_partners": 8, "First_sex_age": 14, "Num_of_pregnancies": 5, "STDs_HIV": "Yes"}
+
+
+def test_canonical_key_ignores_field_order():
+    assert canonical_key({"Age": 30, "STDs_HIV": "No"}) == canonical_key({"STDs_HIV": "No", "Age": 30})
+    assert canonical_key({"Age": 30}) != canonical_key({"Age": 31})
+    assert canonical_key({"Age": 30}) != canonical_key({"Age": "30"})
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_zero_size_disables_caching():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_predict_cache_is_keyed_by_canonical_input(app_module, client):
+    cache = app_module.prediction_cache
+    first = client.post("/predict", json=PROFILE).json()
+    hits = cache.hits
+    reordered = dict(reversed(list(PROFILE.items())))
+    assert client.post("/predict", json=reordered).json()["probability"] == first["probability"]
+    assert cache.hits == hits + 1
+    client.post("/predict", json=dict(PROFILE, Age=46))
+    assert cache.hits == hits + 1
+
+
+def test_cache_hits_still_count_toward_version_stats(app_module, client):
+    stats = app_module.registry.primary.stats
+    client.post("/predict", json=PROFILE)
+    requests, cached = stats.requests, stats.cached_requests
+    client.post("/predict", json=PROFILE)
+    assert (stats.requests, stats.cached_requests) == (requests + 1, cached + 1)
+
+
+def test_model_swap_clears_the_caches(app_module, client):
+    client.post("/predict", json=PROFILE)
+    assert len(app_module.prediction_cache) > 0
+    app_module.invalidate_result_caches()
+    assert len(app_module.prediction_cache) == 0
+    assert len(app_module.explanation_cache) == 0
+
+
+def test_prediction_store_entries_expire(monkeypatch):
+    import result_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    store = TTLStore(maxsize=10, ttl_seconds=60)
+    key = store.put({"probability": 0.4})
+    assert store.get(key) == {"probability": 0.4}
+    now[0] += 61
+    assert store.get(key) is None
+    assert store.snapshot()["expired"] == 1
+
+
+def test_prediction_store_is_bounded_and_ids_are_unique():
+    store = TTLStore(maxsize=2, ttl_seconds=60)
+    keys = [store.put(i) for i in range(3)]
+    assert len(set(keys)) == 3
+    assert store.get(keys[0]) is None
+    assert [store.get(k) for k in keys[1:]] == [1, 2]
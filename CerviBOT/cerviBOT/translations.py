@@ -56,6 +56,42 @@ TRANSLATIONS = {
         'advice_medium': 'Medium risk — consider scheduling a clinical check-up and follow-up screening.',
         'advice_high': 'High risk — seek urgent clinical evaluation and further diagnostic testing.',
         
+        # Explanations (/explain)
+        'explain_intro_high': 'This HIGH risk assessment is primarily due to:',
+        'explain_intro_medium': 'This MEDIUM risk assessment is influenced by:',
+        'explain_intro_low': 'This LOW risk assessment reflects:',
+        'explain_risk_factors': 'Risk factors present:',
+        'explain_protective_factors': 'Protective factors:',
+        'explain_list_item': '  {index}. {text}',
+        'explain_fallback_probability': 'Risk assessment: {probability} probability.',
+        'explain_fallback_high': 'High risk factors detected. Please consult a healthcare provider.',
+        'explain_fallback_medium': 'Moderate risk detected. Consider regular screening.',
+        'explain_fallback_low': 'Low risk. Maintain regular health checkups.',
+        
+        # Risk and protective factors
+        'factor_age_high': 'Age {age} (higher risk group: 45+)',
+        'factor_age_moderate': 'Age {age} (moderate risk group: 35-44)',
+        'factor_age_young': 'Young age ({age})',
+        'factor_partners_high': 'High number of sexual partners ({partners})',
+        'factor_partners_multiple': 'Multiple sexual partners ({partners})',
+        'factor_partners_limited': 'Limited sexual partners ({partners})',
+        'factor_first_sex_early': 'Early first sexual intercourse (age {age})',
+        'factor_first_sex_later': 'Later first sexual intercourse (age {age})',
+        'factor_pregnancies': 'Multiple pregnancies ({pregnancies})',
+        'factor_smoking_long': 'Long-term smoking ({years} years)',
+        'factor_smoking': 'Smoking history ({years} years)',
+        'factor_no_smoking': 'No smoking history',
+        'factor_hiv_positive': 'HIV positive (major risk factor)',
+        'factor_hiv_negative': 'HIV negative',
+        'factor_hormonal_long': 'Long-term hormonal contraceptive use ({years} years)',
+        'factor_hormonal': 'Hormonal contraceptive use ({years} years)',
+        'factor_pain': 'Pain during intercourse (symptom)',
+        'factor_discharge_bloody': 'Bloody vaginal discharge (concerning symptom)',
+        'factor_discharge_abnormal': 'Abnormal vaginal discharge ({type})',
+        'factor_discharge_color_bloody': 'Bloody discharge color (concerning)',
+        'factor_bleeding_after_sex': 'Vaginal bleeding after sex (very concerning symptom)',
+        'factor_bleeding_abnormal': 'Abnormal vaginal bleeding ({timing})',
+        
         # Errors
         'error_network': 'Network or server error: {error}',
         'error_explanation': 'Error getting explanation: {error}',
@@ -114,6 +150,42 @@ TRANSLATIONS = {
         'advice_medium': 'मध्यम जोखिम — नैदानिक जांच और अनुवर्ती जांच शेड्यूल करने पर विचार करें।',
         'advice_high': 'उच्च जोखिम — तत्काल नैदानिक मूल्यांकन और आगे की नैदानिक जांच कराएं।',
         
+        # Explanations (/explain)
+        'explain_intro_high': 'यह उच्च जोखिम मूल्यांकन मुख्य रूप से इन कारणों से है:',
+        'explain_intro_medium': 'यह मध्यम जोखिम मूल्यांकन इनसे प्रभावित है:',
+        'explain_intro_low': 'यह कम जोखिम मूल्यांकन दर्शाता है:',
+        'explain_risk_factors': 'मौजूद जोखिम कारक:',
+        'explain_protective_factors': 'सुरक्षात्मक कारक:',
+        'explain_list_item': '  {index}. {text}',
+        'explain_fallback_probability': 'जोखिम मूल्यांकन: {probability} संभावना।',
+        'explain_fallback_high': 'उच्च जोखिम कारक पाए गए। कृपया किसी स्वास्थ्य सेवा प्रदाता से परामर्श लें।',
+        'explain_fallback_medium': 'मध्यम जोखिम पाया गया। नियमित जांच पर विचार करें।',
+        'explain_fallback_low': 'कम जोखिम। नियमित स्वास्थ्य जांच जारी रखें।',
+        
+        # Risk and protective factors
+        'factor_age_high': 'उम्र {age} (उच्च जोखिम समूह: 45+)',
+        'factor_age_moderate': 'उम्र {age} (मध्यम जोखिम समूह: 35-44)',
+        'factor_age_young': 'कम उम्र ({age})',
+        'factor_partners_high': 'यौन साथियों की अधिक संख्या ({partners})',
+        'factor_partners_multiple': 'एक से अधिक यौन साथी ({partners})',
+        'factor_partners_limited': 'सीमित यौन साथी ({partners})',
+        'factor_first_sex_early': 'कम उम्र में पहला यौन संबंध (उम्र {age})',
+        'factor_first_sex_later': 'अधिक उम्र में पहला यौन संबंध (उम्र {age})',
+        'factor_pregnancies': 'कई गर्भावस्थाएं ({pregnancies})',
+        'factor_smoking_long': 'लंबे समय से धूम्रपान ({years} वर्ष)',
+        'factor_smoking': 'धूम्रपान का इतिहास ({years} वर्ष)',
+        'factor_no_smoking': 'धूम्रपान का कोई इतिहास नहीं',
+        'factor_hiv_positive': 'HIV पॉजिटिव (प्रमुख जोखिम कारक)',
+        'factor_hiv_negative': 'HIV नेगेटिव',
+        'factor_hormonal_long': 'लंबे समय तक हार्मोनल गर्भनिरोधक का उपयोग ({years} वर्ष)',
+        'factor_hormonal': 'हार्मोनल गर्भनिरोधक का उपयोग ({years} वर्ष)',
+        'factor_pain': 'संभोग के दौरान दर्द (लक्षण)',
+        'factor_discharge_bloody': 'खूनी योनि स्राव (चिंताजनक लक्षण)',
+        'factor_discharge_abnormal': 'असामान्य योनि स्राव ({type})',
+        'factor_discharge_color_bloody': 'स्राव का रंग खूनी (चिंताजनक)',
+        'factor_bleeding_after_sex': 'संभोग के बाद योनि से रक्तस्राव (बहुत चिंताजनक लक्षण)',
+        'factor_bleeding_abnormal': 'असामान्य योनि रक्तस्राव ({timing})',
+        
         # Errors
         'error_network': 'नेटवर्क या सर्वर त्रुटि: {error}',
         'error_explanation': 'स्पष्टीकरण प्राप्त करने में त्रुटि: {error}',